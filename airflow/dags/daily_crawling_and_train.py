@@ -9,17 +9,26 @@ from airflow import DAG
 from airflow.operators.python import PythonOperator
 from airflow.operators.bash import BashOperator
 from datetime import datetime, timedelta
+import time
 import requests
 
-def trigger_crawling():
-    url = "http://3.35.129.98:8000/airflow/crawling"  
+def trigger_pipeline():
+    # crawl -> preprocess -> train -> register -> reload 을 서버 작업 큐에서 한 번에 실행
+    # 입력이 바뀌지 않은 단계는 서버 쪽에서 건너뛰므로 재시도/재실행해도 안전
+    url = "http://3.35.129.98:8000/airflow/pipeline"
     response = requests.post(url)
     print(response.status_code, response.json())
-
-def trigger_train():
-    url = "http://3.35.129.98:8000/airflow/train"  
-    response = requests.post(url)
-    print(response.status_code, response.json())    
+    response.raise_for_status()
+
+    job_url = f"http://3.35.129.98:8000/jobs/{response.json()['job_id']}"
+    while True:
+        job = requests.get(job_url, timeout=30).json()
+        print(job["status"], job["progress"], job["message"])
+        if job["status"] == "succeeded":
+            return job["result"]
+        if job["status"] == "failed":
+            raise RuntimeError(f"airflow_pipeline job failed : {job['error']}")
+        time.sleep(30)
 
 default_args = {
     "owner": "admin",
@@ -35,14 +44,10 @@ with DAG(
     start_date=datetime(2025, 8, 6),
     catchup=False,
 ) as dag:
-    run_crawling = PythonOperator(
-        task_id="run_crawling_task",
-        python_callable=trigger_crawling
-    )
-
-    run_train = PythonOperator(
-        task_id="run_train_task",
-        python_callable=trigger_train
+    run_pipeline = PythonOperator(
+        task_id="run_pipeline_task",
+        python_callable=trigger_pipeline,
+        execution_timeout=timedelta(hours=3)
     )
 
-    run_crawling >> run_train
+    run_pipeline
@@ -20,6 +20,82 @@ if not API_KEY:
 
 MLFLOW_URI = os.getenv("MLFLOW_URI")
 
+# 서빙 시 함께 상주시킬 모델 목록 ("이름=모델URI" 를 콤마로 구분, 첫 번째가 기본 모델)
+SERVING_MODELS = os.getenv("SERVING_MODELS", "champion=models:/best_model/Production")
+# 가중치 기반 라우팅 ("이름=가중치", 비어있으면 항상 기본 모델로 라우팅)
+MODEL_ROUTING_WEIGHTS = os.getenv("MODEL_ROUTING_WEIGHTS", "")
+# 응답 경로 밖에서 섀도우 스코어링할 챌린저 모델 이름 목록
+SHADOW_MODELS = os.getenv("SHADOW_MODELS", "")
+
+# 서버 시작 후 백그라운드 모델 로드 재시도 (첫 대기 시간 초, 최대 대기 시간 초, 최대 시도 횟수 0: 성공할 때까지)
+MODEL_LOAD_RETRY_SECONDS = float(os.getenv("MODEL_LOAD_RETRY_SECONDS", "5"))
+MODEL_LOAD_RETRY_MAX_SECONDS = float(os.getenv("MODEL_LOAD_RETRY_MAX_SECONDS", "300"))
+MODEL_LOAD_MAX_ATTEMPTS = int(os.getenv("MODEL_LOAD_MAX_ATTEMPTS", "0"))
+
+# 줄거리 텍스트 피처 ("tfidf": 어휘 기반 TfidfVectorizer, "hashing": 고정 버킷 해싱 TF-IDF)
+TEXT_VECTORIZER = os.getenv("TEXT_VECTORIZER", "tfidf")
+HASHING_N_FEATURES = int(os.getenv("HASHING_N_FEATURES", "1024"))
+TEXT_FEATURIZE_JOBS = int(os.getenv("TEXT_FEATURIZE_JOBS", "1"))
+
+# 서빙 프로세스별 Okt 형태소 분석기 풀 크기 (0: 풀 없이 토크나이저별 인스턴스)
+OKT_POOL_SIZE = int(os.getenv("OKT_POOL_SIZE", "4"))
+
+# 운영 서버 워커 수 (0 이면 단일 프로세스 개발 모드, 1 이상이면 모델 사전 로드 후 fork)
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "0"))
+
+# 예측 로그 (재학습/분석용 NDJSON.gz 세그먼트)
+PREDICTION_LOG_ENABLED = os.getenv("PREDICTION_LOG_ENABLED", "true").lower() == "true"
+PREDICTION_LOG_DIR = os.getenv("PREDICTION_LOG_DIR") or os.path.join(BASE_DIR, "logs", "predictions")
+PREDICTION_LOG_MAX_BUFFER = int(os.getenv("PREDICTION_LOG_MAX_BUFFER", "10000"))
+
+# 학습 작업 큐 (SQLite 작업 테이블 경로, 워커 프로세스 수)
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join(BASE_DIR, "logs", "jobs.sqlite"))
+JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "1"))
+
+# CPU 스레드 예산 (0: 자동)
+# 전체 코어 수(0: affinity/컨테이너 quota 로 감지), 서빙 워커 전체에 남길 코어 수(0: 절반),
+# 학습 작업 프로세스당 스레드 수(0: 나머지 코어 / JOB_MAX_WORKERS), 오프라인 배치 스코어링 스레드 수(0: 나머지 코어)
+CPU_CORES = int(os.getenv("CPU_CORES", "0"))
+SERVING_CORES = int(os.getenv("SERVING_CORES", "0"))
+TRAINING_THREADS = int(os.getenv("TRAINING_THREADS", "0"))
+BATCH_THREADS = int(os.getenv("BATCH_THREADS", "0"))
+
+# /predict/* 요청 제한 (워커 프로세스별 동시 실행 수, batch 최대 동시 실행 수(0 이면 동시 실행 수 - 1), 대기열 길이, 지연 목표 ms)
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+PREDICT_MAX_CONCURRENCY = int(os.getenv("PREDICT_MAX_CONCURRENCY", "8"))
+PREDICT_BATCH_MAX_CONCURRENCY = int(os.getenv("PREDICT_BATCH_MAX_CONCURRENCY", "0"))
+PREDICT_MAX_QUEUE = int(os.getenv("PREDICT_MAX_QUEUE", "64"))
+PREDICT_LATENCY_SLO_MS = float(os.getenv("PREDICT_LATENCY_SLO_MS", "500"))
+
+# 요청 프로파일링 (관리자 토큰: X-Profile-Token 헤더로 단건 프로파일 + 관리 API 인증, 비어 있으면 비활성화)
+# 샘플링 비율(0~1, 0: 끔), 프로파일 저장 경로, 보관 개수
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR") or os.path.join(BASE_DIR, "logs", "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
+
+# 학습 조기 종료 / 모델별 시간 예산 (0 이면 사용 안 함, 시간 기준 wall | cpu)
+TRAIN_EARLY_STOPPING_ROUNDS = int(os.getenv("TRAIN_EARLY_STOPPING_ROUNDS", "50"))
+TRAIN_TIME_BUDGET_SECONDS = float(os.getenv("TRAIN_TIME_BUDGET_SECONDS", "0"))
+TRAIN_BUDGET_CLOCK = os.getenv("TRAIN_BUDGET_CLOCK", "wall")
+
+# 증분 학습 (일일 파이프라인에서 Production 부스팅 모델에 트리 추가, 조건 불충족/성능 악화 시 전체 재학습)
+# 추가 트리 수, 바뀌지 않은 행 재학습 비율, 바뀐 행 비율 상한, 검증 RMSE 허용 악화 비율, 누적 트리 수 상한
+TRAIN_INCREMENTAL = os.getenv("TRAIN_INCREMENTAL", "true").lower() == "true"
+TRAIN_INCREMENTAL_ROUNDS = int(os.getenv("TRAIN_INCREMENTAL_ROUNDS", "100"))
+TRAIN_REPLAY_FRACTION = float(os.getenv("TRAIN_REPLAY_FRACTION", "0.2"))
+TRAIN_INCREMENTAL_MAX_CHANGED = float(os.getenv("TRAIN_INCREMENTAL_MAX_CHANGED", "0.3"))
+TRAIN_INCREMENTAL_TOLERANCE = float(os.getenv("TRAIN_INCREMENTAL_TOLERANCE", "0.01"))
+TRAIN_INCREMENTAL_MAX_TREES = int(os.getenv("TRAIN_INCREMENTAL_MAX_TREES", "3000"))
+
+# 학습 단계별(데이터셋/토큰화/학습/평가/저장/MLflow 업로드) 경과 시간, CPU 시간, 최대 RSS, JVM 힙 기록
+TRAIN_STAGE_PROFILE = os.getenv("TRAIN_STAGE_PROFILE", "true").lower() == "true"
+
+# 일일 파이프라인 (단계별 fingerprint 기록 경로, 병렬 단계 수, 재적재 요청을 보낼 API 주소)
+PIPELINE_STATE_PATH = os.getenv("PIPELINE_STATE_PATH") or os.path.join(BASE_DIR, "logs", "pipeline_state.json")
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "3"))
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+
 if __name__ == "__main__":
     print("BASE_DIR:", BASE_DIR)
     print("RAW_DATA_PATH:", RAW_DATA_PATH)
@@ -44,6 +44,18 @@ class TMDBCrawler:
 
         return movies
     
+    def get_movie_details(self, movie_id, timeout = 10):
+        params = {
+            "api_key": self._api_key,
+            "language": self._language,
+        }
+        response = requests.get(f"{self._base_url}/{movie_id}", params= params, timeout= timeout)
+
+        if not response.status_code == 200:
+            return
+
+        return json.loads(response.text)
+
     def get_genre_name_to_id(self):
         url = f"https://api.themoviedb.org/3/genre/movie/list?language={self._language}&api_key={self._api_key}"
         response = requests.get(url)
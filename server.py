@@ -1,9 +1,12 @@
 import uvicorn
+from config import SERVER_WORKERS
 from src.api import app
 
 if __name__ == "__main__":
-    # dev
-    uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True)
-
-    # prod
-    # uvicorn.run("server:app", host="0.0.0.0", port="8000", reload=False)
\ No newline at end of file
+    if SERVER_WORKERS > 0:
+        # prod : 부모 프로세스에서 모델 로드 후 SERVER_WORKERS 개 워커 fork (읽기 전용 모델 메모리 공유)
+        from src.api.prefork import serve_prefork
+        serve_prefork(app, host="0.0.0.0", port=8000, workers=SERVER_WORKERS)
+    else:
+        # dev
+        uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True)
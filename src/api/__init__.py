@@ -11,10 +11,17 @@ sys.path.append(
 )
 
 from src.api.middleware import register_middleware
-from src.api.routers import train, predict, reload, airflow, pages
-from src.ml.loader import get_model
+from src.api.routers import train, predict, reload, airflow, pages, jobs, monitoring, movies
+from src.api import healthcheck
+from src.jobs.manager import JobManager
+from src.ml.loader import BackgroundModelLoader
+from src.ml.catalog import refresh_catalog_index
+from src.dataset.text_features import configure_okt_pool
 from src.utils.logger import get_logger
+from src.utils.resources import apply_thread_budget, SERVING
 from src.api import state
+from src.monitoring.prediction_log import PredictionLogWriter
+from config import JOB_DB_PATH, JOB_MAX_WORKERS, PREDICTION_LOG_ENABLED, PREDICTION_LOG_DIR, PREDICTION_LOG_MAX_BUFFER, OKT_POOL_SIZE
 
 logger = get_logger(__name__)
 
@@ -22,20 +29,45 @@ logger = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(app):
     logger.info("서버 시작 Step")
-    logger.info("[START] loading mlflow model")
-
-    # MLflow 모델 로딩 (에러 처리 추가)
-    try:
-        model = get_model()
-        state.mlflow_model = model
-        logger.info(f"[END] mlflow model loaded successfully")
-    except Exception as e:
-        logger.warning(f"MLflow 모델 로딩 실패: {e}")
-        logger.info("모델 없이 서버를 시작합니다.")
-        state.mlflow_model = None
+
+    # torch / BLAS / 모델 n_jobs 를 서빙 예산으로 제한 (학습 작업 프로세스와 코어를 나눠 씀)
+    apply_thread_budget(SERVING)
+
+    # 요청 스레드들이 나눠 쓸 Okt 인스턴스 풀 (JVM 은 fork 이후 각 워커 프로세스에서 시작)
+    if OKT_POOL_SIZE > 0:
+        try:
+            configure_okt_pool(OKT_POOL_SIZE)
+            logger.info(f"[INFO] okt tokenizer pool ready : {OKT_POOL_SIZE} instances (pid={os.getpid()})")
+        except Exception as e:
+            logger.warning(f"[WARN] Okt 풀 생성 실패, 토크나이저별 인스턴스를 사용합니다: {e}")
+
+    if state.preloaded:
+        # prefork 모드: 부모 프로세스에서 로드한 모델을 그대로 공유
+        logger.info(f"[INFO] using preloaded mlflow model (pid={os.getpid()})")
+        # 부모는 카탈로그를 재생성하지 않으므로 오래된 인덱스면 워커에서 생성 (한 워커만 생성, 나머지는 결과 공유)
+        if state.catalog_index is None and state.mlflow_model is not None:
+            refresh_catalog_index(state.mlflow_model, state, background=True)
+    else:
+        # MLflow 모델은 백그라운드에서 로드 (실패 시 백오프 재시도), 서버는 바로 요청을 받고
+        # 로드가 끝나기 전까지 /readyz 는 503, 예측 API 는 "모델이 로드되지 않았습니다." (503)
+        state.model_loader = BackgroundModelLoader().start()
+
+    # 학습 작업 큐 (워커 프로세스 풀 + SQLite 작업 테이블)
+    # prefork 모드에서는 다른 워커의 실행 중 작업을 실패 처리하지 않도록 복구는 부모에 맡긴다
+    state.job_manager = JobManager(JOB_DB_PATH, max_workers=JOB_MAX_WORKERS, recover=state.prefork_parent is None)
+
+    # 예측 로그 배치 기록 태스크
+    if PREDICTION_LOG_ENABLED:
+        state.prediction_log = PredictionLogWriter(PREDICTION_LOG_DIR, max_buffer=PREDICTION_LOG_MAX_BUFFER)
+        state.prediction_log.start()
 
     yield
 
+    if state.model_loader is not None:
+        state.model_loader.stop()
+    if state.prediction_log is not None:
+        await state.prediction_log.stop()
+    state.job_manager.shutdown()
     logger.info("서버 종료")
 
 
@@ -51,11 +83,15 @@ app = FastAPI(
 register_middleware(app)
 
 # API 라우터 등록
+app.include_router(healthcheck.router)
 app.include_router(train.router)
 app.include_router(predict.router)
 app.include_router(reload.router)
 app.include_router(airflow.router)
 app.include_router(pages.router)
+app.include_router(jobs.router)
+app.include_router(monitoring.router)
+app.include_router(movies.router)
 
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 frontend_path = os.path.join(project_root, "frontend")
@@ -0,0 +1,151 @@
+import math
+import time
+import asyncio
+from collections import deque
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"request rejected ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    예측 요청 동시 실행 수/대기열 제한 (프로세스(워커)별 이벤트 루프 기준)
+    - 빈 슬롯이 없으면 우선순위 대기열에 넣고, 슬롯이 나면 interactive 를 batch 보다 먼저 깨움
+    - batch 는 batch_max_concurrency 까지만 실행되어 interactive 용 슬롯을 남김
+    - 대기열이 가득 찼거나 예상 대기 시간이 지연 목표(SLO)를 넘으면 바로 거절 (503 + Retry-After)
+      (대기열이 가득 찬 상태의 interactive 요청은 대기 중인 batch 요청을 밀어냄)
+    - 예상 대기 시간 = 앞선 대기 요청 수 x 평균 처리 시간(EWMA) / 동시 실행 수
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 64, latency_slo_ms: float = 500,
+                 batch_max_concurrency: int = None, ewma_alpha: float = 0.2):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self.latency_slo = latency_slo_ms / 1000 if latency_slo_ms else None
+        self.batch_max_concurrency = batch_max_concurrency or max(1, self.max_concurrency - 1)
+        self.ewma_alpha = ewma_alpha
+
+        self.active = {priority: 0 for priority in PRIORITIES}
+        self._waiters = {priority: deque() for priority in PRIORITIES}
+        self.service_time = 0.05
+        self.queue_wait = 0.0
+
+        self.admitted = {priority: 0 for priority in PRIORITIES}
+        self.rejected = {priority: {"queue_full": 0, "latency_slo": 0} for priority in PRIORITIES}
+
+    @property
+    def queued(self):
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def _can_start(self, priority: str):
+        if sum(self.active.values()) >= self.max_concurrency:
+            return False
+        return priority == INTERACTIVE or self.active[BATCH] < self.batch_max_concurrency
+
+    def _has_waiters_ahead(self, priority: str):
+        if priority == INTERACTIVE:
+            return bool(self._waiters[INTERACTIVE])
+        return self.queued > 0
+
+    def estimated_wait(self, priority: str):
+        ahead = len(self._waiters[INTERACTIVE]) + (len(self._waiters[BATCH]) if priority == BATCH else 0)
+        return (ahead + 1) * self.service_time / self.max_concurrency
+
+    def _reject(self, priority: str, reason: str):
+        self.rejected[priority][reason] += 1
+        retry_after = max(1, math.ceil(self.estimated_wait(priority)))
+        raise AdmissionRejected(reason, retry_after)
+
+    def _evict_batch(self):
+        """대기열이 가득 차면 가장 최근에 들어온 batch 요청을 대신 거절해 interactive 자리를 만듦"""
+        victim = self._waiters[BATCH].pop()
+        self.rejected[BATCH]["queue_full"] += 1
+        victim.set_exception(AdmissionRejected("queue_full", max(1, math.ceil(self.estimated_wait(BATCH)))))
+
+    def _dispatch(self):
+        """빈 슬롯을 우선순위 순서로 대기 요청에 넘김"""
+        for priority in PRIORITIES:
+            waiters = self._waiters[priority]
+            while waiters and self._can_start(priority):
+                future = waiters.popleft()
+                if future.done():
+                    continue
+                self.active[priority] += 1
+                future.set_result(None)
+
+    async def acquire(self, priority: str = INTERACTIVE):
+        """슬롯을 얻을 때까지 대기 (거절 시 AdmissionRejected), 반환값은 대기 시간(초)"""
+        if self._can_start(priority) and not self._has_waiters_ahead(priority):
+            self.active[priority] += 1
+            self.admitted[priority] += 1
+            return 0.0
+
+        if self.queued >= self.max_queue:
+            if priority == INTERACTIVE and self._waiters[BATCH]:
+                self._evict_batch()
+            else:
+                self._reject(priority, "queue_full")
+        if self.latency_slo is not None and self.estimated_wait(priority) > self.latency_slo:
+            self._reject(priority, "latency_slo")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(future)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, timeout=self.latency_slo)
+        except asyncio.TimeoutError:
+            if not (future.done() and not future.cancelled()):
+                self._remove(priority, future)
+                self._reject(priority, "latency_slo")
+        except asyncio.CancelledError:
+            # 대기 중 클라이언트 연결 종료: 이미 슬롯을 받았다면 반납
+            if future.done() and not future.cancelled():
+                self.release(priority)
+            else:
+                self._remove(priority, future)
+            raise
+
+        waited = time.perf_counter() - started
+        self.queue_wait += self.ewma_alpha * (waited - self.queue_wait)
+        self.admitted[priority] += 1
+        return waited
+
+    def _remove(self, priority: str, future):
+        try:
+            self._waiters[priority].remove(future)
+        except ValueError:
+            pass
+
+    def release(self, priority: str, elapsed: float = None):
+        self.active[priority] -= 1
+        if elapsed is not None:
+            self.service_time += self.ewma_alpha * (elapsed - self.service_time)
+        self._dispatch()
+
+    def stats(self):
+        return {
+            "limits": {
+                "max_concurrency": self.max_concurrency,
+                "batch_max_concurrency": self.batch_max_concurrency,
+                "max_queue": self.max_queue,
+                "latency_slo_ms": self.latency_slo * 1000 if self.latency_slo is not None else None,
+            },
+            "active": dict(self.active),
+            "queued": {priority: len(waiters) for priority, waiters in self._waiters.items()},
+            "admitted": dict(self.admitted),
+            "rejected": {priority: dict(reasons) for priority, reasons in self.rejected.items()},
+            "ewma_service_ms": round(self.service_time * 1000, 3),
+            "ewma_queue_wait_ms": round(self.queue_wait * 1000, 3),
+        }
@@ -0,0 +1,225 @@
+import json
+
+import numpy as np
+
+from src.dataset.movie_rating import FlatGenreIds
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ARROW = "arrow"
+MSGPACK = "msgpack"
+JSON = "json"
+
+MEDIA_TYPES = {
+    ARROW: "application/vnd.apache.arrow.stream",
+    MSGPACK: "application/msgpack",
+    JSON: "application/json",
+}
+MEDIA_ALIASES = {
+    "application/vnd.apache.arrow.stream": ARROW,
+    "application/vnd.apache.arrow.file": ARROW,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/json": JSON,
+}
+
+# prepare_typed_input 과 같은 기본값
+DEFAULT_OVERVIEW = "영화 줄거리 정보 없음"
+DEFAULT_LANGUAGE = "en"
+
+
+class BatchPayloadError(ValueError):
+    """요청 본문을 컬럼 입력으로 바꿀 수 없음 (400)"""
+
+
+def media_format(content_type: str):
+    """Content-Type -> 포맷 이름 (지원하지 않으면 None)"""
+    return MEDIA_ALIASES.get((content_type or "").split(";")[0].strip().lower())
+
+
+def available(fmt: str):
+    return {ARROW: pa is not None, MSGPACK: msgpack is not None, JSON: True}.get(fmt, False)
+
+
+def negotiate(accept: str, default: str):
+    """
+    Accept 헤더 -> 응답 포맷 (q 값 높은 순, 설치된 포맷만)
+    Accept 가 없거나 */* 이면 요청과 같은 포맷, 맞는 포맷이 없으면 None
+    """
+    if not accept:
+        return default
+
+    candidates = []
+    for order, part in enumerate(accept.split(",")):
+        media, *params = [token.strip() for token in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            candidates.append((-q, order, media.lower()))
+
+    for _, _, media in sorted(candidates):
+        if media in ("*/*", "application/*"):
+            return default
+        fmt = MEDIA_ALIASES.get(media)
+        if fmt is not None and available(fmt):
+            return fmt
+    return None
+
+
+def _overview(values):
+    return [text if text and text.strip() else DEFAULT_OVERVIEW for text in values]
+
+
+def _language(values):
+    return [lang if lang else DEFAULT_LANGUAGE for lang in values]
+
+
+def _genre_names_to_ids(rows, genre_decode: dict):
+    ids = []
+    for names in rows:
+        if isinstance(names, str):
+            names = json.loads(names)
+        ids.append([genre_decode.get(name, 0) for name in names or []])
+    return ids
+
+
+def _check_lengths(columns: dict, n_rows: int):
+    for name, values in columns.items():
+        if len(values) != n_rows:
+            raise BatchPayloadError(f"컬럼 길이가 다릅니다: {name}={len(values)}, overview={n_rows}")
+
+
+def _arrow_column(table, name: str):
+    if name not in table.column_names:
+        return None
+    column = table.column(name)
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+def _arrow_numeric(array, n_rows: int):
+    """숫자 컬럼 -> float64 배열 (float64 이고 null 이 없으면 Arrow 버퍼를 복사 없이 그대로 사용)"""
+    if array is None:
+        return np.zeros(n_rows, dtype=np.float64)
+    if array.type != pa.float64():
+        array = array.cast(pa.float64())
+    if array.null_count:
+        array = array.fill_null(0.0)
+    return array.to_numpy(zero_copy_only=False)
+
+
+def _arrow_genre_ids(array):
+    """list<int> 컬럼 -> FlatGenreIds (값/오프셋 버퍼 사용, 파이썬 리스트 생성 없음)"""
+    if array.null_count:
+        # null 행의 오프셋 구간은 비어 있다는 보장이 없으므로 리스트로 변환
+        return [row or [] for row in array.to_pylist()]
+
+    offsets = array.offsets.to_numpy().astype(np.int64)
+    values = array.values.slice(int(offsets[0]), int(offsets[-1] - offsets[0]))
+    if values.type != pa.int64():
+        values = values.cast(pa.int64())
+    if values.null_count:
+        values = values.fill_null(-1)
+    return FlatGenreIds(values.to_numpy(zero_copy_only=False), offsets[:-1] - offsets[0])
+
+
+def decode_arrow(body: bytes, genre_decode: dict):
+    """Arrow IPC 스트림(또는 파일) -> build_features_from_columns 입력"""
+    try:
+        reader = pa.ipc.open_stream(body)
+    except pa.ArrowInvalid:
+        try:
+            reader = pa.ipc.open_file(body)
+        except pa.ArrowInvalid as e:
+            raise BatchPayloadError(f"Arrow IPC 형식이 아닙니다: {e}")
+    table = reader.read_all()
+
+    overview = _arrow_column(table, "overview")
+    if overview is None:
+        raise BatchPayloadError("overview 컬럼이 필요합니다.")
+    n_rows = len(overview)
+
+    genre_ids = _arrow_column(table, "genre_ids")
+    genres = _arrow_column(table, "genres")
+    if genre_ids is not None:
+        if not (pa.types.is_list(genre_ids.type) or pa.types.is_large_list(genre_ids.type)):
+            raise BatchPayloadError(f"genre_ids 는 list<int> 컬럼이어야 합니다: {genre_ids.type}")
+        genre_ids = _arrow_genre_ids(genre_ids)
+    elif genres is not None:
+        genre_ids = _genre_names_to_ids(genres.to_pylist(), genre_decode)
+    else:
+        genre_ids = FlatGenreIds(np.empty(0, dtype=np.int64), np.zeros(n_rows, dtype=np.int64))
+
+    language = _arrow_column(table, "original_language")
+    columns = {
+        "overview": _overview(overview.to_pylist()),
+        "genre_ids": genre_ids,
+        "adult": _arrow_numeric(_arrow_column(table, "adult"), n_rows),
+        "video": _arrow_numeric(_arrow_column(table, "video"), n_rows),
+        "original_language": _language(language.to_pylist()) if language is not None else [DEFAULT_LANGUAGE] * n_rows,
+    }
+    _check_lengths(columns, n_rows)
+    return columns
+
+
+def decode_msgpack(body: bytes, genre_decode: dict):
+    """컬럼 단위 msgpack 맵 {"overview": [...], "genre_ids": [[...]], ...} -> build_features_from_columns 입력"""
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except Exception as e:
+        raise BatchPayloadError(f"msgpack 형식이 아닙니다: {e}")
+    if not isinstance(payload, dict) or "overview" not in payload:
+        raise BatchPayloadError("overview 컬럼을 가진 컬럼 맵이어야 합니다.")
+
+    n_rows = len(payload["overview"])
+    if "genre_ids" in payload:
+        genre_ids = [row or [] for row in payload["genre_ids"]]
+    elif "genres" in payload:
+        genre_ids = _genre_names_to_ids(payload["genres"], genre_decode)
+    else:
+        genre_ids = [[] for _ in range(n_rows)]
+
+    def numeric(name):
+        values = payload.get(name)
+        if values is None:
+            return np.zeros(n_rows, dtype=np.float64)
+        return np.asarray([value or 0 for value in values], dtype=np.float64)
+
+    columns = {
+        "overview": _overview(payload["overview"]),
+        "genre_ids": genre_ids,
+        "adult": numeric("adult"),
+        "video": numeric("video"),
+        "original_language": _language(payload.get("original_language") or [DEFAULT_LANGUAGE] * n_rows),
+    }
+    _check_lengths(columns, n_rows)
+    return columns
+
+
+def encode_predictions(fmt: str, preds, model_name: str, run_id: str = None):
+    """예측 결과 -> 응답 본문 (Arrow 는 pred 컬럼 하나짜리 레코드 배치, 모델 정보는 스키마 메타데이터)"""
+    preds = np.asarray(preds, dtype=np.float64)
+    if fmt == ARROW:
+        schema = pa.schema([("pred", pa.float64())], metadata={"model_name": model_name, "run_id": run_id or ""})
+        batch = pa.record_batch([pa.array(preds)], schema=schema)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+    payload = {"model_name": model_name, "run_id": run_id, "pred": preds.tolist()}
+    if fmt == MSGPACK:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload).encode("utf-8")
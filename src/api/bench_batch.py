@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+import time
+import random
+
+sys.path.append(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))))
+)
+
+import fire
+import numpy as np
+
+from src.api import batch_codec
+
+GENRE_IDS = [28, 35, 18, 16, 14, 53, 10751, 27, 10402, 9648, 10749, 878, 10770, 37, 10752, 99]
+WORDS = ["사랑", "가족", "전쟁", "우정", "복수", "여행", "비밀", "도시", "소년", "소녀", "범죄", "경찰", "학교", "미래", "과거"]
+
+
+def synthetic_rows(rows: int, seed: int = 42):
+    """벤치마크용 가짜 영화 입력 (행 단위 dict 리스트)"""
+    rng = random.Random(seed)
+    return [
+        {
+            "overview": " ".join(rng.choices(WORDS, k=rng.randint(10, 40))),
+            "genre_ids": rng.sample(GENRE_IDS, k=rng.randint(1, 3)),
+            "adult": 0,
+            "video": int(rng.random() < 0.05),
+            "original_language": rng.choice(["ko", "en", "ja"]),
+        }
+        for _ in range(rows)
+    ]
+
+
+def encode_request(fmt: str, items: list):
+    """행 리스트 -> (요청 본문, Content-Type)"""
+    if fmt == batch_codec.JSON:
+        return json.dumps({"items": items}, ensure_ascii=False).encode("utf-8"), batch_codec.MEDIA_TYPES[fmt]
+
+    columns = {name: [item[name] for item in items] for name in items[0]}
+    if fmt == batch_codec.MSGPACK:
+        return batch_codec.msgpack.packb(columns, use_bin_type=True), batch_codec.MEDIA_TYPES[fmt]
+
+    pa = batch_codec.pa
+    batch = pa.record_batch(
+        [
+            pa.array(columns["overview"], type=pa.string()),
+            pa.array(columns["genre_ids"], type=pa.list_(pa.int64())),
+            pa.array(columns["adult"], type=pa.float64()),
+            pa.array(columns["video"], type=pa.float64()),
+            pa.array(columns["original_language"], type=pa.string()),
+        ],
+        names=["overview", "genre_ids", "adult", "video", "original_language"],
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes(), batch_codec.MEDIA_TYPES[fmt]
+
+
+def _formats():
+    return [fmt for fmt in (batch_codec.JSON, batch_codec.MSGPACK, batch_codec.ARROW) if batch_codec.available(fmt)]
+
+
+def _report(results: dict, rows: int):
+    baseline = results.get(batch_codec.JSON)
+    for fmt, seconds in results.items():
+        speedup = f"x{baseline / seconds:.1f}" if baseline else "-"
+        print(f"   {fmt:8s}: {seconds * 1000:9.2f}ms / batch, {rows / seconds:12.0f} rows/s ({speedup} vs json)")
+
+
+def codec(rows: int = 10000, repeat: int = 20):
+    """
+    서버 없이 요청 본문 -> 모델 컬럼 입력 변환 비용만 비교 (JSON 은 Pydantic 검증 포함)
+    python src/api/bench_batch.py codec --rows=10000
+    """
+    from src.api.routers.predict import decode_batch
+
+    items = synthetic_rows(rows)
+    results = {}
+    for fmt in _formats():
+        body, _ = encode_request(fmt, items)
+        decode_batch(fmt, body, {})
+        started = time.perf_counter()
+        for _ in range(repeat):
+            decode_batch(fmt, body, {})
+        results[fmt] = (time.perf_counter() - started) / repeat
+        print(f"✅ {fmt}: body {len(body) / 1024:.1f}KB")
+
+    print(f"📊 decode ({rows} rows, {repeat} repeats)")
+    _report(results, rows)
+    return {fmt: round(seconds * 1000, 3) for fmt, seconds in results.items()}
+
+
+def http(url: str = "http://localhost:8000", rows: int = 1000, repeat: int = 20, model: str = None):
+    """
+    실행 중인 서버의 /predict/batch 종단 간 처리량 비교 (요청 포맷과 같은 포맷으로 응답)
+    python src/api/bench_batch.py http --url=http://localhost:8000 --rows=1000
+    """
+    import requests
+
+    items = synthetic_rows(rows)
+    params = {"model": model} if model else None
+    results = {}
+    with requests.Session() as session:
+        for fmt in _formats():
+            body, content_type = encode_request(fmt, items)
+            headers = {"Content-Type": content_type, "Accept": content_type}
+            timings = []
+            for _ in range(repeat + 1):
+                started = time.perf_counter()
+                response = session.post(f"{url}/predict/batch", data=body, headers=headers, params=params, timeout=600)
+                response.raise_for_status()
+                timings.append(time.perf_counter() - started)
+            # 첫 요청은 워밍업으로 제외
+            results[fmt] = float(np.median(timings[1:]))
+            print(f"✅ {fmt}: request {len(body) / 1024:.1f}KB, response {len(response.content) / 1024:.1f}KB")
+
+    print(f"📊 /predict/batch ({rows} rows, median of {repeat})")
+    _report(results, rows)
+    return {fmt: round(seconds * 1000, 3) for fmt, seconds in results.items()}
+
+
+if __name__ == "__main__":
+    fire.Fire({"codec": codec, "http": http})
@@ -1,26 +1,50 @@
 import os
 from fastapi import APIRouter
-from src.ml.loader import get_model
+from fastapi.responses import JSONResponse
 
+from src.api import state
 
 
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 frontend_path = os.path.join(project_root, "frontend")
+# 시작 시 한 번만 확인 (헬스체크마다 파일시스템을 조회하지 않음)
+FRONTEND_AVAILABLE = os.path.exists(frontend_path)
 
 router = APIRouter()
 
+
+def model_load_status():
+    """백그라운드 모델 로드 진행 상태 (메모리에 있는 값만 읽음)"""
+    if state.model_loader is not None:
+        return state.model_loader.info()
+    if state.preloaded:
+        return {"status": "preloaded"}
+    return {"status": "ready" if state.mlflow_model is not None else "not_started"}
+
+
+@router.get("/livez")
+async def liveness():
+    """프로세스/이벤트 루프 생존 확인 (모델 로드 여부와 무관하게 항상 200)"""
+    return {"status": "alive"}
+
+
+@router.get("/readyz")
+async def readiness():
+    """서빙 모델이 로드되어 예측 요청을 받을 수 있으면 200, 아니면 503"""
+    ready = state.mlflow_model is not None
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "model_load": model_load_status()},
+        status_code=200 if ready else 503,
+    )
+
+
 @router.get("/health")
 async def health_check():
-    """서버 상태 확인"""
-    try:
-        model = get_model()
-        model_loaded = model is not None
-    except:
-        model_loaded = False
-        
+    """서버 상태 확인 (캐시된 상태만 읽으며 모델 로드를 시도하지 않음)"""
     return {
         "status": "healthy",
-        "model_loaded": model_loaded,
+        "model_loaded": state.mlflow_model is not None,
+        "model_load": model_load_status(),
         "service": "영화 평점 예측 서비스",
-        "frontend_available": os.path.exists(frontend_path)
-    }
\ No newline at end of file
+        "frontend_available": FRONTEND_AVAILABLE
+    }
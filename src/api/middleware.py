@@ -1,10 +1,49 @@
+import time
+from urllib.parse import urlencode
+
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import Request
+from fastapi.responses import JSONResponse
 
+from config import (
+    ADMISSION_ENABLED, PREDICT_MAX_CONCURRENCY, PREDICT_BATCH_MAX_CONCURRENCY,
+    PREDICT_MAX_QUEUE, PREDICT_LATENCY_SLO_MS,
+    ADMIN_TOKEN, PROFILE_SAMPLE_RATE, PROFILE_DIR, PROFILE_MAX_FILES,
+)
+from src.api import state
+from src.api.admission import AdmissionController, AdmissionRejected, INTERACTIVE, BATCH
+from src.api.profiling import ProfileStore, profile_request_meta
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 모델을 실행하지 않는 가벼운 조회 경로는 제한하지 않음
+ADMISSION_EXEMPT = {"/predict/health", "/predict/models", "/predict/genre-info", "/predict/explain/cache"}
+# 사용자가 화면에서 기다리는 단건 예측 경로
+INTERACTIVE_PREFIXES = ("/predict/json", "/predict/movie/", "/predict/sample")
+
+
+def admission_priority(path: str):
+    """/predict/* 요청의 우선순위 (제한 대상이 아니면 None)"""
+    if not path.startswith("/predict/") or path.rstrip("/") in ADMISSION_EXEMPT:
+        return None
+    return INTERACTIVE if path.startswith(INTERACTIVE_PREFIXES) else BATCH
+
+# 요청 로그에 값을 남기지 않을 쿼리 파라미터 (이름에 포함되면 가림)
+REDACTED_QUERY_KEYS = ("token", "secret", "password", "key")
+
+
+def redacted_url(request: Request):
+    """요청 로그용 URL (토큰 등 민감한 쿼리 값은 *** 로 대체)"""
+    if not request.url.query:
+        return str(request.url)
+    query = [
+        (key, "***" if any(word in key.lower() for word in REDACTED_QUERY_KEYS) else value)
+        for key, value in request.query_params.multi_items()
+    ]
+    return str(request.url.replace(query=urlencode(query)))
+
+
 def register_middleware(app):
     app.add_middleware(
         CORSMiddleware,
@@ -14,11 +53,69 @@ def register_middleware(app):
         allow_headers=["*"]
     )
 
+    # 요청 프로파일링 (관리자 토큰 또는 샘플링 비율이 설정된 경우에만 미들웨어 등록)
+    # 제한 미들웨어 안쪽에 두어 대기열 대기 시간이 아닌 실제 처리 구간만 기록
+    if ADMIN_TOKEN or PROFILE_SAMPLE_RATE > 0:
+        profiler = state.profiler = ProfileStore(
+            PROFILE_DIR, max_files=PROFILE_MAX_FILES, admin_token=ADMIN_TOKEN, sample_rate=PROFILE_SAMPLE_RATE,
+        )
+
+        @app.middleware("http")
+        async def profile_request(request: Request, call_next):
+            if not request.url.path.startswith("/predict/"):
+                return await call_next(request)
+            trigger = profiler.trigger(request)
+            request_profile = profiler.start(trigger) if trigger else None
+            if request_profile is None:
+                return await call_next(request)
+
+            started = time.perf_counter()
+            status_code = 500
+            try:
+                response = await call_next(request)
+                status_code = response.status_code
+            finally:
+                profile_id = profiler.stop(request_profile, profile_request_meta(request, status_code, started))
+            if profile_id:
+                response.headers["X-Profile-Id"] = profile_id
+            return response
+
+    if ADMISSION_ENABLED:
+        state.admission = AdmissionController(
+            max_concurrency=PREDICT_MAX_CONCURRENCY,
+            max_queue=PREDICT_MAX_QUEUE,
+            latency_slo_ms=PREDICT_LATENCY_SLO_MS,
+            batch_max_concurrency=PREDICT_BATCH_MAX_CONCURRENCY,
+        )
+
+        @app.middleware("http")
+        async def admission_control(request: Request, call_next):
+            priority = admission_priority(request.url.path)
+            if priority is None:
+                return await call_next(request)
+
+            try:
+                await state.admission.acquire(priority)
+            except AdmissionRejected as e:
+                logger.warning(f"[WARN] {request.method} {request.url.path} shed ({priority}, {e.reason})")
+                return JSONResponse(
+                    status_code=503,
+                    content={"detail": "요청이 많아 잠시 후 다시 시도해주세요.", "reason": e.reason},
+                    headers={"Retry-After": str(e.retry_after)},
+                )
+
+            started = time.perf_counter()
+            try:
+                return await call_next(request)
+            finally:
+                state.admission.release(priority, time.perf_counter() - started)
+
     @app.middleware("http")
     async def log_req_res(request: Request, call_next):
-        logger.info(f"[Request] {request.method} {request.url}")
+        url = redacted_url(request)
+        logger.info(f"[Request] {request.method} {url}")
         response = await call_next(request)
-        logger.info(f"[Response] {request.method} {request.url} , [Status_code] {response.status_code}")
+        logger.info(f"[Response] {request.method} {url} , [Status_code] {response.status_code}")
         return response
     
     
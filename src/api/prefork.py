@@ -0,0 +1,215 @@
+import os
+import gc
+import time
+import signal
+import shutil
+import socket
+import tempfile
+
+import numpy as np
+import torch
+import uvicorn
+
+from config import JOB_DB_PATH
+from src.api import state
+from src.jobs.store import JobStore
+from src.ml.registry import unwrap_python_model
+from src.dataset.text_features import HashingTfidfVectorizer
+from src.utils.logger import get_logger
+from src.utils.resources import apply_thread_budget, SERVING
+
+logger = get_logger(__name__)
+
+
+def _shared_dir():
+    # /dev/shm 이 있으면 tmpfs 에 두어 디스크 I/O 없이 페이지 캐시만 공유
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    # 리로드마다 새 디렉터리 사용 (기존 워커가 mmap 중인 파일을 덮어쓰면 SIGBUS)
+    return tempfile.mkdtemp(prefix=f"movie_rating_{os.getpid()}_", dir=base)
+
+
+def _to_mmap(array, path):
+    """배열을 파일로 내린 뒤 copy-on-write mmap 으로 다시 연다 (읽기만 하면 모든 워커가 같은 물리 페이지 공유)"""
+    np.save(path, np.ascontiguousarray(array))
+    return np.load(path, mmap_mode="c")
+
+
+def share_model_memory(registry, shared_dir: str = None):
+    """
+    상주 모델들의 큰 배열(임베딩 가중치, IDF 벡터)을 mmap 버퍼로 교체
+    트리 모델(LightGBM/XGBoost 부스터, sklearn Tree)은 C 힙에 있어 교체할 수 없으므로
+    fork 이후 copy-on-write 로 공유되며, gc.freeze() 로 GC 가 해당 페이지를 건드리지 않게 한다.
+    """
+    shared_dir = shared_dir or _shared_dir()
+    shared = set()
+
+    for name, model in registry.models.items():
+        python_model = unwrap_python_model(model)
+        key = getattr(python_model, "feature_key", None) or name
+        if key in shared:
+            continue
+        shared.add(key)
+
+        embedding = python_model.embedding_module.embedding
+        weight = _to_mmap(embedding.weight.detach().cpu().numpy(), os.path.join(shared_dir, f"{key}_emb.npy"))
+        embedding.weight = torch.nn.Parameter(torch.from_numpy(weight), requires_grad=False)
+
+        tf_idf = python_model.tf_idf
+        if isinstance(tf_idf, HashingTfidfVectorizer):
+            tf_idf.doc_counts = _to_mmap(tf_idf.doc_counts, os.path.join(shared_dir, f"{key}_doc_counts.npy"))
+        elif hasattr(tf_idf, "idf_"):
+            tf_idf.idf_ = _to_mmap(tf_idf.idf_, os.path.join(shared_dir, f"{key}_idf.npy"))
+
+    logger.info(f"[INFO] shared model buffers : {shared_dir} ({len(shared)} feature bundles)")
+    return shared_dir
+
+
+def _bind_socket(host: str, port: int):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock, host, port):
+    config = uvicorn.Config(app, host=host, port=port, lifespan="on", log_config=None)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _preload(load_model_registry):
+    """부모 프로세스에서 모델 로드 + 큰 배열을 공유 mmap 버퍼로 교체 -> 공유 디렉터리 (실패 시 예외)"""
+    # 카탈로그 재생성은 Okt(JVM) 를 띄우므로 부모에서는 최신 인덱스만 읽고, 재생성은 워커에 맡긴다
+    # (fork 이전에 시작된 JVM 은 자식 프로세스에서 사용할 수 없음)
+    load_model_registry(build_catalog=False)
+    shared_dir = share_model_memory(state.model_registry)
+    state.preloaded = True
+
+    # 부모가 만든 객체들을 GC 추적 대상에서 빼서 워커에서 GC 가 공유 페이지를 쓰지 않도록 함
+    gc.collect()
+    gc.freeze()
+    return shared_dir
+
+
+def serve_prefork(app, host: str = "0.0.0.0", port: int = 8000, workers: int = 2):
+    """
+    부모 프로세스에서 모델/전처리 아티팩트를 한 번 로드한 뒤 N 개의 워커를 fork
+    - 워커는 같은 리스닝 소켓을 공유하고, lifespan 에서 모델을 다시 로드하지 않는다
+    - 워커가 죽으면 부모가 다시 fork
+    - SIGHUP (워커의 POST /reload 가 부모에 전달): 부모가 모델을 다시 로드한 뒤 워커를 하나씩 새로 fork 하고
+      기존 워커는 SIGTERM 으로 처리 중인 요청을 마치고 종료 (모든 워커가 같은 모델 + 공유 메모리로 교체)
+    """
+    from src.ml.loader import load_model_registry
+
+    sock = _bind_socket(host, port)
+
+    # 워커들이 물려받도록 모델 로드/fork 전에 서빙 스레드 예산 적용
+    apply_thread_budget(SERVING)
+
+    logger.info(f"[START] preloading models in parent (pid={os.getpid()})")
+    shared_dir = None
+    try:
+        shared_dir = _preload(load_model_registry)
+    except Exception as e:
+        logger.warning(f"MLflow 모델 사전 로딩 실패, 워커별로 로딩합니다: {e}")
+    logger.info("[END] preloading models")
+
+    # 이전 실행에서 끝나지 못한 학습 작업 정리 (워커들은 recover 하지 않음)
+    JobStore(JOB_DB_PATH).fail_interrupted()
+
+    parent_pid = os.getpid()
+    children = {}
+    # 리로드로 교체되어 종료 중인 워커 pid -> 그 워커가 쓰던 공유 디렉터리
+    retiring = {}
+    stopping = False
+    reload_requested = False
+
+    def spawn(slot):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGHUP, signal.SIG_DFL)
+            state.prefork_parent = parent_pid
+            try:
+                _run_worker(app, sock, host, port)
+            finally:
+                os._exit(0)
+        children[pid] = slot
+        logger.info(f"[INFO] worker {slot} started (pid={pid})")
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children) + list(retiring):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def request_reload(signum, frame):
+        nonlocal reload_requested
+        reload_requested = True
+
+    def reload_workers():
+        nonlocal shared_dir
+        logger.info(f"[START] reloading models in parent (pid={parent_pid})")
+        try:
+            new_shared_dir = _preload(load_model_registry)
+        except Exception as e:
+            # 기존 워커는 이전 모델로 계속 서빙
+            logger.error(f"[ERROR] 모델 리로드 실패, 기존 워커를 유지합니다: {e}")
+            return
+
+        # 워커를 하나씩 교체 (새 워커를 먼저 띄운 뒤 기존 워커 종료 -> 처리 가능한 워커가 비지 않음)
+        old_shared_dir, shared_dir = shared_dir, new_shared_dir
+        for pid, slot in list(children.items()):
+            spawn(slot)
+            children.pop(pid)
+            retiring[pid] = old_shared_dir
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        logger.info(f"[END] reloading models : {len(retiring)} workers retiring")
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGHUP, request_reload)
+
+    for slot in range(workers):
+        spawn(slot)
+
+    while children or retiring:
+        if reload_requested and not stopping:
+            reload_requested = False
+            reload_workers()
+
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            # 시그널 처리(리로드 요청) 확인을 위해 짧게 대기
+            time.sleep(0.5)
+            continue
+
+        if pid in retiring:
+            old_shared_dir = retiring.pop(pid)
+            logger.info(f"[INFO] retired worker exited (pid={pid})")
+            if old_shared_dir and old_shared_dir not in retiring.values():
+                shutil.rmtree(old_shared_dir, ignore_errors=True)
+            continue
+
+        slot = children.pop(pid, None)
+        if slot is None:
+            continue
+        if not stopping:
+            logger.warning(f"[WARN] worker {slot} (pid={pid}) exited with status {status}, restarting")
+            spawn(slot)
+
+    sock.close()
+    if shared_dir:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+    logger.info("서버 종료")
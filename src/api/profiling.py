@@ -0,0 +1,213 @@
+import os
+import re
+import json
+import hmac
+import time
+import random
+import pstats
+import cProfile
+import threading
+import functools
+import contextvars
+from datetime import datetime, timezone, timedelta
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+PROFILE_HEADER = "x-profile-token"
+# 이벤트 루프 cProfile 은 프로파일 중에 함께 처리된 다른 요청의 코루틴 작업도 기록함
+EVENT_LOOP_NOTE = "event-loop profile includes interleaved coroutine work from other in-flight requests"
+PROFILE_ID = re.compile(r"^[0-9T]+_\d+_\d+$")
+
+# 현재 요청의 프로파일 (스레드 풀로 넘어간 동기 작업도 같은 요청 프로파일에 합치기 위함)
+_current = contextvars.ContextVar("request_profile", default=None)
+
+
+def token_matches(token: str, expected: str):
+    return bool(expected) and token is not None and hmac.compare_digest(token, expected)
+
+
+class RequestProfile:
+    """요청 하나의 cProfile (이벤트 루프 스레드) + 스레드 풀에서 실행된 구간의 프로파일"""
+
+    def __init__(self, trigger: str):
+        self.trigger = trigger
+        self.thread_id = threading.get_ident()
+        self.profile = cProfile.Profile()
+        self.extra = []
+        self.token = None
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self.extra.append(profile)
+
+    def stats(self):
+        stats = pstats.Stats(self.profile)
+        with self._lock:
+            for profile in self.extra:
+                stats.add(profile)
+        return stats
+
+
+def profiled(fn):
+    """
+    스레드 풀에서 실행되는 동기 함수용 데코레이터
+    요청이 프로파일 중일 때만 해당 스레드에서 별도 cProfile 을 돌려 요청 프로파일에 합침 (아니면 바로 호출)
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        request_profile = _current.get()
+        if request_profile is None or threading.get_ident() == request_profile.thread_id:
+            return fn(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(fn, *args, **kwargs)
+        finally:
+            request_profile.add(profile)
+    return wrapper
+
+
+class ProfileStore:
+    """
+    요청 프로파일을 디스크 링 버퍼로 보관 (<id>.prof: cProfile stats, <id>.json: 요청 정보)
+    - .prof 는 snakeviz / flameprof / pstats 로 바로 열 수 있음
+    - max_files 를 넘으면 가장 오래된 프로파일부터 삭제
+    """
+
+    def __init__(self, root: str, max_files: int = 100, admin_token: str = "", sample_rate: float = 0.0):
+        self.root = root
+        self.max_files = max(1, max_files)
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self._busy = threading.Lock()
+        self._seq = 0
+        self.saved = 0
+        self.skipped = 0
+        os.makedirs(root, exist_ok=True)
+
+    def trigger(self, request):
+        """
+        이 요청을 프로파일할지 결정 (관리자 토큰 헤더 -> admin, 샘플링 -> sampled, 아니면 None)
+        토큰은 헤더로만 받음 (쿼리 문자열은 요청 로그/프록시 로그에 그대로 남음)
+        """
+        token = request.headers.get(PROFILE_HEADER)
+        if token is not None and token_matches(token, self.admin_token):
+            return "admin"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def start(self, trigger: str):
+        """
+        cProfile 은 스레드당 하나만 켤 수 있으므로 이벤트 루프에서 동시에 하나의 요청만 프로파일
+        이미 다른 요청을 프로파일 중이면 None
+        """
+        if not self._busy.acquire(blocking=False):
+            self.skipped += 1
+            return None
+        request_profile = RequestProfile(trigger)
+        request_profile.token = _current.set(request_profile)
+        request_profile.profile.enable()
+        return request_profile
+
+    def stop(self, request_profile, meta: dict):
+        request_profile.profile.disable()
+        _current.reset(request_profile.token)
+        self._busy.release()
+        try:
+            return self.save(request_profile, meta)
+        except Exception as e:
+            logger.warning(f"[WARN] failed to save request profile : {e}")
+            return None
+
+    def save(self, request_profile, meta: dict):
+        self._seq += 1
+        profile_id = f"{datetime.now(KST).strftime('%Y%m%dT%H%M%S%f')}_{os.getpid()}_{self._seq}"
+        meta = {
+            "id": profile_id,
+            "trigger": request_profile.trigger,
+            "pid": os.getpid(),
+            "created_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
+            "threads": 1 + len(request_profile.extra),
+            "note": EVENT_LOOP_NOTE,
+            **meta,
+        }
+
+        prof_path = os.path.join(self.root, f"{profile_id}.prof")
+        tmp_path = os.path.join(self.root, f".{profile_id}.prof.tmp")
+        request_profile.stats().dump_stats(tmp_path)
+        os.replace(tmp_path, prof_path)
+        with open(os.path.join(self.root, f"{profile_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        self.saved += 1
+        self._evict()
+        logger.info(f"[INFO] request profile saved : {profile_id} ({meta.get('method')} {meta.get('path')}, {meta.get('duration_ms')}ms)")
+        return profile_id
+
+    def _ids(self):
+        return sorted(name[:-len(".prof")] for name in os.listdir(self.root) if name.endswith(".prof") and not name.startswith("."))
+
+    def _evict(self):
+        for profile_id in self._ids()[:-self.max_files]:
+            for suffix in (".prof", ".json"):
+                try:
+                    os.remove(os.path.join(self.root, f"{profile_id}{suffix}"))
+                except FileNotFoundError:
+                    pass
+
+    def list(self):
+        """최신순 프로파일 목록"""
+        items = []
+        for profile_id in reversed(self._ids()):
+            try:
+                with open(os.path.join(self.root, f"{profile_id}.json"), "r", encoding="utf-8") as f:
+                    items.append(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                items.append({"id": profile_id})
+        return items
+
+    def path(self, profile_id: str):
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.root, f"{profile_id}.prof")
+        return path if os.path.exists(path) else None
+
+    def summary(self, profile_id: str, limit: int = 30):
+        """누적 시간 상위 함수 (뷰어 없이 빠르게 확인용)"""
+        path = self.path(profile_id)
+        if path is None:
+            return None
+        stats = pstats.Stats(path)
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+            rows.append({
+                "function": f"{filename}:{line}({func})",
+                "calls": nc,
+                "self_ms": round(tt * 1000, 3),
+                "cumulative_ms": round(ct * 1000, 3),
+            })
+        rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+        return {"id": profile_id, "total_ms": round(stats.total_tt * 1000, 3), "functions": rows[:limit]}
+
+    def stats(self):
+        return {
+            "sample_rate": self.sample_rate,
+            "admin_trigger": bool(self.admin_token),
+            "max_files": self.max_files,
+            "stored": len(self._ids()),
+            "saved": self.saved,
+            "skipped_busy": self.skipped,
+        }
+
+
+def profile_request_meta(request, status_code: int, started: float):
+    return {
+        "method": request.method,
+        "path": request.url.path,
+        "status_code": status_code,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
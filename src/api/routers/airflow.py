@@ -1,12 +1,12 @@
 import os
-import shutil
 
 from fastapi import APIRouter, HTTPException
+from src.api import state
+from src.jobs.store import JobConflictError
 from src.ml.loader import reload_model, get_model_info
 from src.utils.logger import get_logger
 from data_prepare.main import run_popular_movie_crawler
 from src.utils.utils import project_path
-from src.main import run_train
  
 logger = get_logger(__name__)
 router = APIRouter(prefix="/airflow")
@@ -47,25 +47,30 @@ def airflow_crawling():
 
 @router.post("/train")
 def airflow_train():
+    """
+    캐시 삭제 + 세 모델 재학습을 작업 큐에 등록하고 즉시 job_id 반환
+    (진행 상황은 /jobs/{job_id} 로 확인)
+    """
+    if state.job_manager is None:
+        raise HTTPException(status_code=503, detail="작업 큐가 초기화되지 않았습니다.")
 
     try:
-        # step2. rm cache file
-        cache_path = os.path.join(project_path(),"src","dataset","cache")
-        if os.path.exists(cache_path):
-            shutil.rmtree(cache_path)
-            print(f"cache 폴더 삭제 완료: {cache_path}")
-        else:
-            print(f"cache 폴더가 존재하지 않습니다: {cache_path}")
-
-        # step3. preprocess and model train
-        run_train("lightgbm")
-        run_train("randomforest")
-        run_train("xgboost") 
+        # step2. rm cache file + step3. preprocess and model train (워커 프로세스에서 실행)
+        job_id = state.job_manager.submit("train_all")
 
         return {
-            "status": "success", 
-            "message": "Success to airflow_train",
+            "status": "accepted", 
+            "message": "Success to submit airflow_train job",
+            "job_id": job_id,
+            "status_url": f"/jobs/{job_id}",
         }
+
+    except JobConflictError as e:
+        logger.warning(f"[WARN] : {str(e)}")
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "job_id": e.active_job_id}
+        )
         
     except Exception as e:
         logger.error(f"[ERROR] : {str(e)}")
@@ -73,3 +78,38 @@ def airflow_train():
             status_code=500,
             detail=f"airflow_train 오류가 발생했습니다: {str(e)}"
         )
+
+
+@router.post("/pipeline")
+def airflow_pipeline(force: str = None):
+    """
+    crawl -> preprocess -> train -> register -> reload 파이프라인을 작업 큐에 등록
+    입력이 바뀌지 않은 단계는 건너뛰므로 같은 날 여러 번 호출해도 안전
+    force: 다시 실행할 단계 이름 (콤마 구분, "all" 이면 전체)
+    """
+    if state.job_manager is None:
+        raise HTTPException(status_code=503, detail="작업 큐가 초기화되지 않았습니다.")
+
+    try:
+        job_id = state.job_manager.submit("pipeline", {"force": force})
+
+        return {
+            "status": "accepted",
+            "message": "Success to submit airflow_pipeline job",
+            "job_id": job_id,
+            "status_url": f"/jobs/{job_id}",
+        }
+
+    except JobConflictError as e:
+        logger.warning(f"[WARN] : {str(e)}")
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "job_id": e.active_job_id}
+        )
+
+    except Exception as e:
+        logger.error(f"[ERROR] : {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"airflow_pipeline 오류가 발생했습니다: {str(e)}"
+        )
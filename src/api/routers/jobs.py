@@ -0,0 +1,53 @@
+import json
+import asyncio
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from src.api import state
+from src.jobs.store import TERMINAL_STATUSES
+
+router = APIRouter(prefix="/jobs")
+
+
+def get_job_manager():
+    if state.job_manager is None:
+        raise HTTPException(status_code=503, detail="작업 큐가 초기화되지 않았습니다.")
+    return state.job_manager
+
+
+@router.get("/")
+async def list_jobs(limit: int = 20):
+    """최근 작업 목록"""
+    return {"jobs": await asyncio.to_thread(get_job_manager().list, limit)}
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태 / 진행률 / 결과 조회"""
+    job = await asyncio.to_thread(get_job_manager().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, interval: float = 1.0):
+    """작업 진행률을 Server-Sent Events 로 스트리밍 (작업 종료 시 스트림 종료)"""
+    manager = get_job_manager()
+    if await asyncio.to_thread(manager.get, job_id) is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+
+    async def event_stream():
+        last = None
+        while True:
+            job = await asyncio.to_thread(manager.get, job_id)
+            snapshot = (job["status"], job["progress"], job["message"])
+            if snapshot != last:
+                last = snapshot
+                yield f"data: {json.dumps(job, ensure_ascii=False)}\n\n"
+            if job["status"] in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(max(interval, 0.2))
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
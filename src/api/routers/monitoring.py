@@ -0,0 +1,93 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import FileResponse
+
+from config import ADMIN_TOKEN
+from src.api import state
+from src.api.profiling import token_matches
+from src.utils.resources import budget_summary
+from src.monitoring.live_stats import CATEGORICAL_FIELDS
+
+router = APIRouter(prefix="/monitoring")
+
+
+def get_live_monitor():
+    if state.live_monitor is None:
+        raise HTTPException(status_code=503, detail="모니터링이 초기화되지 않았습니다. (모델 미로드)")
+    return state.live_monitor
+
+
+@router.get("/stats")
+async def live_stats():
+    """서빙 트래픽 요약 (예측값/줄거리 길이/tf-idf norm 분위수, 장르·언어 상위 항목, UNK 장르 비율)"""
+    return get_live_monitor().stats()
+
+
+@router.get("/drift")
+async def live_drift():
+    """학습 참조 요약 대비 드리프트 (PSI, 상위 항목 분포 거리, UNK 장르 비율)"""
+    return get_live_monitor().drift()
+
+
+@router.get("/frequency")
+async def live_frequency(field: str, item: str):
+    """특정 장르 ID / 언어 코드의 빈도 추정 (count-min)"""
+    if field not in CATEGORICAL_FIELDS:
+        raise HTTPException(status_code=400, detail=f"field 는 {CATEGORICAL_FIELDS} 중 하나여야 합니다.")
+    return get_live_monitor().frequency(field, item)
+
+
+@router.get("/prediction-log")
+async def prediction_log_stats():
+    """예측 로그 버퍼/기록/드롭 카운터"""
+    if state.prediction_log is None:
+        return {"status": "disabled"}
+    return {"status": "enabled", **state.prediction_log.stats()}
+
+
+@router.get("/admission")
+async def admission_stats():
+    """/predict/* 요청 제한 설정과 실행/대기/거절 카운터 (이 워커 프로세스 기준)"""
+    if state.admission is None:
+        return {"status": "disabled"}
+    return {"status": "enabled", **state.admission.stats()}
+
+
+@router.get("/resources")
+async def resource_budget():
+    """CPU 코어 수와 역할별(serving/training/batch) 스레드 예산, 이 워커 프로세스에 적용된 값"""
+    return budget_summary()
+
+
+def get_profiler(x_admin_token: Optional[str]):
+    if not token_matches(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다. (X-Admin-Token)")
+    if state.profiler is None:
+        raise HTTPException(status_code=404, detail="요청 프로파일링이 비활성화되어 있습니다.")
+    return state.profiler
+
+
+@router.get("/profiles")
+async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """저장된 요청 프로파일 목록 (최신순, 이 서버의 프로파일 디렉터리 기준)"""
+    profiler = get_profiler(x_admin_token)
+    return {**profiler.stats(), "profiles": profiler.list()}
+
+
+@router.get("/profiles/{profile_id}")
+async def profile_summary(profile_id: str, limit: int = 30, x_admin_token: Optional[str] = Header(None)):
+    """프로파일의 누적 시간 상위 함수"""
+    summary = get_profiler(x_admin_token).summary(profile_id, limit=limit)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"프로파일을 찾을 수 없습니다: {profile_id}")
+    return summary
+
+
+@router.get("/profiles/{profile_id}/download")
+async def download_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """cProfile stats 파일 (snakeviz / flameprof / python -m pstats 로 열기)"""
+    path = get_profiler(x_admin_token).path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"프로파일을 찾을 수 없습니다: {profile_id}")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
@@ -0,0 +1,81 @@
+import time
+from typing import List, Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from src.api import state
+from src.ml.registry import unwrap_python_model
+from src.ml.similarity import combine_feature_blocks
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+router = APIRouter(prefix="/movies")
+
+
+class SimilarRequest(BaseModel):
+    """줄거리(+장르) 기준 유사 영화 검색 요청"""
+    overview: str = Field(..., description="영화 줄거리")
+    genre_ids: Optional[List[int]] = Field(None, description="장르 ID 리스트")
+    k: int = Field(10, ge=1, le=100, description="반환할 영화 수")
+
+
+def get_similarity_catalog():
+    index = state.catalog_index
+    if index is None or index.similarity is None:
+        raise HTTPException(status_code=503, detail="유사 영화 인덱스가 준비되지 않았습니다. (카탈로그 생성 중)")
+    return index
+
+
+# 검색/피처화는 CPU 작업이고 /movies/* 는 수락 제어 대상이 아니므로
+# 동기 핸들러로 두어 스레드 풀에서 실행 (이벤트 루프를 막아 다른 요청이 멈추지 않도록)
+@router.get("/{movie_id}/similar")
+def similar_movies(
+    movie_id: int,
+    k: int = Query(10, ge=1, le=100),
+    exact: bool = Query(False, description="IVF 근사 검색 대신 전수 검색"),
+):
+    """카탈로그 영화와 줄거리/장르 벡터가 가까운 영화 top-k"""
+    index = get_similarity_catalog()
+    pos = index.position(movie_id)
+    if pos is None:
+        raise HTTPException(status_code=404, detail=f"카탈로그에 없는 영화입니다: {movie_id}")
+
+    started = time.perf_counter()
+    positions, similarities = index.similarity.search(index.similarity.vectors[pos], k=k, exclude=pos, exact=exact)
+    return {
+        "movie_id": movie_id,
+        "title": index.titles[pos] if pos < len(index.titles) else None,
+        "results": index.describe(positions, similarities),
+        "approximate": index.similarity.approximate and not exact,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+@router.post("/similar")
+def similar_to_overview(req: SimilarRequest):
+    """입력한 줄거리(+장르)와 비슷한 카탈로그 영화 top-k (카탈로그와 같은 Production 전처리로 벡터화)"""
+    index = get_similarity_catalog()
+    if state.mlflow_model is None:
+        raise HTTPException(status_code=503, detail="모델이 로드되지 않았습니다.")
+
+    started = time.perf_counter()
+    python_model = unwrap_python_model(state.mlflow_model)
+    X = python_model.build_features_from_columns(
+        overview=[req.overview],
+        genre_ids=[list(req.genre_ids or [])],
+        adult=[0.0],
+        video=[0.0],
+        original_language=["ko"],
+    )
+    query = combine_feature_blocks(X, python_model.embedding_module.embedding.embedding_dim)[0]
+    if not np.any(query):
+        raise HTTPException(status_code=400, detail="줄거리/장르에서 검색에 쓸 수 있는 단어나 장르를 찾지 못했습니다.")
+
+    positions, similarities = index.similarity.search(query, k=req.k)
+    return {
+        "results": index.describe(positions, similarities),
+        "approximate": index.similarity.approximate,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
@@ -1,8 +1,9 @@
 import os
 
-from fastapi import APIRouter
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import HTMLResponse
 
+from src.api.static import StaticFileCache
 from src.services.train_service import run_training_job
 # from src.main import run_train
 
@@ -10,28 +11,39 @@ router = APIRouter(prefix="/pages")
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 frontend_path = os.path.join(project_root, "frontend")
 
+# 프론트엔드 파일은 모듈 로드 시 한 번 읽어 미리 압축 (prefork 모드에서는 fork 전에 로드되어 공유)
+static_files = StaticFileCache(frontend_path)
+
 def get_simple_html(title: str, message: str) -> str:
     return f"""<html><head><title>{title}</title></head><body><h1>{title}</h1><p>{message}</p></body></html>"""
 
+def serve_page(request: Request, filename: str, title: str, message: str):
+    response = static_files.respond(request, filename)
+    return response if response is not None else HTMLResponse(get_simple_html(title, message))
+
 @router.get("/")
-async def root():
-    path = os.path.join(frontend_path, "login.html")
-    return FileResponse(path) if os.path.exists(path) else HTMLResponse(get_simple_html("홈", "서비스입니다."))
+async def root(request: Request):
+    return serve_page(request, "login.html", "홈", "서비스입니다.")
 
 @router.get("/login")
 @router.get("/login.html")
-async def login_page():
-    path = os.path.join(frontend_path, "login.html")
-    return FileResponse(path) if os.path.exists(path) else HTMLResponse(get_simple_html("로그인", "로그인 페이지입니다."))
+async def login_page(request: Request):
+    return serve_page(request, "login.html", "로그인", "로그인 페이지입니다.")
 
 @router.get("/survey")
 @router.get("/survey.html")
-async def survey_page():
-    path = os.path.join(frontend_path, "survey.html")
-    return FileResponse(path) if os.path.exists(path) else HTMLResponse(get_simple_html("설문", "영화 정보를 입력하세요."))
+async def survey_page(request: Request):
+    return serve_page(request, "survey.html", "설문", "영화 정보를 입력하세요.")
 
 @router.get("/easytest")
 @router.get("/easytest.html")
-async def survey_page():
-    path = os.path.join(frontend_path, "easytest.html")
-    return FileResponse(path) if os.path.exists(path) else HTMLResponse(get_simple_html("Easy Test", "모델 선택 후, 간단한 하이퍼 파라미터를 셋팅해주세요."))
\ No newline at end of file
+async def easytest_page(request: Request):
+    return serve_page(request, "easytest.html", "Easy Test", "모델 선택 후, 간단한 하이퍼 파라미터를 셋팅해주세요.")
+
+@router.get("/assets/{file_path:path}")
+async def asset_file(request: Request, file_path: str):
+    """frontend/assets 정적 파일 (사전 압축본 + ETag/Cache-Control, 조건부 요청은 304)"""
+    response = static_files.respond(request, f"assets/{file_path}")
+    if response is None:
+        raise HTTPException(status_code=404, detail=f"파일을 찾을 수 없습니다: {file_path}")
+    return response
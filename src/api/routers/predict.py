@@ -10,6 +10,7 @@ sys.path.append(
 import warnings
 warnings.filterwarnings('ignore')
 from src.api import state
+from src.api.profiling import profiled
 
 
 try:
@@ -40,16 +41,25 @@ except ImportError as e:
     print(f"❌ Pandas import 실패: {e}")
     raise
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Header, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import Optional, List
 import numpy as np
 import json
+import time
+import requests
+
+from config import MODEL_LOAD_RETRY_SECONDS
 
 # 팀원이 업데이트한 모듈들 import (try-catch로 안전하게)
 try:
     # from src.ml.loader import get_model
     from src.dataset.movie_rating import get_genre_decode
+    from data_prepare.crawler import TMDBCrawler
+    from src.ml.registry import unwrap_python_model
+    from src.ml.explain import explain_batch, explanation_cache
+    from src.api import batch_codec
     from src.utils.logger import get_logger
     print("✅ 모든 모듈 import 성공")
 except Exception as e:
@@ -59,6 +69,9 @@ except Exception as e:
 logger = get_logger(__name__)
 router = APIRouter(prefix="/predict")
 
+# 카탈로그에 없는 영화의 TMDB 상세 조회 타임아웃 (초)
+TMDB_TIMEOUT_SECONDS = 10
+
 class PredictRequest(BaseModel):
     """영화 정보 예측 요청 모델 - 팀원 최신 코드와 호환"""
     adult: Optional[int] = Field(None, description="성인영화 여부 (0: 아니오, 1: 예)")
@@ -74,6 +87,7 @@ class PredictResponse(BaseModel):
     status: str = Field("success", description="요청 처리 상태")
     message: Optional[str] = Field(None, description="추가 메시지")
     input_info: Optional[dict] = Field(None, description="처리된 입력 정보")
+    model_name: Optional[str] = Field(None, description="예측에 사용된 모델 이름")
 
 def convert_genre_ids_to_names(genre_ids: List[int]) -> List[str]:
     """
@@ -143,31 +157,80 @@ def prepare_model_input_v2(req: PredictRequest) -> pd.DataFrame:
         logger.error(f"DataFrame 생성 실패: {e}")
         raise HTTPException(status_code=500, detail=f"데이터 처리 중 오류: {str(e)}")
 
+def prepare_typed_input(req: PredictRequest) -> dict:
+    """
+    MovieRatingModel.build_features_from_columns 에 바로 넘길 컬럼 입력 생성
+    - 기본값은 prepare_model_input_v2 와 동일, 장르는 ID 그대로 사용 (없으면 UNK)
+    """
+    return {
+        "overview": [req.overview if req.overview and req.overview.strip() else batch_codec.DEFAULT_OVERVIEW],
+        "genre_ids": [list(req.genre_ids) if req.genre_ids else []],
+        "adult": [float(req.adult if req.adult is not None else 0)],
+        "video": [float(req.video if req.video is not None else 0)],
+        "original_language": [req.original_language if req.original_language else batch_codec.DEFAULT_LANGUAGE],
+    }
+
 @router.post("/json", response_model=PredictResponse)
-async def predict_json(req: PredictRequest):
+async def predict_json(
+    req: PredictRequest,
+    background_tasks: BackgroundTasks,
+    model: Optional[str] = Query(None, description="사용할 모델 이름 (레지스트리 등록 이름)"),
+    x_model_name: Optional[str] = Header(None, description="사용할 모델 이름 (헤더 지정)"),
+):
     """
     팀원의 최신 전처리 파이프라인을 사용한 영화 평점 예측
+    - 헤더(X-Model-Name) 또는 쿼리(model)로 모델 지정, 없으면 가중치 분배/기본 모델
+    - 섀도우 모델은 응답 이후 같은 피처로 스코어링
     """
     
+    started = time.perf_counter()
     try:
         logger.info(f"예측 요청 받음: {req}")
         
-        # 1. 입력 데이터 전처리
-        model_input = prepare_model_input_v2(req)
-        logger.info(f"입력 데이터 준비 완료: {model_input.dtypes}")
+        # 1. 입력 데이터 전처리 (DataFrame/장르 이름 변환 없이 타입 컬럼으로 바로 전달)
+        model_input = prepare_typed_input(req)
         
         # 2. 모델 로드
-        model = state.mlflow_model
-        if model is None:
+        registry = state.model_registry
+        if registry is None:
+            # 백그라운드 로딩 중인 정상 기동 구간이므로 서버 오류(500)가 아닌 503 + 재시도 안내
+            raise HTTPException(
+                status_code=503,
+                detail="모델이 로드되지 않았습니다. MLflow 서버 및 모델 등록 상태를 확인하세요.",
+                headers={"Retry-After": str(max(1, int(MODEL_LOAD_RETRY_SECONDS)))},
+            )
+
+        requested_model = x_model_name or model
+        try:
+            model_name = registry.route(requested_model)
+        except KeyError:
             raise HTTPException(
-                status_code=500, 
-                detail="모델이 로드되지 않았습니다. MLflow 서버 및 모델 등록 상태를 확인하세요."
+                status_code=400,
+                detail=f"등록되지 않은 모델입니다: {requested_model} (사용 가능: {registry.names})"
             )
         
-        # 3. 예측 수행
-        logger.info("예측 시작...")
-        prediction_result = model.predict(model_input)
+        # 3. 예측 수행 (피처는 요청당 한 번만 계산해 섀도우 모델과 공유)
+        # 피처화/추론은 CPU 작업이므로 스레드 풀에서 실행 (이벤트 루프를 막지 않아야 동시 요청이 수락 제어에 반영됨)
+        # 요청 프로파일은 이벤트 루프 스레드만 기록하므로 profiled 로 감싸 스레드 풀 구간도 합침
+        logger.info(f"예측 시작... (model={model_name})")
+        feature_cache = {}
+        prediction_result = await run_in_threadpool(profiled(registry.predict), model_name, model_input, feature_cache)
         logger.info(f"예측 결과 (원본): {prediction_result}")
+
+        # 라이브 입력/출력 통계 (응답 이후 고정 크기 스케치에 반영)
+        if state.live_monitor is not None:
+            background_tasks.add_task(
+                state.live_monitor.observe,
+                unwrap_python_model(registry.get(model_name)),
+                model_input,
+                registry.features_for(model_name, model_input, feature_cache),
+                prediction_result
+            )
+
+        if registry.shadow:
+            background_tasks.add_task(
+                registry.shadow_score, model_name, prediction_result, model_input, feature_cache
+            )
         
         # 4. 결과 처리
         if isinstance(prediction_result, (list, np.ndarray)):
@@ -179,23 +242,38 @@ async def predict_json(req: PredictRequest):
         pred_value = max(0.0, min(10.0, pred_value))
         
         logger.info(f"예측 완료! 최종 결과: {pred_value:.2f}")
+
+        # 재학습/분석용 예측 로그 (버퍼에만 넣고 기록은 백그라운드 태스크가 배치 처리)
+        if state.prediction_log is not None:
+            state.prediction_log.append({
+                "timestamp": time.time(),
+                "inputs": {key: values[0] for key, values in model_input.items()},
+                "pred": pred_value,
+                "model_name": model_name,
+                "run_id": getattr(registry.get(model_name), "run_id", None),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+            })
         
         # 6. 응답 생성
+        overview_val = model_input["overview"][0]
         input_summary = {
-            "processed_overview": model_input.iloc[0]["overview"][:50] + "..." if len(model_input.iloc[0]["overview"]) > 50 else model_input.iloc[0]["overview"],
-            "processed_genres": model_input.iloc[0]["genres"],
-            "processed_adult": model_input.iloc[0]["adult"],
-            "processed_video": model_input.iloc[0]["video"],
-            "processed_original_language": model_input.iloc[0]["original_language"]
+            "processed_overview": overview_val[:50] + "..." if len(overview_val) > 50 else overview_val,
+            "processed_genres": model_input["genre_ids"][0],
+            "processed_adult": model_input["adult"][0],
+            "processed_video": model_input["video"][0],
+            "processed_original_language": model_input["original_language"][0]
         }
         
         return PredictResponse(
             pred=round(pred_value, 2),
             status="success",
             message=f"예측 완료: {pred_value:.2f}점",
-            input_info=input_summary
+            input_info=input_summary,
+            model_name=model_name
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         error_msg = str(e)
         logger.error(f"예측 중 오류 발생: {error_msg}")
@@ -206,6 +284,222 @@ async def predict_json(req: PredictRequest):
             detail=f"예측 처리 중 오류: {error_msg}"
         )
 
+class ExplainBatchRequest(BaseModel):
+    """설명 배치 요청"""
+    items: List[PredictRequest] = Field(..., description="설명할 영화 목록 (최대 1000개)")
+    top_terms: int = Field(10, ge=1, le=100, description="반환할 tf-idf 상위 단어 수")
+
+
+MAX_EXPLAIN_BATCH = 1000
+
+
+@profiled
+def explain_items(items: List[PredictRequest], top_terms: int, requested_model: Optional[str]):
+    if not 1 <= len(items) <= MAX_EXPLAIN_BATCH:
+        raise HTTPException(status_code=400, detail=f"items 는 1 ~ {MAX_EXPLAIN_BATCH} 개여야 합니다.")
+
+    registry = state.model_registry
+    if registry is None:
+        raise HTTPException(status_code=503, detail="모델이 로드되지 않았습니다.")
+    try:
+        model_name = registry.route(requested_model)
+    except KeyError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"등록되지 않은 모델입니다: {requested_model} (사용 가능: {registry.names})"
+        )
+
+    # 요청별 타입 컬럼을 하나의 배치 컬럼으로 합침
+    columns = {}
+    for item in items:
+        for field, values in prepare_typed_input(item).items():
+            columns.setdefault(field, []).extend(values)
+
+    model = registry.get(model_name)
+    run_id = getattr(model, "run_id", None)
+    try:
+        explanations = explain_batch(unwrap_python_model(model), columns, run_id=run_id, top_terms=top_terms)
+    except TypeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"설명 계산 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail=f"설명 계산 중 오류: {str(e)}")
+
+    return {"model_name": model_name, "run_id": run_id, "explanations": explanations}
+
+
+# 기여도 계산은 CPU 작업이므로 이벤트 루프를 막지 않도록 동기 엔드포인트(스레드 풀)로 처리
+@router.post("/explain")
+def predict_explain(
+    req: PredictRequest,
+    top_terms: int = Query(10, ge=1, le=100),
+    model: Optional[str] = Query(None, description="사용할 모델 이름 (레지스트리 등록 이름)"),
+    x_model_name: Optional[str] = Header(None, description="사용할 모델 이름 (헤더 지정)"),
+):
+    """
+    예측 평점의 피처 기여도 (LightGBM/XGBoost 기본 기여도, RandomForest 는 경로 기반)
+    메타 플래그 / 장르 임베딩 / tf-idf 단어 단위로 묶어서 반환 (base_value + 기여도 합 = raw_pred, pred 는 [0, 10] 으로 clip 된 값)
+    """
+    result = explain_items([req], top_terms, x_model_name or model)
+    return {"model_name": result["model_name"], "run_id": result["run_id"], **result["explanations"][0]}
+
+
+@router.post("/explain/batch")
+def predict_explain_batch(
+    req: ExplainBatchRequest,
+    model: Optional[str] = Query(None, description="사용할 모델 이름 (레지스트리 등록 이름)"),
+    x_model_name: Optional[str] = Header(None, description="사용할 모델 이름 (헤더 지정)"),
+):
+    """여러 영화 설명을 한 번의 벡터화 호출로 계산 (같은 모델/입력은 캐시에서 바로 응답)"""
+    return explain_items(req.items, req.top_terms, x_model_name or model)
+
+
+@router.get("/explain/cache")
+async def predict_explain_cache():
+    """설명 캐시 크기/적중 통계"""
+    return explanation_cache.stats()
+
+
+class BatchPredictRequest(BaseModel):
+    """JSON 배치 예측 요청 (바이너리 포맷과 같은 엔드포인트, 비교 기준용)"""
+    items: List[PredictRequest] = Field(..., description="예측할 영화 목록")
+
+
+MAX_PREDICT_BATCH = 100000
+
+
+def decode_batch(fmt: str, body: bytes, genre_decode: dict):
+    """요청 본문 -> build_features_from_columns 입력"""
+    if fmt == batch_codec.ARROW:
+        return batch_codec.decode_arrow(body, genre_decode)
+    if fmt == batch_codec.MSGPACK:
+        return batch_codec.decode_msgpack(body, genre_decode)
+
+    try:
+        req = BatchPredictRequest(**json.loads(body))
+    except Exception as e:
+        raise batch_codec.BatchPayloadError(f"JSON 요청 형식 오류: {e}")
+    columns = {}
+    for item in req.items:
+        for field, values in prepare_typed_input(item).items():
+            columns.setdefault(field, []).extend(values)
+    if not columns:
+        raise batch_codec.BatchPayloadError("items 가 비어 있습니다.")
+    return columns
+
+
+@profiled
+def predict_batch_body(fmt: str, body: bytes, response_fmt: str, requested_model: Optional[str]):
+    registry = state.model_registry
+    if registry is None:
+        raise HTTPException(status_code=503, detail="모델이 로드되지 않았습니다.")
+    try:
+        model_name = registry.route(requested_model)
+    except KeyError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"등록되지 않은 모델입니다: {requested_model} (사용 가능: {registry.names})"
+        )
+    model = registry.get(model_name)
+
+    try:
+        columns = decode_batch(fmt, body, unwrap_python_model(model).genre_decode)
+    except batch_codec.BatchPayloadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    n_rows = len(columns["overview"])
+    if not 1 <= n_rows <= MAX_PREDICT_BATCH:
+        raise HTTPException(status_code=400, detail=f"행 수는 1 ~ {MAX_PREDICT_BATCH} 개여야 합니다. (요청: {n_rows})")
+
+    try:
+        preds = registry.predict(model_name, columns)
+    except Exception as e:
+        logger.error(f"배치 예측 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail=f"배치 예측 처리 중 오류: {str(e)}")
+
+    return batch_codec.encode_predictions(response_fmt, preds, model_name, getattr(model, "run_id", None)), n_rows
+
+
+@router.post("/batch")
+async def predict_batch(
+    request: Request,
+    model: Optional[str] = Query(None, description="사용할 모델 이름 (레지스트리 등록 이름)"),
+    x_model_name: Optional[str] = Header(None, description="사용할 모델 이름 (헤더 지정)"),
+):
+    """
+    대량 예측 (Content-Type 으로 요청 포맷, Accept 로 응답 포맷 선택)
+    - application/vnd.apache.arrow.stream : overview, genre_ids(list<int>) 또는 genres, adult, video, original_language 컬럼
+      숫자/장르 ID 컬럼은 Arrow 버퍼를 그대로 피처화에 사용하고, 응답은 pred(float64) 컬럼 하나의 레코드 배치
+    - application/msgpack : 같은 컬럼 이름의 컬럼 맵
+    - application/json : {"items": [PredictRequest, ...]} (Pydantic 검증, 비교 기준)
+    - 바이너리 경로는 대량 오프라인 스코어링용이므로 라이브 통계/예측 로그에 넣지 않음
+    """
+    fmt = batch_codec.media_format(request.headers.get("content-type"))
+    if fmt is None or not batch_codec.available(fmt):
+        supported = [batch_codec.MEDIA_TYPES[f] for f in batch_codec.MEDIA_TYPES if batch_codec.available(f)]
+        raise HTTPException(status_code=415, detail=f"지원하지 않는 요청 포맷입니다. (사용 가능: {supported})")
+
+    response_fmt = batch_codec.negotiate(request.headers.get("accept"), fmt)
+    if response_fmt is None:
+        raise HTTPException(status_code=406, detail="Accept 헤더에 맞는 응답 포맷이 없습니다.")
+
+    body = await request.body()
+    started = time.perf_counter()
+    # 디코딩/피처화/추론은 CPU 작업이므로 스레드 풀에서 실행
+    content, n_rows = await run_in_threadpool(predict_batch_body, fmt, body, response_fmt, x_model_name or model)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"배치 예측 완료: {n_rows} rows ({fmt} -> {response_fmt}), {elapsed_ms:.1f}ms")
+
+    return Response(
+        content=content,
+        media_type=batch_codec.MEDIA_TYPES[response_fmt],
+        headers={"X-Batch-Rows": str(n_rows), "Vary": "Accept"},
+    )
+
+
+@router.get("/movie/{movie_id}")
+async def predict_movie(movie_id: int, background_tasks: BackgroundTasks):
+    """
+    TMDB id 로 평점 조회
+    - 크롤링 카탈로그에 있는 영화는 사전 계산된 인덱스에서 바로 응답
+    - 없는 영화는 TMDB 상세 정보를 받아 실시간 추론으로 폴백
+    """
+    index = state.catalog_index
+    if index is not None:
+        score = index.lookup(movie_id)
+        if score is not None:
+            return {
+                "movie_id": movie_id,
+                "pred": round(score, 2),
+                "source": "catalog",
+                "run_id": index.run_id
+            }
+
+    # TMDB 호출은 블로킹 I/O 이므로 이벤트 루프를 막지 않도록 스레드 풀에서 실행 (타임아웃 포함)
+    try:
+        details = await run_in_threadpool(TMDBCrawler().get_movie_details, movie_id, timeout=TMDB_TIMEOUT_SECONDS)
+    except requests.RequestException as e:
+        logger.warning(f"[WARN] TMDB 영화 정보 조회 실패 ({movie_id}) : {e}")
+        raise HTTPException(status_code=503, detail=f"TMDB 영화 정보를 가져오지 못했습니다: {movie_id}")
+    if details is None:
+        raise HTTPException(status_code=404, detail=f"영화 정보를 찾을 수 없습니다: {movie_id}")
+
+    live_request = PredictRequest(
+        adult=int(bool(details.get("adult", False))),
+        video=int(bool(details.get("video", False))),
+        original_language=details.get("original_language"),
+        genre_ids=[genre["id"] for genre in details.get("genres", [])],
+        overview=details.get("overview"),
+        release_date=details.get("release_date")
+    )
+    result = await predict_json(live_request, background_tasks, model=None, x_model_name=None)
+
+    return {
+        "movie_id": movie_id,
+        "pred": result.pred,
+        "source": "live",
+        "run_id": getattr(state.mlflow_model, "run_id", None)
+    }
+
 @router.get("/health")
 async def predict_health():
     """예측 서비스 상태 확인 - pandas 호환성 포함"""
@@ -216,12 +510,13 @@ async def predict_health():
         # 모델 상태 확인
         model = state.mlflow_model
         model_status = "loaded" if model is not None else "not_loaded"
+        registry = state.model_registry
         
-        # 장르 디코딩 확인
+        # 장르 디코딩 확인 (헬스체크에서 파일을 읽지 않도록 로드된 모델의 매핑 사용)
         try:
-            genre_decode = get_genre_decode()
+            genre_decode = unwrap_python_model(model).genre_decode if model is not None else None
             genre_count = len(genre_decode) if genre_decode else 0
-        except:
+        except Exception:
             genre_count = 0
         
         return {
@@ -229,6 +524,8 @@ async def predict_health():
             "model_status": model_status,
             "pandas_version": pandas_version,
             "genre_decode_count": genre_count,
+            "models": registry.names if registry else [],
+            "catalog_size": len(state.catalog_index) if state.catalog_index is not None else 0,
             "service": "predict",
             "pipeline": "팀원 최신 전처리 파이프라인 연동",
             "version": "v2 - pandas compatibility fixed"
@@ -241,8 +538,16 @@ async def predict_health():
             "service": "predict"
         }
 
+@router.get("/models")
+async def predict_models():
+    """상주 중인 모델 목록, 라우팅 가중치, 섀도우 비교 통계 조회"""
+    registry = state.model_registry
+    if registry is None:
+        return {"status": "no_model", "models": {}}
+    return {"status": "loaded", **registry.info()}
+
 @router.get("/sample")
-async def predict_sample():
+async def predict_sample(background_tasks: BackgroundTasks):
     """샘플 데이터로 예측 테스트"""
     sample_request = PredictRequest(
         adult=0,
@@ -253,7 +558,7 @@ async def predict_sample():
         release_date="2024-01-01"
     )
     
-    return await predict_json(sample_request)
+    return await predict_json(sample_request, background_tasks, model=None, x_model_name=None)
 
 @router.get("/genre-info")
 async def get_genre_info():
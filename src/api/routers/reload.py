@@ -1,6 +1,11 @@
+import os
+import signal
+
 from fastapi import APIRouter
-import src.api
-from src.ml.loader import load_mlflow_model
+from fastapi.responses import JSONResponse
+
+from src.api import state
+from src.ml.loader import reload_model as reload_serving_models
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -8,7 +13,17 @@ router = APIRouter()
 
 @router.post("/reload")
 def reload_model():
+    if state.prefork_parent:
+        # prefork 모드: 이 워커만 다시 로드하지 않고 부모에게 맡긴다
+        # (부모가 모델을 다시 로드해 공유 메모리를 만든 뒤 모든 워커를 차례로 교체)
+        logger.info(f"[INFO] forwarding reload to prefork parent (pid={state.prefork_parent})")
+        os.kill(state.prefork_parent, signal.SIGHUP)
+        return JSONResponse(
+            status_code=202,
+            content={"status": "accepted", "message": "Reload scheduled for all workers"},
+        )
+
     logger.info("[START] reloading mlflow model")
-    src.api.mlflow_model = load_mlflow_model(model_uri="models:/best_model/Production")
+    reload_serving_models()
     logger.info("[END] mlflow model reloaded")
     return {"status": "success", "message": "Model reloaded successfully"}
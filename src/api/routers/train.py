@@ -1,9 +1,10 @@
-from fastapi import APIRouter, BackgroundTasks, status
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import JSONResponse
 from datetime import datetime, timezone, timedelta
 from pydantic import BaseModel
 
-from src.services.train_service import run_training_job
-# from src.main import run_train
+from src.api import state
+from src.jobs.store import JobConflictError
 
 router = APIRouter(prefix="/train")
 
@@ -12,22 +13,36 @@ class TrainRequest(BaseModel):
     training_params: dict ={}    
 
     
+# submit 은 SQLite 잠금 대기(최대 30초)와 프로세스 풀 생성을 포함하므로
+# 동기 핸들러로 두어 스레드 풀에서 실행 (airflow 라우터와 같음)
 @router.post("/")
-async def train_model(request: TrainRequest, background_tasks: BackgroundTasks):
-
-    background_tasks.add_task(
-        run_training_job,
-        model_name=request.model_name,
-        **request.training_params
-    )
+def train_model(request: TrainRequest):
+
+    if state.job_manager is None:
+        raise HTTPException(status_code=503, detail="작업 큐가 초기화되지 않았습니다.")
+
+    try:
+        job_id = state.job_manager.submit(
+            "train",
+            {"model_name": request.model_name, **request.training_params}
+        )
+    except JobConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "job_id": e.active_job_id}
+        )
 
     KST = timezone(timedelta(hours=9))
     timestamp = datetime.now(KST).strftime("%Y-%m-%d %H%M%S")
 
-    return {
-        "status": status.HTTP_202_ACCEPTED,
-        "success": True,
-        "message": "start model training at background task.",
-        "timestamp": timestamp
-    }    
-
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "status": status.HTTP_202_ACCEPTED,
+            "success": True,
+            "message": "start model training at worker process.",
+            "job_id": job_id,
+            "status_url": f"/jobs/{job_id}",
+            "timestamp": timestamp
+        }
+    )
@@ -1 +1,16 @@
-mlflow_model = None
\ No newline at end of file
+mlflow_model = None
+model_registry = None
+catalog_index = None
+job_manager = None
+live_monitor = None
+prediction_log = None
+# /predict/* 동시 실행/대기열 제한 (워커 프로세스별)
+admission = None
+# 요청 프로파일 저장소 (프로파일링 비활성화 시 None)
+profiler = None
+# 백그라운드 모델 로더 (prefork 로 미리 로드한 워커에서는 None)
+model_loader = None
+# prefork 모드에서 부모 프로세스가 모델을 미리 로드했는지 여부
+preloaded = False
+# prefork 워커일 때 부모 프로세스 pid (POST /reload 를 부모에게 SIGHUP 으로 전달)
+prefork_parent = None
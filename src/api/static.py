@@ -0,0 +1,118 @@
+import os
+import re
+import gzip
+import hashlib
+import mimetypes
+
+from fastapi import Request, Response
+
+from src.utils.logger import get_logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = get_logger(__name__)
+
+# 파일명에 내용 해시가 들어간 자산 (예: app.3f9a1c2e.js) 은 내용이 바뀌면 이름도 바뀌므로 영구 캐시
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.[a-z0-9]+$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+ASSET_CACHE = "public, max-age=3600"
+# HTML 은 매번 재검증 (ETag 가 같으면 304 로 본문 없이 응답)
+PAGE_CACHE = "no-cache"
+
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_COMPRESS_BYTES = 256
+
+
+class StaticAsset:
+    """메모리에 올린 정적 파일 + 사전 압축본 (인코딩별 강한 ETag)"""
+
+    def __init__(self, path: str, body: bytes, cache_control: str):
+        self.path = path
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.cache_control = cache_control
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {"identity": (body, f'"{digest}"')}
+
+        if self.media_type.startswith(COMPRESSIBLE) and len(body) >= MIN_COMPRESS_BYTES:
+            gz = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(gz) < len(body):
+                self.variants["gzip"] = (gz, f'"{digest}-gz"')
+            if brotli is not None:
+                br = brotli.compress(body, quality=11)
+                if len(br) < len(body):
+                    self.variants["br"] = (br, f'"{digest}-br"')
+
+    @property
+    def etags(self):
+        return {etag for _, etag in self.variants.values()}
+
+    def choose_encoding(self, accept_encoding: str):
+        accepted = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return "identity"
+
+
+def _if_none_match(header: str):
+    return {tag.strip().removeprefix("W/") for tag in (header or "").split(",") if tag.strip()}
+
+
+class StaticFileCache:
+    """
+    디렉터리의 정적 파일을 시작 시 한 번 읽고 gzip/brotli 로 미리 압축해 보관
+    - 요청마다 파일 시스템 접근/압축 없음 (prefork 모드에서는 부모에서 만들어 워커가 공유)
+    - If-None-Match 가 맞으면 본문 없이 304
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.assets = {}
+        self.refresh()
+
+    def _cache_control(self, rel_path: str):
+        if rel_path.endswith(".html"):
+            return PAGE_CACHE
+        if HASHED_NAME.search(os.path.basename(rel_path)):
+            return IMMUTABLE_CACHE
+        return ASSET_CACHE
+
+    def refresh(self):
+        assets = {}
+        if os.path.isdir(self.root):
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    rel_path = os.path.relpath(path, self.root).replace(os.sep, "/")
+                    with open(path, "rb") as f:
+                        assets[rel_path] = StaticAsset(path, f.read(), self._cache_control(rel_path))
+        self.assets = assets
+        logger.info(f"[INFO] static assets loaded : {self.root} ({len(assets)} files, brotli={'on' if brotli else 'off'})")
+        return self
+
+    def get(self, rel_path: str):
+        return self.assets.get(rel_path)
+
+    def respond(self, request: Request, rel_path: str):
+        """캐시에 없는 경로면 None"""
+        asset = self.get(rel_path)
+        if asset is None:
+            return None
+
+        encoding = asset.choose_encoding(request.headers.get("accept-encoding"))
+        body, etag = asset.variants[encoding]
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control, "Vary": "Accept-Encoding"}
+
+        matched = _if_none_match(request.headers.get("if-none-match")) & (asset.etags | {"*"})
+        if matched:
+            # 클라이언트가 가진 표현의 ETag 를 그대로 돌려줌
+            headers["ETag"] = next((tag for tag in matched if tag != "*"), etag)
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=asset.media_type, headers=headers)
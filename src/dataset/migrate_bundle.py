@@ -0,0 +1,96 @@
+import os
+import sys
+import glob
+import time
+import shutil
+import tempfile
+
+sys.path.append(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))))
+)
+
+import fire
+import joblib
+
+from src.dataset.text_features import slim_text_vectorizer
+from src.utils.utils import project_path
+
+DEFAULT_BUNDLE = os.path.join(project_path(), "src", "dataset", "cache", "artifacts_bundle.pkl")
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def migrate_bundle(path: str = DEFAULT_BUNDLE, backup: bool = True):
+    """
+    번들의 TfidfVectorizer(학습 데이터셋 참조 포함)를 어휘/IDF 만 가진 VocabTfidfVectorizer 로 교체
+    backup=True 이면 원본을 <path>.legacy 로 보관
+    """
+    size_before = os.path.getsize(path)
+    bundle, load_before = _timed(joblib.load, path)
+
+    vectorizer = bundle["tfidf_vectorizer"]
+    slim = slim_text_vectorizer(vectorizer)
+    if slim is vectorizer:
+        print(f"✅ 이미 변환된 번들입니다: {path}")
+        return {"path": path, "migrated": False, "size_bytes": size_before, "load_seconds": load_before}
+
+    bundle["tfidf_vectorizer"] = slim
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    joblib.dump(bundle, tmp_path)
+    if backup:
+        shutil.copy2(path, f"{path}.legacy")
+    os.replace(tmp_path, path)
+
+    size_after = os.path.getsize(path)
+    _, load_after = _timed(joblib.load, path)
+
+    report = {
+        "path": path,
+        "migrated": True,
+        "size_bytes": {"before": size_before, "after": size_after},
+        "load_seconds": {"before": round(load_before, 4), "after": round(load_after, 4)},
+    }
+    print(f"✅ 번들 변환 완료: {path}")
+    print(f"   size : {size_before / 1024:.1f}KB -> {size_after / 1024:.1f}KB")
+    print(f"   load : {load_before:.3f}s -> {load_after:.3f}s")
+    return report
+
+
+def migrate_model(model_uri: str = "models:/best_model/Production", dst: str = None):
+    """
+    MLflow 모델을 로컬로 내려받아 번들을 변환하고 pyfunc 로드 시간을 변환 전후로 비교
+    변환된 모델 디렉터리(dst)는 그대로 다시 로깅/등록할 수 있다.
+    """
+    import mlflow
+    from src.ml.config import init_mlflow
+
+    init_mlflow()
+    dst = dst or tempfile.mkdtemp(prefix="migrated_model_")
+    local_path = mlflow.artifacts.download_artifacts(artifact_uri=model_uri, dst_path=dst)
+
+    _, load_before = _timed(mlflow.pyfunc.load_model, local_path)
+    bundles = glob.glob(os.path.join(local_path, "artifacts", "**", "*.pkl"), recursive=True)
+    bundle_reports = [migrate_bundle(path, backup=False) for path in bundles]
+    _, load_after = _timed(mlflow.pyfunc.load_model, local_path)
+
+    print(f"✅ 모델 변환 완료: {model_uri} -> {local_path}")
+    print(f"   pyfunc load : {load_before:.3f}s -> {load_after:.3f}s")
+    return {
+        "model_uri": model_uri,
+        "local_path": local_path,
+        "bundles": bundle_reports,
+        "load_seconds": {"before": round(load_before, 4), "after": round(load_after, 4)},
+    }
+
+
+if __name__ == "__main__":
+    fire.Fire({
+        "bundle": migrate_bundle,
+        "model": migrate_model,
+    })
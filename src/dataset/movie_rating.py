@@ -2,7 +2,9 @@ import os
 import sys
 import re
 from collections import defaultdict
+from itertools import chain
 import json
+import hashlib
 import joblib
 
 sys.path.append(
@@ -16,14 +18,29 @@ import numpy as np
 from konlpy.tag import Okt
 import torch
 import torch.nn as nn
-import torch.nn.utils.rnn as rnn_utils
-from sklearn.feature_extraction.text import TfidfVectorizer
+import torch.nn.functional as F
 from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
 
+from config import TEXT_VECTORIZER, HASHING_N_FEATURES, TEXT_FEATURIZE_JOBS
+from src.dataset.text_features import HashingTfidfVectorizer, VocabTfidfVectorizer
+from src.ml.stage_profile import profile_stage
 from src.utils.utils import project_path, save_artifacts_bundle, load_artifacts_bundle, default_to_unk
 
 
+class FlatGenreIds:
+    """
+    이미 펼쳐진 장르 ID 배치 (flat_ids [total], offsets [batch] 행 시작 위치)
+    Arrow list 컬럼처럼 값/오프셋 버퍼를 그대로 쓸 수 있는 입력을 파이썬 리스트로 바꾸지 않고 임베딩에 전달
+    """
+
+    def __init__(self, flat_ids, offsets):
+        self.flat_ids = flat_ids
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+
 class GenreEmbeddingModule(nn.Module):
     def __init__(self, genre_id_set, emb_dim=32):
         super().__init__()
@@ -36,44 +53,78 @@ class GenreEmbeddingModule(nn.Module):
 
         self.embedding = nn.Embedding(num_embeddings=len(genre2idx), embedding_dim=emb_dim, padding_idx=0)
 
+        # 장르 ID -> 임베딩 행 조회 배열 (state_dict 에 포함하지 않아 기존 번들과 호환)
+        self.register_buffer("id_lookup", self._build_id_lookup(genre2idx, len(genre2idx)), persistent=False)
+
+    @staticmethod
+    def _build_id_lookup(genre2idx, num_embeddings):
+        # 임베딩 범위를 벗어난 인덱스는 load_state_dict 를 통과한 뒤 예측 시점에야 IndexError 가 나므로 여기서 확인
+        assert all(0 <= idx < num_embeddings for idx in genre2idx.values()), \
+            f"장르 인덱스가 임베딩 크기({num_embeddings})를 벗어났습니다. (중복된 장르 키 확인)"
+        numeric = {int(g): idx for g, idx in genre2idx.items() if g.lstrip('-').isdigit() and int(g) >= 0}
+        lookup = torch.zeros(max(numeric, default=0) + 1, dtype=torch.long)
+        for genre_id, idx in numeric.items():
+            lookup[genre_id] = idx
+        return lookup
+
     def get_genre2idx(self):
         return dict(self.genre2idx)
 
-    def forward(self, genre_ids_batch):
+    @staticmethod
+    def flatten(genre_ids_batch):
         """
-        genre_ids_batch: List[List[int]]
-        Returns: Tensor [batch_size, emb_dim]
+        List[List[int]] -> (flat_ids [total], offsets [batch]) EmbeddingBag 입력 형식
+        FlatGenreIds 는 변환 없이 그대로 사용
+        """
+        if isinstance(genre_ids_batch, FlatGenreIds):
+            return genre_ids_batch.flat_ids, genre_ids_batch.offsets
+        lengths = np.fromiter((len(row) for row in genre_ids_batch), dtype=np.int64, count=len(genre_ids_batch))
+        flat_ids = np.fromiter(map(int, chain.from_iterable(genre_ids_batch)), dtype=np.int64, count=int(lengths.sum()))
+        offsets = np.zeros(len(lengths), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        return flat_ids, offsets
+
+    def ids_to_index(self, flat_ids):
+        """장르 ID 배열 -> 임베딩 행 인덱스 (모르는 ID 는 0 = UNK)"""
+        ids = torch.as_tensor(flat_ids, dtype=torch.long, device=self.id_lookup.device)
+        known = (ids >= 0) & (ids < self.id_lookup.shape[0])
+        return torch.where(known, self.id_lookup[ids.clamp(0, self.id_lookup.shape[0] - 1)], torch.zeros_like(ids))
+
+    def encode_indices(self, indices, offsets):
+        """
+        임베딩 행 인덱스 + 오프셋 -> 행별 평균 임베딩
+        padding_idx(0) 는 평균 계산에서 제외되며, 유효한 장르가 없는 행은 0 벡터
         """
-        # 인덱스 매핑
-        mapped_ids = [[self.genre2idx[g] for g in row] for row in genre_ids_batch]
-        mapped_tensors = [torch.tensor(row, dtype=torch.long) for row in mapped_ids]
-
-        # 패딩 적용
-        padded = rnn_utils.pad_sequence(mapped_tensors, batch_first=True)  # [batch, max_len]
         device = self.embedding.weight.device
-        padded = padded.to(device)
+        indices = torch.as_tensor(indices, dtype=torch.long, device=device)
+        offsets = torch.as_tensor(offsets, dtype=torch.long, device=device)
+        return F.embedding_bag(indices, self.embedding.weight, offsets, mode="mean", padding_idx=0)
 
-        # 임베딩
-        emb = self.embedding(padded)  # [batch, max_len, emb_dim]
-
-        # 마스크를 이용한 평균
-        mask = (padded != 0).unsqueeze(-1)        # [batch, max_len, 1]
-        masked = emb * mask                       # [batch, max_len, emb_dim]
-        summed = masked.sum(dim=1)                # [batch, emb_dim]
-        count = mask.sum(dim=1).clamp(min=1)      # [batch, 1]
-        mean_emb = summed / count                 # [batch, emb_dim]
-
-        return mean_emb
+    def forward(self, genre_ids_batch):
+        """
+        genre_ids_batch: List[List[int]] (장르 ID) 또는 FlatGenreIds
+        Returns: Tensor [batch_size, emb_dim]
+        """
+        flat_ids, offsets = self.flatten(genre_ids_batch)
+        return self.encode_indices(self.ids_to_index(flat_ids), offsets)
 
 
 class MovieRatingDataset:
-    def __init__(self, df, tf_idf = None, embedding_module = None):
+    def __init__(self, df, tf_idf = None, embedding_module = None, text_vectorizer = TEXT_VECTORIZER,
+                 featurize_jobs = TEXT_FEATURIZE_JOBS):
         self.df = df
-        self.features = None
-        self.target = None
+        self.text_vectorizer = text_vectorizer
+        # 해싱 벡터라이저 fit/transform 병렬 프로세스 수 (1 이면 현재 프로세스에서 처리)
+        self.featurize_jobs = featurize_jobs
+        self.X = None
+        self.y = None
+        self.feature_names = None
+        self.index = None
         self.tf_idf = tf_idf
         self.embedding_module = embedding_module
-        self.okt = Okt()
+        # 첫 Okt 생성 시 JVM 이 시작됨
+        with profile_stage("okt_init"):
+            self.okt = Okt()
         self._preprocessing()
 
     def genre_embedding(self, emb_dim:int = 32):
@@ -101,47 +152,81 @@ class MovieRatingDataset:
     
 
     def okt_tokenizer(self, text):
+        # 이전 번들(TfidfVectorizer 가 이 bound method 를 토크나이저로 참조)을 역직렬화할 때 필요
         return self.okt.nouns(text)
 
 
     def overview_tf_idf(self, max_features:int = 300):
-        vectorizer = TfidfVectorizer(tokenizer=self.okt_tokenizer, max_features=max_features)
+        if self.text_vectorizer == "hashing":
+            return self.overview_hashing_tf_idf()
+        vectorizer = VocabTfidfVectorizer(max_features=max_features)
         vectorizer.fit(self.df['overview_clean'])
         return vectorizer
 
 
+    def overview_hashing_tf_idf(self, n_features:int = HASHING_N_FEATURES, n_jobs:int = None):
+        n_jobs = n_jobs or self.featurize_jobs
+        vectorizer = HashingTfidfVectorizer(n_features=n_features)
+        vectorizer.fit(self.df['overview_clean'], n_jobs=n_jobs)
+        return vectorizer
+
+
     def _preprocessing(self):
-        self.df['overview_clean'] = self.df['overview'].fillna("").apply(self.clean_korean_text)
+        with profile_stage("clean_text"):
+            self.df['overview_clean'] = self.df['overview'].fillna("").apply(self.clean_korean_text)
 
         # genre embedding
-        if self.embedding_module:
-            genre_vecs = self.embedding_module(self.df['genre_ids'].tolist())
-            genre_emb_df = self.tensor_to_df(genre_vecs, "emb", self.df.index)
-        else:
-            self.embedding_module = self.genre_embedding()
-            genre_vecs = self.embedding_module(self.df['genre_ids'].tolist())
-            genre_emb_df = self.tensor_to_df(genre_vecs, "emb", self.df.index)
+        with profile_stage("genre_embedding"):
+            if not self.embedding_module:
+                self.embedding_module = self.genre_embedding()
+            with torch.no_grad():
+                genre_vecs = self.embedding_module(self.df['genre_ids'].tolist()).cpu().numpy()
             
-        # overview tf-idf
-        if self.tf_idf:
-            X_tfidf = self.tf_idf.transform(self.df['overview_clean'])
-            tfidf_df = self.tensor_to_df(X_tfidf.toarray(), "tfidf", self.df.index)
-        else:
-            self.tf_idf = self.overview_tf_idf()
-            X_tfidf = self.tf_idf.transform(self.df['overview_clean'])
-            tfidf_df = self.tensor_to_df(X_tfidf.toarray(), "tfidf", self.df.index)
+        # overview tf-idf (Okt 명사 추출: fit + transform)
+        with profile_stage("tokenize"):
+            if not self.tf_idf:
+                self.tf_idf = self.overview_tf_idf()
+            if isinstance(self.tf_idf, HashingTfidfVectorizer) and self.featurize_jobs > 1:
+                X_tfidf = self.tf_idf.transform_parallel(self.df['overview_clean'], n_jobs=self.featurize_jobs)
+            else:
+                X_tfidf = self.tf_idf.transform(self.df['overview_clean'])
             
-        self.df['adult'] = self.df['adult'].astype('int')
-        self.df['video'] = self.df['video'].astype("int")
+        # 이진 컬럼은 int8 로 저장
+        self.df['adult'] = self.df['adult'].astype(np.int8)
+        self.df['video'] = self.df['video'].astype(np.int8)
 
         drop_features = ["backdrop_path", "id", "genre_ids", "original_title",
                           "title", "vote_count", "poster_path", "release_date",
                           "overview", "popularity",'overview_clean', 'original_language', 'vote_average']
-        self.df['is_english'] = (self.df["original_language"] == 'en').astype(int)
+        self.df['is_english'] = (self.df["original_language"] == 'en').astype(np.int8)
 
-        self.target = self.df['vote_average']
-        self.features = pd.concat([self.df, tfidf_df, genre_emb_df], axis = 1).drop(columns = drop_features, axis = 1)
-        
+        meta_df = self.df.drop(columns = drop_features)
+        n_meta, n_tfidf, n_emb = meta_df.shape[1], X_tfidf.shape[1], genre_vecs.shape[1]
+
+        self.feature_names = (list(meta_df.columns)
+                              + [f"tfidf_{i}" for i in range(n_tfidf)]
+                              + [f"emb_{i}" for i in range(n_emb)])
+        self.index = self.df.index
+
+        # 메타 + tf-idf + 장르 임베딩을 연속된 float32 행렬 하나에 바로 채움 (float64 DataFrame concat 제거)
+        with profile_stage("assemble"):
+            X = np.empty((len(self.df), n_meta + n_tfidf + n_emb), dtype=np.float32, order="C")
+            X[:, :n_meta] = meta_df.to_numpy(dtype=np.float32)
+            X[:, n_meta:n_meta + n_tfidf] = X_tfidf.toarray()
+            X[:, n_meta + n_tfidf:] = genre_vecs
+
+        self.X = X
+        self.y = self.df['vote_average'].to_numpy(dtype=np.float32)
+
+
+    @property
+    def features(self):
+        """X 를 복사 없이 감싼 DataFrame 뷰 (컬럼명이 필요한 경우에만 사용)"""
+        return pd.DataFrame(self.X, columns=self.feature_names, index=self.index, copy=False)
+
+    @property
+    def target(self):
+        return pd.Series(self.y, index=self.index, name='vote_average', copy=False)
 
     @property
     def genre2idx(self):
@@ -151,15 +236,32 @@ class MovieRatingDataset:
         
     @property
     def features_dim(self):
-        return self.features.shape[1]
+        return self.X.shape[1]
 
 
     def __len__(self):
-        return len(self.target)
+        return len(self.y)
 
 
     def __getitem__(self, idx):
-        return self.features.iloc[idx].values, self.target.iloc[idx]
+        return self.X[idx], self.y[idx]
+
+
+    def iter_batches(self, batch_size: int = 1024, shuffle: bool = False, seed: int = 42):
+        """
+        (X_batch, y_batch) 미니배치 이터레이터
+        shuffle=False 이면 연속 구간 슬라이스(복사 없음), True 이면 인덱스 셔플 후 가져온 복사본
+        """
+        n = len(self.y)
+        order = np.random.default_rng(seed).permutation(n) if shuffle else None
+
+        for start in range(0, n, batch_size):
+            end = min(start + batch_size, n)
+            if order is None:
+                yield self.X[start:end], self.y[start:end]
+            else:
+                batch_idx = order[start:end]
+                yield self.X[batch_idx], self.y[batch_idx]
 
 
     def __getstate__(self):
@@ -169,6 +271,14 @@ class MovieRatingDataset:
 
 
     def __setstate__(self, state):
+        # 이전 버전 캐시(features/target DataFrame 보관) 호환
+        if 'features' in state:
+            features = state.pop('features')
+            target = state.pop('target')
+            state['feature_names'] = list(features.columns)
+            state['index'] = features.index
+            state['X'] = np.ascontiguousarray(features.to_numpy(dtype=np.float32))
+            state['y'] = target.to_numpy(dtype=np.float32)
         self.__dict__.update(state)
         self.okt = Okt() 
 
@@ -180,10 +290,21 @@ def read_dataset():
     return df
 
 
-def split_dataset(df):
-    train_df, val_df = train_test_split(df, test_size=0.2, random_state=42)
-    train_df, test_df = train_test_split(train_df, test_size=0.2, random_state=42)
-    return train_df, val_df, test_df
+def _split_bucket(movie_id):
+    """영화 id -> [0, 1) 고정 값 (행 추가/순서 변경과 관계없이 같은 영화는 항상 같은 분할)"""
+    digest = hashlib.sha1(str(movie_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+
+def split_dataset(df, val_size=0.2, test_size=0.2):
+    """
+    영화 id 해시 기준 분할 (검증 val_size, 나머지 중 테스트 test_size -> 64/20/16)
+    크롤링 결과가 늘거나 순서가 바뀌어도 기존 영화의 분할이 바뀌지 않아 증분 학습의 새 행 판단과 검증 분할이 안정적
+    """
+    buckets = df["id"].map(_split_bucket)
+    val_mask = buckets < val_size
+    test_mask = ~val_mask & (buckets < val_size + (1 - val_size) * test_size)
+    return df[~val_mask & ~test_mask], df[val_mask], df[test_mask]
 
 
 def get_genre_decode():
@@ -205,38 +326,45 @@ def get_datasets(path="cache", use_cache=True):
     # 캐시 로드
     if use_cache and all(os.path.exists(p) for p in [train_cache, val_cache, test_cache, bundle_path]):
         print("✅ 캐시 및 아티팩트 불러오는 중...")
-        tfidf_vectorizer, genre2idx, embedding_module = load_artifacts_bundle(GenreEmbeddingModule, bundle_path)
+        with profile_stage("cache_load"):
+            tfidf_vectorizer, genre2idx, embedding_module = load_artifacts_bundle(GenreEmbeddingModule, bundle_path)
 
-        train_dataset = joblib.load(train_cache)
-        val_dataset = joblib.load(val_cache)
-        test_dataset = joblib.load(test_cache)
+        # 텍스트 벡터라이저 설정이 바뀐 경우 캐시를 쓰지 않고 다시 전처리
+        cached_kind = "hashing" if isinstance(tfidf_vectorizer, HashingTfidfVectorizer) else "tfidf"
+        if cached_kind == TEXT_VECTORIZER:
+            with profile_stage("cache_load"):
+                train_dataset = joblib.load(train_cache)
+                val_dataset = joblib.load(val_cache)
+                test_dataset = joblib.load(test_cache)
 
-        # 아티팩트 연결
-        train_dataset.tf_idf = tfidf_vectorizer
-        train_dataset.embedding_module = embedding_module
-        val_dataset.tf_idf = tfidf_vectorizer
-        val_dataset.embedding_module = embedding_module
-        test_dataset.tf_idf = tfidf_vectorizer
-        test_dataset.embedding_module = embedding_module
+            # 아티팩트 연결
+            train_dataset.tf_idf = tfidf_vectorizer
+            train_dataset.embedding_module = embedding_module
+            val_dataset.tf_idf = tfidf_vectorizer
+            val_dataset.embedding_module = embedding_module
+            test_dataset.tf_idf = tfidf_vectorizer
+            test_dataset.embedding_module = embedding_module
 
-        return train_dataset, val_dataset, test_dataset
+            return train_dataset, val_dataset, test_dataset
+
+        print(f"⚠️ 캐시 벡터라이저({cached_kind})와 설정({TEXT_VECTORIZER})이 달라 전처리를 다시 수행합니다.")
 
     # 전처리 수행
     print("🚀 캐시 없음 → 전처리 실행 중...")
-    df = read_dataset()
-    train_df, val_df, test_df = split_dataset(df)
+    with profile_stage("read"):
+        df = read_dataset()
+        train_df, val_df, test_df = split_dataset(df)
 
     train_dataset = MovieRatingDataset(train_df)
     val_dataset = MovieRatingDataset(val_df, tf_idf=train_dataset.tf_idf, embedding_module=train_dataset.embedding_module)
     test_dataset = MovieRatingDataset(test_df, tf_idf=train_dataset.tf_idf, embedding_module=train_dataset.embedding_module)
 
-    # 캐시 저장
-    joblib.dump(train_dataset, train_cache)
-    joblib.dump(val_dataset, val_cache)
-    joblib.dump(test_dataset, test_cache)
-
-    # 아티팩트 저장
-    save_artifacts_bundle(train_dataset.tf_idf, train_dataset.genre2idx, train_dataset.embedding_module.cpu(), path=bundle_path)
+    # 캐시 및 아티팩트 저장
+    with profile_stage("cache_save"):
+        joblib.dump(train_dataset, train_cache)
+        joblib.dump(val_dataset, val_cache)
+        joblib.dump(test_dataset, test_cache)
+        save_artifacts_bundle(train_dataset.tf_idf, train_dataset.genre2idx, train_dataset.embedding_module.cpu(), path=bundle_path)
     print("💾 전처리 및 아티팩트 캐시 저장 완료!")
 
     return train_dataset, val_dataset, test_dataset
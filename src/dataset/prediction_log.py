@@ -0,0 +1,57 @@
+import os
+import sys
+import glob
+import gzip
+import json
+import zlib
+
+sys.path.append(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))))
+)
+
+import pandas as pd
+
+from config import PREDICTION_LOG_DIR
+from src.monitoring.prediction_log import SEGMENT_SUFFIX, OPEN_SUFFIX
+
+
+def list_segments(directory: str = PREDICTION_LOG_DIR, include_open: bool = False):
+    """기록 완료된 세그먼트 목록 (파일명 시간순), include_open 이면 작성 중인 .part 도 포함"""
+    paths = glob.glob(os.path.join(directory, f"*{SEGMENT_SUFFIX}"))
+    if include_open:
+        paths += glob.glob(os.path.join(directory, f"*{SEGMENT_SUFFIX}{OPEN_SUFFIX}"))
+    return sorted(paths, key=os.path.basename)
+
+
+def iter_prediction_records(directory: str = PREDICTION_LOG_DIR, include_open: bool = False):
+    """세그먼트를 하나씩 스트리밍하며 예측 기록(dict)을 yield (잘린 마지막 gzip 멤버는 건너뜀)"""
+    for path in list_segments(directory, include_open):
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            print(f"⚠️ 손상된 세그먼트 일부를 건너뜁니다: {path} ({e})")
+
+
+def iter_prediction_batches(batch_size: int = 10000, directory: str = PREDICTION_LOG_DIR, include_open: bool = False):
+    """
+    예측 기록을 read_dataset() 과 같은 컬럼(overview, genre_ids, adult, video, original_language)의
+    DataFrame 배치로 변환해 yield (+ pred, run_id, model_name, latency_ms, timestamp)
+    """
+    batch = []
+    for record in iter_prediction_records(directory, include_open):
+        batch.append({**record.pop("inputs"), **record})
+        if len(batch) >= batch_size:
+            yield pd.DataFrame(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+def read_prediction_log(directory: str = PREDICTION_LOG_DIR, include_open: bool = False):
+    batches = list(iter_prediction_batches(directory=directory, include_open=include_open))
+    return pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
@@ -0,0 +1,268 @@
+import os
+import queue
+import multiprocessing
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+from konlpy.tag import Okt
+from sklearn.feature_extraction.text import HashingVectorizer, CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+
+def _attach_jvm_thread():
+    """현재 스레드를 JPype JVM 에 연결 (JVM 이 아직 없거나 이미 연결된 경우 아무것도 하지 않음)"""
+    import jpype
+    if jpype.isJVMStarted() and not jpype.isThreadAttachedToJVM():
+        jpype.attachThreadToJVM()
+
+
+class OktPool:
+    """
+    미리 준비(warm-up)된 Okt 인스턴스 풀
+    - attach() 동안 현재 스레드에 인스턴스 하나를 붙여 두고, 그 스레드의 토크나이저 호출은 모두 이 인스턴스 사용
+    - 여러 스레드가 하나의 분석기를 공유하지 않으므로 동시 추론이 스레드 수만큼 확장
+    - JVM 은 fork 이후 자식에서 쓸 수 없으므로 워커 프로세스 안에서 생성해야 함
+    """
+
+    def __init__(self, size: int = 4):
+        self.size = max(1, size)
+        self.pid = os.getpid()
+        self._free = queue.Queue()
+        self._local = threading.local()
+        self.leases = 0
+        self.waits = 0
+
+        for _ in range(self.size):
+            okt = Okt()
+            okt.nouns("형태소 분석기 준비")
+            self._free.put(okt)
+
+    def current(self):
+        return getattr(self._local, "okt", None)
+
+    @contextmanager
+    def attach(self):
+        okt = self.current()
+        if okt is not None:
+            # 이미 이 스레드에 붙어 있으면 그대로 사용 (중첩 호출)
+            yield okt
+            return
+
+        _attach_jvm_thread()
+        try:
+            okt = self._free.get_nowait()
+        except queue.Empty:
+            self.waits += 1
+            okt = self._free.get()
+        self.leases += 1
+        self._local.okt = okt
+        try:
+            yield okt
+        finally:
+            self._local.okt = None
+            self._free.put(okt)
+
+    def stats(self):
+        return {"size": self.size, "available": self._free.qsize(), "leases": self.leases, "waits": self.waits}
+
+
+_okt_pool = None
+
+
+def configure_okt_pool(size: int):
+    """서빙 프로세스에서 한 번 호출 (size 가 0 이하이면 풀 없이 토크나이저별 인스턴스 사용)"""
+    global _okt_pool
+    _okt_pool = OktPool(size) if size > 0 else None
+    return _okt_pool
+
+
+def get_okt_pool():
+    return _okt_pool
+
+
+@contextmanager
+def okt_session():
+    """요청(배치 피처화) 동안 현재 스레드에 풀의 Okt 를 붙임 (풀이 없으면 아무것도 하지 않음)"""
+    if _okt_pool is None:
+        yield None
+        return
+    with _okt_pool.attach() as okt:
+        yield okt
+
+
+class OktNounTokenizer:
+    """
+    Okt 명사 추출 토크나이저
+    - 데이터셋 객체에 묶이지 않은 독립 객체라 피클/프로세스 간 전달이 가능
+    - 풀이 설정된 프로세스에서는 현재 스레드에 붙은 풀 인스턴스를 사용 (학습된 벡터라이저를 다시 피클할 필요 없음)
+    - 풀이 없으면 Okt(JVM) 인스턴스를 사용하는 프로세스에서 지연 생성 (피클에서는 제외)
+    """
+
+    def __init__(self):
+        self._okt = None
+
+    def __call__(self, text):
+        if _okt_pool is not None:
+            okt = _okt_pool.current()
+            if okt is not None:
+                return okt.nouns(text)
+            with _okt_pool.attach() as okt:
+                return okt.nouns(text)
+
+        if self._okt is None:
+            self._okt = Okt()
+        _attach_jvm_thread()
+        return self._okt.nouns(text)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_okt'] = None
+        return state
+
+
+class VocabTfidfVectorizer:
+    """
+    어휘 사전 + IDF 만 보관하는 TF-IDF 벡터라이저 (서빙 번들용)
+    - TfidfVectorizer(tokenizer=..., smooth_idf=True, norm='l2') 와 같은 결과
+    - 학습 시 생긴 stop_words_(잘린 전체 어휘)나 데이터셋 객체(토크나이저 bound method)를 참조하지 않음
+    """
+
+    def __init__(self, max_features: int = None, tokenizer=None, lowercase: bool = True):
+        self.max_features = max_features
+        self.tokenizer = tokenizer or OktNounTokenizer()
+        self.lowercase = lowercase
+        self.vocabulary_ = None
+        self.idf_ = None
+
+    def _counter(self, vocabulary=None):
+        return CountVectorizer(
+            tokenizer=self.tokenizer,
+            token_pattern=None,
+            lowercase=self.lowercase,
+            max_features=self.max_features,
+            vocabulary=vocabulary,
+        )
+
+    def fit(self, texts):
+        counter = self._counter()
+        counts = counter.fit_transform(texts)
+        n_docs = counts.shape[0]
+        doc_counts = np.bincount(counts.indices, minlength=counts.shape[1])
+
+        self.vocabulary_ = {term: int(col) for term, col in counter.vocabulary_.items()}
+        self.idf_ = np.log((1 + n_docs) / (1 + doc_counts)) + 1
+        return self
+
+    def transform(self, texts):
+        counts = self._counter(self.vocabulary_).transform(texts).astype(np.float64)
+        tfidf = counts @ sp.diags(np.asarray(self.idf_))
+        return normalize(tfidf, norm="l2", copy=False).tocsr()
+
+    def get_feature_names_out(self):
+        return np.array(sorted(self.vocabulary_, key=self.vocabulary_.get), dtype=object)
+
+    @classmethod
+    def from_sklearn(cls, vectorizer: TfidfVectorizer):
+        """학습된 TfidfVectorizer 에서 어휘/IDF 만 복사 (토크나이저는 독립 OktNounTokenizer 로 교체)"""
+        slim = cls(max_features=vectorizer.max_features, lowercase=vectorizer.lowercase)
+        slim.vocabulary_ = {term: int(col) for term, col in vectorizer.vocabulary_.items()}
+        slim.idf_ = np.asarray(vectorizer.idf_, dtype=np.float64).copy()
+        return slim
+
+
+def slim_text_vectorizer(vectorizer):
+    """이전 번들의 TfidfVectorizer 를 VocabTfidfVectorizer 로 변환 (그 외는 그대로 반환)"""
+    if isinstance(vectorizer, TfidfVectorizer):
+        return VocabTfidfVectorizer.from_sklearn(vectorizer)
+    return vectorizer
+
+
+def _count_chunk(hasher, texts):
+    """청크 단위 문서 빈도 계산 (워커 프로세스에서 실행)"""
+    counts = hasher.transform(texts)
+    return counts.shape[0], np.bincount(counts.indices, minlength=hasher.n_features)
+
+
+def _transform_chunk(vectorizer, texts):
+    return vectorizer.transform(texts)
+
+
+def _process_pool(n_jobs: int):
+    """
+    청크 병렬 처리용 프로세스 풀
+    호출 시점에 이미 JVM(Okt)이 떠 있는 경우가 많고 fork 된 자식에서는 JVM 을 쓸 수 없으므로 spawn 사용
+    (토크나이저는 자식 프로세스에서 Okt 를 새로 생성)
+    """
+    return ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _chunks(texts, chunk_size):
+    texts = list(texts)
+    return [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+
+class HashingTfidfVectorizer:
+    """
+    어휘 사전 없이 고정된 버킷 수로 해싱하는 TF-IDF 벡터라이저
+    - transform 은 문서 빈도(document count) 배열만 사용하므로 청크를 여러 프로세스에서 독립적으로 처리 가능
+    - partial_fit 으로 새 문서의 빈도를 누적하면 전체 재학습 없이 IDF 갱신
+    - TfidfVectorizer(smooth_idf=True, norm='l2') 와 같은 IDF/정규화 방식
+    """
+
+    def __init__(self, n_features: int = 1024, tokenizer=None):
+        self.n_features = n_features
+        self.tokenizer = tokenizer or OktNounTokenizer()
+        self.n_docs = 0
+        self.doc_counts = np.zeros(n_features, dtype=np.int64)
+
+    @property
+    def hasher(self):
+        return HashingVectorizer(
+            n_features=self.n_features,
+            tokenizer=self.tokenizer,
+            token_pattern=None,
+            lowercase=False,
+            alternate_sign=False,
+            norm=None,
+        )
+
+    @property
+    def idf_(self):
+        return np.log((1 + self.n_docs) / (1 + self.doc_counts)) + 1
+
+    def merge_counts(self, n_docs: int, doc_counts):
+        self.n_docs += int(n_docs)
+        self.doc_counts += np.asarray(doc_counts, dtype=np.int64)
+        return self
+
+    def partial_fit(self, texts):
+        return self.merge_counts(*_count_chunk(self.hasher, texts))
+
+    def fit(self, texts, n_jobs: int = 1, chunk_size: int = 2000):
+        self.n_docs = 0
+        self.doc_counts = np.zeros(self.n_features, dtype=np.int64)
+
+        if n_jobs == 1:
+            return self.partial_fit(texts)
+
+        hasher = self.hasher
+        chunks = _chunks(texts, chunk_size)
+        with _process_pool(n_jobs) as executor:
+            for n_docs, doc_counts in executor.map(_count_chunk, [hasher] * len(chunks), chunks):
+                self.merge_counts(n_docs, doc_counts)
+        return self
+
+    def transform(self, texts):
+        counts = self.hasher.transform(texts).astype(np.float64)
+        tfidf = counts @ sp.diags(self.idf_)
+        return normalize(tfidf, norm="l2", copy=False).tocsr()
+
+    def transform_parallel(self, texts, n_jobs: int = None, chunk_size: int = 2000):
+        n_jobs = n_jobs or os.cpu_count()
+        chunks = _chunks(texts, chunk_size)
+        with _process_pool(n_jobs) as executor:
+            parts = list(executor.map(_transform_chunk, [self] * len(chunks), chunks))
+        return sp.vstack(parts).tocsr() if parts else sp.csr_matrix((0, self.n_features))
@@ -0,0 +1 @@
+# 학습 작업 큐 패키지 (작업 테이블 / 워커 프로세스 / 작업 매니저)
@@ -0,0 +1,86 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.jobs.store import JobStore
+from src.jobs.worker import run_job, JOB_HANDLERS
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RETRAIN_KEY = "retrain"
+
+
+class JobManager:
+    """
+    학습 작업을 API 프로세스 밖의 워커 프로세스 풀에서 실행
+    - 작업 상태/진행률은 SQLite 작업 테이블(JobStore)에 기록
+    - concurrency_key 가 같은 작업은 동시에 하나만 대기/실행 가능 (재학습 중복 방지)
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 1, recover: bool = True):
+        self.store = JobStore(db_path)
+        self.max_workers = max_workers
+        self._executor = None
+
+        if recover:
+            self.recover()
+
+    def recover(self):
+        interrupted = self.store.fail_interrupted()
+        if interrupted:
+            logger.warning(f"[WARN] 이전 실행에서 끝나지 못한 작업 {interrupted}건을 실패 처리했습니다.")
+
+    def _get_executor(self):
+        if self._executor is None:
+            # torch / JVM(Okt) 상태를 fork 로 복제하지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def submit(self, kind: str, params: dict = None, concurrency_key: str = RETRAIN_KEY):
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"❌ 지원하지 않는 작업 종류: {kind}. Must be one of : {list(JOB_HANDLERS)}")
+
+        params = params or {}
+        job_id = self.store.create(kind, params, concurrency_key=concurrency_key)
+
+        try:
+            future = self._get_executor().submit(run_job, self.store.db_path, job_id, kind, params)
+        except Exception as e:
+            # 작업 행이 queued 로 남으면 concurrency_key 를 계속 잡고 있어 이후 재학습이 모두 거절됨
+            logger.error(f"[ERROR] job {job_id} submit failed : {e}")
+            self.store.mark_failed(job_id, f"submit failed: {e}")
+            if isinstance(e, BrokenProcessPool):
+                self._executor = None
+            raise
+        future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+
+        logger.info(f"[INFO] job submitted : {job_id} ({kind})")
+        return job_id
+
+    def _on_done(self, job_id, future):
+        # 워커 프로세스가 비정상 종료(OOM 등)된 경우 run_job 이 상태를 기록하지 못하므로 여기서 처리
+        if future.cancelled():
+            # 종료 시 취소된 대기 작업도 queued 로 남지 않도록 실패 처리
+            self.store.mark_failed(job_id, "cancelled: server shutdown")
+            return
+        exc = future.exception()
+        if exc is not None:
+            logger.error(f"[ERROR] job {job_id} worker crashed : {exc}")
+            self.store.mark_failed(job_id, f"worker crashed: {exc}")
+            if isinstance(exc, BrokenProcessPool):
+                self._executor = None
+
+    def get(self, job_id: str):
+        return self.store.get(job_id)
+
+    def list(self, limit: int = 20):
+        return self.store.list(limit)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,147 @@
+import os
+import json
+import uuid
+import sqlite3
+from datetime import datetime, timezone, timedelta
+
+KST = timezone(timedelta(hours=9))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+
+class JobConflictError(Exception):
+    """같은 concurrency_key 를 가진 작업이 이미 대기/실행 중일 때 발생"""
+
+    def __init__(self, active_job_id):
+        super().__init__(f"이미 진행 중인 작업이 있습니다: {active_job_id}")
+        self.active_job_id = active_job_id
+
+
+def _now():
+    return datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class JobStore:
+    """
+    학습 작업 상태를 저장하는 SQLite 작업 테이블
+    - API 프로세스와 워커 프로세스가 같은 파일을 공유하므로 호출마다 커넥션을 새로 연다
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    concurrency_key TEXT,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+                """
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _to_dict(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def create(self, kind: str, params: dict, concurrency_key: str = None):
+        """
+        작업 생성 (queued)
+        concurrency_key 가 같은 활성 작업이 있으면 JobConflictError
+        """
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            # 활성 작업 확인과 삽입을 하나의 쓰기 트랜잭션으로 묶어 동시 요청 경합 방지
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if concurrency_key:
+                    row = conn.execute(
+                        "SELECT id FROM jobs WHERE concurrency_key = ? AND status IN (?, ?) LIMIT 1",
+                        (concurrency_key, *ACTIVE_STATUSES),
+                    ).fetchone()
+                    if row is not None:
+                        raise JobConflictError(row["id"])
+
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, params, concurrency_key, status, message, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, json.dumps(params), concurrency_key, QUEUED, "대기 중", _now()),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def get(self, job_id: str):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def list(self, limit: int = 20):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def mark_running(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, message = ? WHERE id = ?",
+                (RUNNING, _now(), "실행 중", job_id),
+            )
+
+    def update_progress(self, job_id: str, progress: float, message: str = None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?",
+                (float(progress), message, job_id),
+            )
+
+    def mark_succeeded(self, job_id: str, result=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, progress = 1, message = ?, result = ?, finished_at = ? WHERE id = ?",
+                (SUCCEEDED, "완료", json.dumps(result) if result is not None else None, _now(), job_id),
+            )
+
+    def mark_failed(self, job_id: str, error: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, error = ?, finished_at = ? WHERE id = ?",
+                (FAILED, "실패", error, _now(), job_id),
+            )
+
+    def fail_interrupted(self):
+        """이전 API 프로세스가 종료되며 끝나지 못한 작업을 실패 처리 (서버 시작 시 호출)"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, error = ?, finished_at = ? WHERE status IN (?, ?)",
+                (FAILED, "실패", "interrupted by server restart", _now(), *ACTIVE_STATUSES),
+            )
+        return cursor.rowcount
@@ -0,0 +1,70 @@
+import os
+import shutil
+import traceback
+
+from src.jobs.store import JobStore
+from src.utils.logger import get_logger
+from src.utils.resources import apply_thread_budget, TRAINING
+from src.utils.utils import project_path
+
+logger = get_logger(__name__)
+
+NIGHTLY_MODELS = ["lightgbm", "randomforest", "xgboost"]
+
+
+def _train(report, model_name: str, **training_params):
+    from src.ml.trainer import train_and_log_model
+    # 업로드가 끝난 뒤에 작업 성공으로 기록 (업로드 실패 시 작업 실패)
+    return train_and_log_model(model_name, progress_callback=report, **{"wait_for_upload": True, **training_params})
+
+
+def _train_all(report, models=None):
+    """캐시 삭제 후 전처리 + 모델별 학습 (기존 /airflow/train 과 동일한 순서)"""
+    from src.ml.trainer import train_and_log_model
+
+    cache_path = os.path.join(project_path(), "src", "dataset", "cache")
+    if os.path.exists(cache_path):
+        shutil.rmtree(cache_path)
+        logger.info(f"cache 폴더 삭제 완료: {cache_path}")
+
+    models = models or NIGHTLY_MODELS
+    results = {}
+    for idx, model_name in enumerate(models):
+        def model_report(progress, message, idx=idx, model_name=model_name):
+            report((idx + progress) / len(models), f"[{model_name}] {message}")
+
+        results[model_name] = train_and_log_model(model_name, progress_callback=model_report, wait_for_upload=True)
+    return results
+
+
+def _pipeline(report, force=None, models=None):
+    """crawl -> preprocess -> train -> register -> reload (변경 없는 단계는 건너뜀)"""
+    from src.pipeline.daily import run_daily_pipeline
+    return run_daily_pipeline(force=force, models=models, progress_callback=report)
+
+
+JOB_HANDLERS = {
+    "train": _train,
+    "train_all": _train_all,
+    "pipeline": _pipeline,
+}
+
+
+def run_job(db_path: str, job_id: str, kind: str, params: dict):
+    """워커 프로세스 진입점 (ProcessPoolExecutor 로 실행되므로 모듈 최상위 함수여야 함)"""
+    store = JobStore(db_path)
+    store.mark_running(job_id)
+    # 서빙 워커 몫을 뺀 학습 스레드 예산 (프로세스 단위, 여러 번 호출해도 같은 값)
+    apply_thread_budget(TRAINING)
+    logger.info(f"[START] job {job_id} ({kind}) pid={os.getpid()}")
+
+    def report(progress, message=None):
+        store.update_progress(job_id, progress, message)
+
+    try:
+        result = JOB_HANDLERS[kind](report, **params)
+        store.mark_succeeded(job_id, result)
+        logger.info(f"[END] SUCCESS job {job_id} ({kind})")
+    except Exception as e:
+        logger.error(f"[ERROR] job {job_id} ({kind}) failed : {e}")
+        store.mark_failed(job_id, "".join(traceback.format_exception_only(type(e), e)).strip())
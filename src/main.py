@@ -22,15 +22,33 @@ from src.utils.utils import init_seed, model_dir, project_path
 from src.utils.enums import ModelType
 from src.ml import trainer
 from src.ml import loader
+from src.utils.resources import apply_thread_budget, limit_estimator_threads, TRAINING, BATCH
 
 
 def run_train(model_name, **kwargs):
+    apply_thread_budget(TRAINING)
     trainer.train_and_log_model(model_name, **kwargs)
 
 
+def run_catalog_scoring(model_uri="models:/best_model/Production"):
+    from src.ml.catalog import build_catalog_index
+    from src.ml.registry import unwrap_python_model
+    apply_thread_budget(BATCH)
+    model = loader.load_mlflow_model(model_uri)
+    limit_estimator_threads(unwrap_python_model(model).model)
+    build_catalog_index(model)
+
+
+def run_pipeline(force=None):
+    from src.pipeline.daily import run_daily_pipeline
+    apply_thread_budget(TRAINING)
+    return run_daily_pipeline(force=force)
+
 
 if __name__ == "__main__":
     fire.Fire({
         "train": run_train,
+        "catalog": run_catalog_scoring,
+        "pipeline": run_pipeline,
     }
     )
\ No newline at end of file
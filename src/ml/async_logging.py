@@ -0,0 +1,240 @@
+import os
+import time
+import queue
+import shutil
+import hashlib
+import threading
+
+import mlflow
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SHARED_RUN_NAME = "shared_artifacts"
+_STOP = object()
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_artifact(path: str, cache_dir: str):
+    """
+    파일을 내용 해시 경로(cache_dir/<sha256>/<filename>)로 복사해 고정
+    백그라운드 업로드 도중 원본(데이터셋 캐시)이 삭제/재생성되어도 안전하며 같은 내용은 한 번만 복사
+    """
+    sha = file_sha256(path)
+    dst_dir = os.path.join(cache_dir, sha)
+    dst = os.path.join(dst_dir, os.path.basename(path))
+    if not os.path.exists(dst):
+        os.makedirs(dst_dir, exist_ok=True)
+        tmp = f"{dst}.tmp.{os.getpid()}"
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, dst)
+    return dst
+
+
+def fetch_shared_artifact(uri: str, cache_dir: str):
+    """
+    공유 run 의 내용 해시 경로(.../sha256/<hash>/<filename>) 아티팩트를 cache_dir/<hash>/<filename> 로 받아 재사용
+    학습한 장비에서는 snapshot_artifact 가 같은 경로에 이미 두었으므로 다운로드하지 않음
+    """
+    sha, filename = uri.rstrip("/").split("/")[-2:]
+    dst = os.path.join(cache_dir, sha, filename)
+    if not os.path.exists(dst):
+        downloaded = mlflow.artifacts.download_artifacts(artifact_uri=uri)
+        if file_sha256(downloaded) != sha:
+            raise ValueError(f"❌ 공유 아티팩트 내용 해시 불일치: {uri}")
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp = f"{dst}.tmp.{os.getpid()}"
+        shutil.copyfile(downloaded, tmp)
+        os.replace(tmp, dst)
+    return dst
+
+
+class SharedArtifactStore:
+    """
+    내용 해시(sha256) 기준으로 아티팩트를 실험별 공유 run 에 한 번만 업로드
+    - 경로: runs:/<shared_run_id>/sha256/<hash>/<filename>
+    - 같은 번들을 쓰는 여러 학습 run 은 태그로 이 경로를 참조
+    """
+
+    _lock = threading.Lock()
+    _known = set()
+
+    def __init__(self, client: MlflowClient, experiment_id: str):
+        self.client = client
+        self.experiment_id = experiment_id
+        self._shared_run_id = None
+
+    @property
+    def shared_run_id(self):
+        if self._shared_run_id is None:
+            runs = self.client.search_runs(
+                [self.experiment_id],
+                filter_string=f"tags.mlflow.runName = '{SHARED_RUN_NAME}'",
+                max_results=1,
+            )
+            if runs:
+                self._shared_run_id = runs[0].info.run_id
+            else:
+                run = self.client.create_run(self.experiment_id, run_name=SHARED_RUN_NAME)
+                self.client.set_terminated(run.info.run_id)
+                self._shared_run_id = run.info.run_id
+        return self._shared_run_id
+
+    def upload(self, path: str):
+        """업로드(또는 기존 업로드 재사용) 후 artifact URI 반환"""
+        sha = file_sha256(path)
+        artifact_dir = f"sha256/{sha}"
+        uri = f"runs:/{self.shared_run_id}/{artifact_dir}/{os.path.basename(path)}"
+        key = (self.shared_run_id, sha)
+
+        with self._lock:
+            if key in self._known:
+                return uri, False
+
+        if self.client.list_artifacts(self.shared_run_id, artifact_dir):
+            uploaded = False
+        else:
+            self.client.log_artifact(self.shared_run_id, path, artifact_dir)
+            uploaded = True
+
+        with self._lock:
+            self._known.add(key)
+        return uri, uploaded
+
+
+class AsyncRunLogger:
+    """
+    MLflow run 로깅을 백그라운드 스레드에서 순서대로 처리
+    - 학습 코드는 작업을 큐에 넣고 바로 반환
+    - 작업별 지수 백오프 재시도, close() 시 run 종료 상태 기록
+    """
+
+    def __init__(self, experiment_name: str, run_name: str, max_retries: int = 3, backoff_seconds: float = 2.0):
+        self.client = MlflowClient()
+        experiment = self.client.get_experiment_by_name(experiment_name)
+        experiment_id = experiment.experiment_id if experiment else self.client.create_experiment(experiment_name)
+
+        run = self.client.create_run(experiment_id, run_name=run_name)
+        self.run_id = run.info.run_id
+        self.run_name = run_name
+        self.shared_store = SharedArtifactStore(self.client, experiment_id)
+
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.failed = 0
+        self.model_uri = None
+        # (작업 설명, 재시도 포함 소요 시간, 성공 여부), 학습 단계 프로파일의 업로드 시간
+        self.timings = []
+
+        self._queue = queue.Queue()
+        self._done = threading.Event()
+        # 학습 프로세스가 끝나기 전에 남은 업로드를 마칠 수 있도록 non-daemon 스레드
+        self._thread = threading.Thread(target=self._run, name=f"mlflow-logger-{self.run_id[:8]}")
+        self._thread.start()
+
+    def _submit(self, description, fn, *args, **kwargs):
+        self._queue.put((description, fn, args, kwargs))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            description, fn, args, kwargs = item
+            started = time.perf_counter()
+            ok = False
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    fn(*args, **kwargs)
+                    ok = True
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        self.failed += 1
+                        logger.error(f"[ERROR][{self.run_name}] {description} failed after {attempt} attempts : {e}")
+                    else:
+                        logger.warning(f"[WARN][{self.run_name}] {description} failed (attempt {attempt}) : {e}")
+                        time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+            self.timings.append((description, time.perf_counter() - started, ok))
+
+        status = "FINISHED" if self.failed == 0 else "FAILED"
+        try:
+            self.client.set_terminated(self.run_id, status=status)
+        except Exception as e:
+            logger.error(f"[ERROR][{self.run_name}] failed to terminate run : {e}")
+        logger.info(f"[END][{self.run_name}] async mlflow logging done (status={status})")
+        self._done.set()
+
+    def log_params(self, params: dict):
+        self._submit("log_params", self.client.log_batch, self.run_id,
+                     params=[Param(k, str(v)) for k, v in params.items()])
+
+    def log_metrics(self, metrics: dict, step: int = 0):
+        timestamp = int(time.time() * 1000)
+        self._submit("log_metrics", self.client.log_batch, self.run_id,
+                     metrics=[Metric(k, float(v), timestamp, step) for k, v in metrics.items()])
+
+    def log_metric_history(self, key: str, points, batch_size: int = 1000):
+        """(step, value) 목록을 step 별 메트릭으로 기록 (학습 곡선), log_batch 한도에 맞춰 나눠 전송"""
+        timestamp = int(time.time() * 1000)
+        metrics = [Metric(key, float(value), timestamp, int(step)) for step, value in points]
+        for start in range(0, len(metrics), batch_size):
+            self._submit(f"log_metric_history({key})", self.client.log_batch, self.run_id,
+                         metrics=metrics[start:start + batch_size])
+
+    def set_tag(self, key: str, value):
+        self._submit(f"set_tag({key})", self.client.set_tag, self.run_id, key, value)
+
+    def log_artifact(self, path: str, artifact_path: str = None):
+        self._submit(f"log_artifact({os.path.basename(path)})", self.client.log_artifact, self.run_id, path, artifact_path)
+
+    def log_shared_artifact(self, path: str, tag_key: str, on_uploaded=None):
+        """
+        내용이 같은 파일은 한 번만 업로드하고 run 에는 공유 경로를 태그로 기록
+        on_uploaded(uri): 업로드 후 로깅 스레드에서 호출 (뒤에 넣은 작업이 URI 를 쓸 수 있도록)
+        """
+        def _upload():
+            uri, uploaded = self.shared_store.upload(path)
+            self.client.set_tag(self.run_id, tag_key, uri)
+            if on_uploaded is not None:
+                on_uploaded(uri)
+            logger.info(f"[INFO][{self.run_name}] {tag_key} -> {uri} ({'uploaded' if uploaded else 'dedup'})")
+
+        self._submit(f"log_shared_artifact({os.path.basename(path)})", _upload)
+
+    def log_pyfunc_model(self, ready=None, **log_model_kwargs):
+        """
+        pyfunc 모델 로깅 (fluent API 는 스레드별 활성 run 을 쓰므로 이 스레드에서 run 을 재개)
+        ready: 로깅 직전에 확인할 조건 (False 면 앞선 작업이 실패한 것으로 보고 이 작업도 실패 처리)
+        """
+        def _log_model():
+            if ready is not None and not ready():
+                raise RuntimeError("모델이 참조할 아티팩트가 준비되지 않음")
+            with mlflow.start_run(run_id=self.run_id):
+                model_info = mlflow.pyfunc.log_model(**log_model_kwargs)
+            self.model_uri = model_info.model_uri
+
+        self._submit("log_model", _log_model)
+
+    def defer(self, description: str, fn):
+        """앞서 넣은 작업이 모두 끝난 뒤 로깅 스레드에서 fn 실행 (다른 작업과 같은 재시도 적용)"""
+        self._submit(description, fn)
+
+    def close(self, wait: bool = False, timeout: float = None):
+        self._queue.put(_STOP)
+        if wait:
+            self.wait(timeout)
+
+    def wait(self, timeout: float = None):
+        return self._done.wait(timeout)
@@ -0,0 +1,121 @@
+import time
+
+import numpy as np
+import lightgbm as lgb
+import xgboost as xgb
+from sklearn.metrics import mean_squared_error
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TrainingBudget:
+    """
+    모델별 학습 시간 예산
+    - clock="wall": 경과 시간, clock="cpu": 프로세스 CPU 시간 (모든 스레드 합산)
+    - seconds 가 0 이하이면 무제한
+    """
+
+    def __init__(self, seconds: float = 0, clock: str = "wall"):
+        if clock not in ("wall", "cpu"):
+            raise ValueError(f"❌ 지원하지 않는 시간 기준: {clock}. Must be one of : ['wall', 'cpu']")
+        self.seconds = seconds
+        self.clock = clock
+        self.exhausted = False
+        self._timer = time.perf_counter if clock == "wall" else time.process_time
+        self._start = self._timer()
+
+    def elapsed(self):
+        return self._timer() - self._start
+
+    def check(self):
+        """예산을 넘었으면 True (한 번 넘으면 계속 True)"""
+        if not self.exhausted and self.seconds > 0 and self.elapsed() >= self.seconds:
+            self.exhausted = True
+            logger.warning(f"[WARN] training budget exhausted ({self.clock} {self.elapsed():.1f}s >= {self.seconds}s)")
+        return self.exhausted
+
+
+def lightgbm_deadline_callback(budget: TrainingBudget):
+    """
+    예산을 넘으면 그때까지의 최고 검증 점수 반복에서 학습 종료
+    (early_stopping 콜백과 함께 쓰며, 최고 반복은 첫 번째 검증 지표 기준으로 직접 추적)
+    """
+    best = {"iteration": 0, "score": None, "results": None}
+
+    def _callback(env):
+        if env.evaluation_result_list:
+            _, _, score, higher_better = env.evaluation_result_list[0]
+            if best["score"] is None or (score > best["score"] if higher_better else score < best["score"]):
+                best.update(iteration=env.iteration, score=score, results=env.evaluation_result_list)
+
+        if budget.check():
+            raise lgb.callback.EarlyStopException(best["iteration"], best["results"] or env.evaluation_result_list)
+
+    _callback.order = 40
+    return _callback
+
+
+class XGBoostDeadlineCallback(xgb.callback.TrainingCallback):
+    """예산을 넘으면 학습 중단 (최고 반복은 함께 쓰는 EarlyStopping 콜백이 기록)"""
+
+    def __init__(self, budget: TrainingBudget):
+        super().__init__()
+        self.budget = budget
+
+    def after_iteration(self, model, epoch, evals_log):
+        return self.budget.check()
+
+
+def fit_with_budget(model, X_train, y_train, X_val, y_val, budget: TrainingBudget,
+                    early_stopping_rounds: int = 0, chunk_size: int = 10, init_model=None):
+    """
+    검증 세트로 조기 종료하며 시간 예산 안에서 학습
+    반환: (best_iteration, [(반복 또는 트리 수, 검증 RMSE), ...] 학습 곡선)
+    - LightGBM: early_stopping + 마감 콜백
+    - XGBoost: early_stopping_rounds + 마감 콜백
+    - RandomForest: warm_start 로 chunk_size 개씩 트리를 늘리다 예산 초과 시 중단
+    init_model: 같은 종류의 학습된 부스팅 모델 (주어지면 그 트리들 뒤에 n_estimators 개까지 이어서 학습)
+    """
+    if isinstance(model, lgb.LGBMRegressor):
+        callbacks = [lightgbm_deadline_callback(budget)]
+        if early_stopping_rounds > 0:
+            callbacks.append(lgb.early_stopping(early_stopping_rounds, verbose=False))
+        model.fit(X_train, y_train, eval_set=[(X_val, y_val)], eval_metric="rmse", callbacks=callbacks,
+                  init_model=init_model)
+        curve = model.evals_result_["valid_0"]["rmse"]
+        best_iteration = model.best_iteration_ or len(curve)
+        return best_iteration, list(enumerate(curve, start=1))
+
+    if isinstance(model, xgb.XGBRegressor):
+        model.set_params(
+            eval_metric="rmse",
+            early_stopping_rounds=early_stopping_rounds or None,
+            callbacks=[XGBoostDeadlineCallback(budget)],
+        )
+        model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False,
+                  xgb_model=init_model.get_booster() if init_model is not None else None)
+        curve = model.evals_result()["validation_0"]["rmse"]
+        best_iteration = (model.best_iteration + 1) if early_stopping_rounds else len(curve)
+        # 콜백 객체는 pickle/파라미터 로깅 대상에서 제외
+        model.set_params(callbacks=None)
+        return best_iteration, list(enumerate(curve, start=1))
+
+    if init_model is not None:
+        raise TypeError(f"❌ 이어서 학습할 수 없는 모델: {type(model).__name__}")
+
+    # RandomForest: 트리 수를 조금씩 늘리며 예산/곡선 확인
+    n_estimators = model.get_params()["n_estimators"]
+    model.set_params(warm_start=True)
+    curve = []
+    built = 0
+    while built < n_estimators:
+        built = min(built + chunk_size, n_estimators)
+        model.set_params(n_estimators=built)
+        model.fit(X_train, y_train)
+        curve.append((built, mean_squared_error(y_val, np.clip(model.predict(X_val), 0, 10), squared=False)))
+        if budget.check():
+            break
+    model.set_params(warm_start=False)
+    return built, curve
@@ -0,0 +1,236 @@
+import os
+import json
+import fcntl
+import threading
+from datetime import datetime, timezone, timedelta
+
+import numpy as np
+
+from src.dataset.movie_rating import read_dataset
+from src.ml.registry import unwrap_python_model
+from src.ml.similarity import SimilarityIndex, combine_feature_blocks, save_similarity_index
+from src.utils.logger import get_logger
+from src.utils.utils import project_path
+
+logger = get_logger(__name__)
+
+CATALOG_DIR = os.path.join(project_path(), "models", "catalog")
+IDS_FILE = "ids.npy"
+SCORES_FILE = "scores.npy"
+META_FILE = "meta.json"
+TITLES_FILE = "titles.json"
+BUILD_LOCK_FILE = ".build.lock"
+
+
+def movies_to_columns(df):
+    """크롤링 데이터 -> build_features_from_columns 입력 (장르 ID 그대로 사용)"""
+    return {
+        "overview": df["overview"].fillna("").tolist(),
+        "genre_ids": df["genre_ids"].tolist(),
+        "adult": df["adult"].astype(float).tolist(),
+        "video": df["video"].astype(float).tolist(),
+        "original_language": df["original_language"].tolist(),
+    }
+
+
+def build_catalog_index(model, dst: str = CATALOG_DIR, chunk_size: int = 1000):
+    """
+    크롤링된 전체 영화를 Production 모델로 배치 스코어링해 TMDB id 정렬 배열로 저장
+    - ids.npy (int64, 오름차순) / scores.npy (float32) / meta.json
+    - 같은 피처로 유사 영화 검색용 정규화 벡터(vectors.npy, 큰 카탈로그는 IVF 포함)와 titles.json 도 함께 저장
+    """
+    os.makedirs(dst, exist_ok=True)
+    python_model = unwrap_python_model(model)
+
+    df = read_dataset().drop_duplicates(subset="id")
+    df = df.sort_values("id")
+
+    ids = df["id"].to_numpy(dtype=np.int64)
+    scores = np.empty(len(df), dtype=np.float32)
+    emb_dim = python_model.embedding_module.embedding.embedding_dim
+    vectors = None
+
+    logger.info(f"[START] catalog scoring : {len(df)} movies")
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        X = python_model.build_features_from_columns(**movies_to_columns(chunk))
+        scores[start:start + len(chunk)] = python_model.predict_features(X)
+
+        chunk_vectors = combine_feature_blocks(X, emb_dim)
+        if vectors is None:
+            vectors = np.empty((len(df), chunk_vectors.shape[1]), dtype=np.float32)
+        vectors[start:start + len(chunk)] = chunk_vectors
+
+    # 서빙 중인 인덱스를 덮어쓰지 않도록 임시 파일에 쓴 뒤 교체
+    for name, array in [(IDS_FILE, ids), (SCORES_FILE, scores)]:
+        tmp_path = os.path.join(dst, f".{name}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, os.path.join(dst, name))
+
+    similarity = save_similarity_index(vectors, dst) if vectors is not None else None
+    tmp_titles = os.path.join(dst, f".{TITLES_FILE}.tmp")
+    with open(tmp_titles, "w", encoding="utf-8") as f:
+        json.dump(df["title"].fillna("").tolist(), f, ensure_ascii=False)
+    os.replace(tmp_titles, os.path.join(dst, TITLES_FILE))
+
+    KST = timezone(timedelta(hours=9))
+    meta = {
+        "run_id": getattr(model, "run_id", None),
+        "count": int(len(ids)),
+        "similarity": similarity,
+        "built_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    tmp_meta = os.path.join(dst, f".{META_FILE}.tmp")
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, os.path.join(dst, META_FILE))
+
+    logger.info(f"[END] catalog index saved : {dst} ({meta['count']} movies, run_id={meta['run_id']})")
+    return CatalogIndex.load(dst)
+
+
+class CatalogIndex:
+    """mmap 으로 연 정렬 배열 기반 TMDB id -> 예측 평점 조회 (이진 탐색) + 유사 영화 검색"""
+
+    def __init__(self, ids, scores, meta, similarity: SimilarityIndex = None, titles=None):
+        self.ids = ids
+        self.scores = scores
+        self.meta = meta
+        self.similarity = similarity
+        self.titles = titles or []
+
+    @classmethod
+    def load(cls, path: str = CATALOG_DIR):
+        meta_path = os.path.join(path, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        ids = np.load(os.path.join(path, IDS_FILE), mmap_mode="r")
+        scores = np.load(os.path.join(path, SCORES_FILE), mmap_mode="r")
+
+        titles = None
+        if os.path.exists(os.path.join(path, TITLES_FILE)):
+            with open(os.path.join(path, TITLES_FILE), "r", encoding="utf-8") as f:
+                titles = json.load(f)
+        return cls(ids, scores, meta, similarity=SimilarityIndex.load(path), titles=titles)
+
+    @property
+    def run_id(self):
+        return self.meta.get("run_id")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, movie_id: int):
+        pos = int(np.searchsorted(self.ids, movie_id))
+        if pos < len(self.ids) and self.ids[pos] == movie_id:
+            return pos
+        return None
+
+    def lookup(self, movie_id: int):
+        pos = self.position(movie_id)
+        return float(self.scores[pos]) if pos is not None else None
+
+    def describe(self, positions, similarities):
+        """검색 결과 행 위치 -> 응답용 영화 목록"""
+        return [
+            {
+                "movie_id": int(self.ids[pos]),
+                "title": self.titles[pos] if pos < len(self.titles) else None,
+                "similarity": round(float(sim), 4),
+                "pred": round(float(self.scores[pos]), 4),
+            }
+            for pos, sim in zip(positions, similarities)
+        ]
+
+
+_build_lock = threading.Lock()
+_building = False
+# 생성 중에 다시 요청이 오면 현재 생성이 끝난 뒤 한 번 더 생성 (가장 최근 요청 모델만 유지)
+_pending_model = None
+
+
+def _is_current(index, model_run_id):
+    # 유사 영화 벡터가 없는 이전 형식 인덱스도 다시 생성
+    return (index is not None and model_run_id is not None and index.run_id == model_run_id
+            and index.similarity is not None)
+
+
+def _install(index, model_run_id, state):
+    """생성한 인덱스가 지금 서빙 중인 모델의 것일 때만 교체 (생성 중 모델이 바뀌었으면 버림)"""
+    serving_run_id = getattr(state.mlflow_model, "run_id", None)
+    if serving_run_id != model_run_id:
+        logger.info(f"[INFO] catalog index for run_id={model_run_id} discarded (serving run_id={serving_run_id})")
+        return
+    state.catalog_index = index
+
+
+def _build_one(model, state):
+    model_run_id = getattr(model, "run_id", None)
+    os.makedirs(CATALOG_DIR, exist_ok=True)
+    with open(os.path.join(CATALOG_DIR, BUILD_LOCK_FILE), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            # 다른 워커가 먼저 만들었으면 그 결과를 그대로 사용
+            index = CatalogIndex.load()
+            if _is_current(index, model_run_id):
+                logger.info(f"[INFO] catalog index built by another worker (run_id={model_run_id})")
+            else:
+                index = build_catalog_index(model)
+            _install(index, model_run_id, state)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def refresh_catalog_index(model, state, background: bool = True, build: bool = True):
+    """
+    현재 모델(run_id)과 인덱스가 다르면 재생성
+    - 서버 시작/리로드 직후 호출되며 기본적으로 별도 스레드에서 실행
+    - build=False 이면 최신 인덱스만 읽고 재생성은 하지 않음
+      (prefork 부모: 생성 중 Okt 가 JVM 을 띄우면 fork 된 워커에서 JVM 을 쓸 수 없음)
+    - 여러 워커가 동시에 호출해도 파일 잠금으로 한 프로세스만 생성하고, 나머지는 기다렸다가 결과를 읽음
+    - 생성 중에 다시 호출되면 끝난 뒤 마지막으로 요청된 모델로 한 번 더 생성
+    """
+    index = CatalogIndex.load()
+    model_run_id = getattr(model, "run_id", None)
+
+    if _is_current(index, model_run_id):
+        state.catalog_index = index
+        logger.info(f"[INFO] catalog index is up to date (run_id={model_run_id})")
+        return
+
+    # 이전 모델 점수를 내보내지 않도록 재생성 동안은 실시간 추론으로 폴백
+    state.catalog_index = None
+    if not build:
+        logger.info(f"[INFO] catalog index is stale, build deferred (run_id={model_run_id})")
+        return
+
+    def _build():
+        global _building, _pending_model
+
+        with _build_lock:
+            if _building:
+                _pending_model = model
+                logger.info(f"[INFO] catalog index build already in progress, queued rebuild (run_id={model_run_id})")
+                return
+            _building = True
+
+        target = model
+        while True:
+            try:
+                _build_one(target, state)
+            except Exception as e:
+                logger.error(f"[ERROR] failed to build catalog index : {e}")
+            with _build_lock:
+                target, _pending_model = _pending_model, None
+                if target is None:
+                    _building = False
+                    return
+
+    if background:
+        threading.Thread(target=_build, name="catalog-index-build", daemon=True).start()
+    else:
+        _build()
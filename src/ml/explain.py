@@ -0,0 +1,181 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+META_NAMES = ["adult", "video", "is_english"]
+
+
+def _lightgbm_contributions(estimator, X):
+    contrib = estimator.predict(X, pred_contrib=True)
+    return contrib[:, :-1], contrib[:, -1]
+
+
+def _xgboost_contributions(estimator, X):
+    import xgboost as xgb
+
+    booster = estimator.get_booster()
+    best_iteration = getattr(estimator, "best_iteration", None)
+    iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+    contrib = booster.predict(xgb.DMatrix(X), pred_contribs=True, iteration_range=iteration_range)
+    return contrib[:, :-1], contrib[:, -1]
+
+
+def _tree_edge_matrix(tree, n_features: int):
+    """
+    Saabas 방식: 부모 -> 자식 노드로 내려갈 때의 값 변화를 부모의 분기 피처에 귀속
+    반환: E [n_nodes, n_features] (E[node, feature[parent]] = value[node] - value[parent])
+    """
+    values = tree.value[:, 0, 0]
+    parent = np.full(tree.node_count, -1, dtype=np.int64)
+    for children in (tree.children_left, tree.children_right):
+        internal = np.flatnonzero(children >= 0)
+        parent[children[internal]] = internal
+
+    nodes = np.flatnonzero(parent >= 0)
+    delta = values[nodes] - values[parent[nodes]]
+    return sp.csr_matrix((delta, (nodes, tree.feature[parent[nodes]])), shape=(tree.node_count, n_features))
+
+
+def _random_forest_contributions(estimator, X):
+    """트리별 decision_path(희소 경로 행렬) x 간선 기여 행렬을 한 번의 희소 곱으로 계산해 평균"""
+    n_features = X.shape[1]
+    contrib = np.zeros(X.shape, dtype=np.float64)
+    bias = np.zeros(X.shape[0], dtype=np.float64)
+    for tree_estimator in estimator.estimators_:
+        tree = tree_estimator.tree_
+        paths = tree_estimator.decision_path(X)
+        contrib += np.asarray((paths @ _tree_edge_matrix(tree, n_features)).todense())
+        bias += tree.value[0, 0, 0]
+    n_trees = len(estimator.estimators_)
+    return contrib / n_trees, bias / n_trees
+
+
+def feature_contributions(estimator, X):
+    """
+    트리 모델 고유 기여도 (pred = bias + contrib.sum(axis=1), clip 이전 값 기준)
+    반환: (contrib [n, n_features], bias [n])
+    """
+    kind = type(estimator).__name__
+    if kind == "LGBMRegressor":
+        return _lightgbm_contributions(estimator, X)
+    if kind == "XGBRegressor":
+        return _xgboost_contributions(estimator, X)
+    if kind == "RandomForestRegressor":
+        return _random_forest_contributions(estimator, X)
+    raise TypeError(f"❌ 기여도 계산을 지원하지 않는 모델: {kind}")
+
+
+def text_feature_names(python_model, n_text: int):
+    vectorizer = python_model.tf_idf
+    if hasattr(vectorizer, "get_feature_names_out"):
+        return [str(name) for name in vectorizer.get_feature_names_out()]
+    # 해싱 벡터라이저는 버킷 번호만 알 수 있음
+    return [f"hash_{i}" for i in range(n_text)]
+
+
+def group_contributions(contrib_row, x_row, bias, pred, term_names, emb_dim: int, top_terms: int):
+    """
+    피처 단위 기여도 -> 메타 플래그 / 장르 임베딩 / tf-idf (상위 단어 + 나머지) 묶음
+    - raw_pred: clip 이전 모델 출력 (base_value + 기여도 합 = raw_pred)
+    - pred: 서빙 예측값 ([0, 10] 으로 clip 된 값, raw_pred 가 범위를 벗어나면 기여도 합과 다름)
+    """
+    n_meta = len(META_NAMES)
+    text_slice = slice(n_meta, len(contrib_row) - emb_dim)
+    text_contrib = contrib_row[text_slice]
+    text_values = x_row[text_slice]
+
+    order = np.argsort(-np.abs(text_contrib))[:top_terms]
+    terms = [
+        {"term": term_names[i], "contribution": round(float(text_contrib[i]), 6), "present": bool(text_values[i] != 0)}
+        for i in order if text_contrib[i] != 0
+    ]
+
+    return {
+        "pred": round(float(pred), 6),
+        "raw_pred": round(float(bias + contrib_row.sum()), 6),
+        "base_value": round(float(bias), 6),
+        "groups": {
+            "meta": {name: round(float(contrib_row[i]), 6) for i, name in enumerate(META_NAMES)},
+            "genre_embedding": round(float(contrib_row[-emb_dim:].sum()), 6),
+            "tfidf": round(float(text_contrib.sum()), 6),
+        },
+        "top_terms": terms,
+        "tfidf_other": round(float(text_contrib.sum() - sum(term["contribution"] for term in terms)), 6),
+    }
+
+
+class ExplanationCache:
+    """(run_id, 요청 해시) -> 설명 결과 LRU 캐시"""
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(run_id, row: dict, top_terms: int):
+        payload = json.dumps({"row": row, "top_terms": top_terms}, sort_keys=True, ensure_ascii=False, default=str)
+        return run_id, hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._items), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+explanation_cache = ExplanationCache()
+
+
+def explain_batch(python_model, columns: dict, run_id: str = None, top_terms: int = 10,
+                  cache: ExplanationCache = explanation_cache):
+    """
+    build_features_from_columns 형식의 배치 입력 -> 행별 설명 리스트
+    캐시에 없는 행만 모아 피처화/기여도 계산을 한 번에 수행
+    """
+    n_rows = len(columns["overview"])
+    rows = [{field: values[i] for field, values in columns.items()} for i in range(n_rows)]
+    keys = [cache.key(run_id, row, top_terms) for row in rows]
+
+    results = [cache.get(key) if run_id is not None else None for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if not missing:
+        return results
+
+    subset = {field: [values[i] for i in missing] for field, values in columns.items()}
+    X = python_model.build_features_from_columns(**subset)
+    contrib, bias = feature_contributions(python_model.model, X)
+    preds = python_model.predict_features(X)
+
+    emb_dim = python_model.embedding_module.embedding.embedding_dim
+    term_names = text_feature_names(python_model, X.shape[1] - len(META_NAMES) - emb_dim)
+
+    for j, i in enumerate(missing):
+        results[i] = group_contributions(contrib[j], X[j], bias[j], preds[j], term_names, emb_dim, top_terms)
+        if run_id is not None:
+            cache.put(keys[i], results[i])
+    return results
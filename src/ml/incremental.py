@@ -0,0 +1,91 @@
+import os
+import json
+import math
+import hashlib
+
+import mlflow
+import numpy as np
+import pandas as pd
+
+from src.ml.registry import unwrap_python_model
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PRODUCTION_MODEL_URI = "models:/best_model/Production"
+# 학습에 사용한 행 지문 (영화 id -> 입력/타깃 해시), 다음 증분 학습에서 새 행/바뀐 행을 찾는 기준
+TRAINING_ROWS_FILE = "training_rows.json"
+
+
+class IncrementalFallback(Exception):
+    """증분 학습 조건이 맞지 않음 (사유를 남기고 전체 재학습)"""
+
+
+def _fingerprint(overview, genre_ids, adult, video, original_language, vote_average):
+    payload = json.dumps(
+        [overview if isinstance(overview, str) else "", [int(g) for g in genre_ids],
+         float(adult), float(video), original_language, float(vote_average)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def row_fingerprints(df):
+    """영화 id -> 학습 입력(줄거리/장르/메타)과 평점의 해시"""
+    columns = ["id", "overview", "genre_ids", "adult", "video", "original_language", "vote_average"]
+    return {str(row[0]): _fingerprint(*row[1:]) for row in df[columns].itertuples(index=False, name=None)}
+
+
+def save_row_fingerprints(fingerprints: dict, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(fingerprints, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_row_fingerprints(run_id: str):
+    """학습 run 에 저장된 행 지문 (없으면 None -> 증분 학습 불가)"""
+    try:
+        path = mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path=TRAINING_ROWS_FILE)
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"[WARN] training row fingerprints not found for run {run_id} : {e}")
+        return None
+
+
+def load_production_model(model_uri: str = PRODUCTION_MODEL_URI):
+    """Production 모델 -> (run_id, MovieRatingModel) (전처리 번들/부스터를 그대로 이어 학습에 사용)"""
+    model = mlflow.pyfunc.load_model(model_uri)
+    return model.metadata.run_id, unwrap_python_model(model)
+
+
+def tree_count(estimator):
+    """부스팅 모델의 현재 트리(라운드) 수"""
+    kind = type(estimator).__name__
+    if kind == "LGBMRegressor":
+        return estimator.booster_.current_iteration()
+    if kind == "XGBRegressor":
+        return estimator.get_booster().num_boosted_rounds()
+    raise TypeError(f"❌ 증분 학습을 지원하지 않는 모델: {kind}")
+
+
+def select_incremental_rows(train_df, previous: dict, replay_fraction: float, seed: int = 42):
+    """
+    학습 분할에서 새 행/바뀐 행 전체 + 이전과 같은 행 중 replay_fraction 비율 샘플
+    (이전 분포를 잊지 않도록 과거 행을 섞어서 트리를 추가)
+    반환: (학습할 행 DataFrame, 새/바뀐 행 수, 현재 학습 분할 지문)
+    """
+    fingerprints = row_fingerprints(train_df)
+    changed_mask = np.fromiter(
+        (previous.get(str(movie_id)) != fingerprints[str(movie_id)] for movie_id in train_df["id"]),
+        dtype=bool, count=len(train_df),
+    )
+    changed = train_df[changed_mask]
+    unchanged = train_df[~changed_mask]
+
+    n_replay = min(len(unchanged), math.ceil(len(unchanged) * replay_fraction))
+    replay = unchanged.sample(n=n_replay, random_state=seed) if n_replay else unchanged.iloc[:0]
+    return pd.concat([changed, replay]), len(changed), fingerprints
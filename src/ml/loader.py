@@ -1,12 +1,29 @@
+import time
+import random
+import threading
+from datetime import datetime, timezone, timedelta
+
 import mlflow
 from mlflow.tracking import MlflowClient
 
+from config import (
+    SERVING_MODELS, MODEL_ROUTING_WEIGHTS, SHADOW_MODELS,
+    MODEL_LOAD_RETRY_SECONDS, MODEL_LOAD_RETRY_MAX_SECONDS, MODEL_LOAD_MAX_ATTEMPTS,
+)
 from src.utils.logger import get_logger
 from src.ml.config import init_mlflow
+from src.ml.registry import ModelRegistry, parse_key_values, unwrap_python_model
+from src.utils.resources import limit_estimator_threads
+from src.ml.catalog import refresh_catalog_index
+from src.monitoring.live_stats import LiveStatsMonitor, InputStatsSummary, REFERENCE_FILE
 from src.api import state
 
 logger = get_logger(__name__)
 
+KST = timezone(timedelta(hours=9))
+# 백그라운드 로더 / /reload / get_model 이 동시에 레지스트리를 만들지 않도록
+_load_lock = threading.Lock()
+
 def load_mlflow_model(model_uri: str):
     """MLflow에서 등록된 모델 로드 (팀원 업데이트 버전)"""
     try:
@@ -49,7 +66,9 @@ def get_model():
     if state.mlflow_model is None:
         try:
             logger.info("MLflow 모델 로드 시도...")
-            state.mlflow_model = load_mlflow_model("models:/best_model/Production")
+            with _load_lock:
+                if state.mlflow_model is None:
+                    load_model_registry()
             logger.info("✅ MLflow 모델 로드 성공!")
         except Exception as e:
             logger.error(f"❌ MLflow 모델 로드 실패: {e}")
@@ -59,11 +78,155 @@ def get_model():
     
     return state.mlflow_model
 
+def load_reference_summary(run_id: str):
+    """학습 run 에 저장된 참조 요약 로드 (없으면 None, 드리프트 비교만 비활성화)"""
+    try:
+        path = mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path=REFERENCE_FILE)
+        return InputStatsSummary.load(path)
+    except Exception as e:
+        logger.warning(f"[WARN] reference summary not found for run {run_id} : {e}")
+        return None
+
+
+def load_model_registry(catalog_background: bool = True, build_catalog: bool = True):
+    """
+    SERVING_MODELS 에 정의된 모델들을 모두 로드해 레지스트리 구성
+    - 첫 번째(기본) 모델 로드 실패 시 예외 발생
+    - 나머지 모델은 실패해도 로그만 남기고 제외
+    """
+    model_uris = parse_key_values(SERVING_MODELS)
+    models = {}
+
+    for idx, (name, uri) in enumerate(model_uris.items()):
+        try:
+            models[name] = load_mlflow_model(uri)
+        except Exception as e:
+            if idx == 0:
+                raise
+            logger.warning(f"[WARN] 모델 '{name}' ({uri}) 로드 실패, 레지스트리에서 제외합니다: {e}")
+
+    # 학습 때 정해진 n_jobs 대신 이 프로세스의 스레드 예산 사용
+    for model in models.values():
+        limit_estimator_threads(unwrap_python_model(model).model)
+
+    registry = ModelRegistry(
+        models,
+        weights=parse_key_values(MODEL_ROUTING_WEIGHTS, cast=float),
+        shadow=[name.strip() for name in SHADOW_MODELS.split(",") if name.strip()],
+    )
+    logger.info(f"[INFO] model registry loaded : {registry.names} (default={registry.default_name})")
+
+    state.model_registry = registry
+    state.mlflow_model = registry.default_model
+
+    # 새 모델 기준으로 라이브 통계를 초기화하고 학습 시 저장된 참조 요약 연결
+    state.live_monitor = LiveStatsMonitor(reference=load_reference_summary(registry.default_model.run_id))
+
+    # Production 모델 기준 카탈로그 점수 인덱스 갱신 (run_id 가 바뀐 경우에만 백그라운드 재생성)
+    refresh_catalog_index(registry.default_model, state, background=catalog_background, build=build_catalog)
+    return registry
+
+
 def reload_model():
-    """모델 재로드 (캐시 초기화)"""
-    state.mlflow_model = None
-    logger.info("모델 캐시 초기화 완료")
-    return get_model()
+    """
+    모델 재로드
+    새 레지스트리가 준비될 때까지 기존 모델로 계속 서빙 (로드 실패 시 기존 모델 유지, 준비 상태가 끊기지 않음)
+    """
+    with _load_lock:
+        load_model_registry()
+    logger.info("모델 재로드 완료")
+    return state.mlflow_model
+
+
+class BackgroundModelLoader:
+    """
+    서버가 요청을 받기 시작한 뒤 백그라운드 스레드에서 서빙 모델 로드
+    - 실패하면 지수 백오프(+지터)로 재시도, max_attempts 가 0 이면 성공할 때까지
+    - 진행 상태는 메모리에만 두고 헬스체크(/readyz, /health)는 이 값만 읽음 (I/O 없음)
+    """
+
+    PENDING = "pending"
+    LOADING = "loading"
+    RETRYING = "retrying"
+    READY = "ready"
+    FAILED = "failed"
+    STOPPED = "stopped"
+
+    def __init__(self, retry_seconds: float = MODEL_LOAD_RETRY_SECONDS,
+                 max_retry_seconds: float = MODEL_LOAD_RETRY_MAX_SECONDS,
+                 max_attempts: int = MODEL_LOAD_MAX_ATTEMPTS):
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.max_attempts = max_attempts
+        self.status = self.PENDING
+        self.attempts = 0
+        self.last_error = None
+        self.loaded_at = None
+        self._next_retry = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="model-loader", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _backoff(self):
+        delay = min(self.max_retry_seconds, self.retry_seconds * 2 ** (self.attempts - 1))
+        # 여러 워커가 같은 시각에 MLflow 로 몰리지 않도록 지터
+        return delay * random.uniform(0.5, 1.0)
+
+    def _ready(self):
+        self.status = self.READY
+        self.last_error = None
+        self._next_retry = None
+        self.loaded_at = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
+
+    def _run(self):
+        while not self._stop.is_set():
+            # /reload 등으로 이미 로드된 경우 재시도 종료
+            if state.mlflow_model is not None:
+                self._ready()
+                return
+
+            self.attempts += 1
+            self.status = self.LOADING
+            logger.info(f"[START] loading mlflow model in background (attempt {self.attempts})")
+            try:
+                with _load_lock:
+                    if state.mlflow_model is None:
+                        load_model_registry()
+                self._ready()
+                logger.info(f"[END] mlflow model loaded successfully (attempt {self.attempts})")
+                return
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                if self.max_attempts and self.attempts >= self.max_attempts:
+                    self.status = self.FAILED
+                    logger.error(f"[ERROR] MLflow 모델 로딩 실패, 재시도를 중단합니다 ({self.attempts}회): {e}")
+                    return
+                delay = self._backoff()
+                self.status = self.RETRYING
+                self._next_retry = time.monotonic() + delay
+                logger.warning(f"[WARN] MLflow 모델 로딩 실패, {delay:.1f}s 후 재시도 ({self.attempts}회): {e}")
+                self._stop.wait(delay)
+
+        self.status = self.STOPPED
+
+    def info(self):
+        return {
+            "status": self.status,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "next_retry_in_seconds": (
+                round(max(0.0, self._next_retry - time.monotonic()), 1)
+                if self.status == self.RETRYING and self._next_retry is not None else None
+            ),
+            "loaded_at": self.loaded_at,
+        }
 
 def get_model_info():
     """현재 로드된 모델 정보 반환"""
@@ -79,7 +242,8 @@ def get_model_info():
             "run_id": getattr(model, 'run_id', None),
             "run_name": getattr(model, 'run_name', None),
             "model_timestamp": getattr(model, 'model_timestamp', None),
-            "version": "updated_by_teammate"
+            "version": "updated_by_teammate",
+            "registry": state.model_registry.info() if state.model_registry else None
         }
     except Exception as e:
         return {
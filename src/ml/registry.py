@@ -0,0 +1,150 @@
+import random
+import threading
+import time
+
+import numpy as np
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def parse_key_values(raw: str, cast=str):
+    """"a=1,b=2" 형태의 환경변수 문자열을 순서가 보존된 dict 로 변환"""
+    result = {}
+    for item in (raw or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if "=" not in item:
+            raise ValueError(f"❌ 잘못된 설정 값: '{item}' (이름=값 형태여야 합니다)")
+        key, value = item.split("=", 1)
+        result[key.strip()] = cast(value.strip())
+    return result
+
+
+def unwrap_python_model(model):
+    """pyfunc 모델에서 MovieRatingModel 인스턴스를 꺼낸다 (이미 꺼낸 객체면 그대로 반환)"""
+    if hasattr(model, "unwrap_python_model"):
+        return model.unwrap_python_model()
+    return model
+
+
+class ModelRegistry:
+    """
+    여러 MLflow 모델을 한 프로세스에 상주시키고 요청마다 라우팅하는 레지스트리
+    - 같은 전처리 번들(feature_key)을 쓰는 모델끼리는 피처를 한 번만 계산해 공유
+    - 가중치 기반 분배 / 헤더·쿼리로 모델 지정
+    - 섀도우 모델은 응답 이후 백그라운드에서 스코어링하고 비교 결과만 로깅
+    """
+
+    def __init__(self, models: dict, weights: dict = None, shadow: list = None):
+        if not models:
+            raise ValueError("❌ 레지스트리에 등록된 모델이 없습니다.")
+
+        self.models = models
+        self.default_name = next(iter(models))
+        self.weights = {k: v for k, v in (weights or {}).items() if k in models and v > 0}
+        self.shadow = [name for name in (shadow or []) if name in models]
+
+        self._lock = threading.Lock()
+        self._shadow_stats = {name: {"count": 0, "abs_diff_sum": 0.0, "errors": 0} for name in self.shadow}
+
+    @property
+    def names(self):
+        return list(self.models.keys())
+
+    @property
+    def default_model(self):
+        return self.models[self.default_name]
+
+    def get(self, name):
+        return self.models[name]
+
+    def route(self, requested: str = None):
+        """요청에서 지정한 모델 -> 가중치 분배 -> 기본 모델 순으로 라우팅"""
+        if requested:
+            if requested not in self.models:
+                raise KeyError(requested)
+            return requested
+
+        if self.weights:
+            names = list(self.weights.keys())
+            return random.choices(names, weights=[self.weights[n] for n in names], k=1)[0]
+
+        return self.default_name
+
+    def features_for(self, name, model_input, feature_cache: dict):
+        """
+        feature_key 기준으로 요청 단위 피처 캐시를 채우고 반환
+        model_input: pyfunc 형식 DataFrame 또는 build_features_from_columns 인자 dict (타입 경로)
+        """
+        python_model = unwrap_python_model(self.models[name])
+        key = getattr(python_model, "feature_key", None) or name
+
+        if key not in feature_cache:
+            if isinstance(model_input, dict):
+                feature_cache[key] = python_model.build_features_from_columns(**model_input)
+            else:
+                feature_cache[key] = python_model.build_features(model_input)
+
+        return feature_cache[key]
+
+    def predict(self, name, model_input, feature_cache: dict = None):
+        feature_cache = {} if feature_cache is None else feature_cache
+        X = self.features_for(name, model_input, feature_cache)
+        return unwrap_python_model(self.models[name]).predict_features(X)
+
+    def shadow_score(self, primary_name, primary_pred, model_input, feature_cache: dict):
+        """섀도우 모델 스코어링 (BackgroundTasks 에서 호출, 응답 지연에 영향 없음)"""
+        primary_pred = np.asarray(primary_pred, dtype=float)
+
+        for name in self.shadow:
+            if name == primary_name:
+                continue
+            try:
+                start = time.perf_counter()
+                shadow_pred = np.asarray(self.predict(name, model_input, feature_cache), dtype=float)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                abs_diff = float(np.abs(shadow_pred - primary_pred).mean())
+
+                with self._lock:
+                    stats = self._shadow_stats[name]
+                    stats["count"] += 1
+                    stats["abs_diff_sum"] += abs_diff
+
+                logger.info(
+                    f"[SHADOW] primary={primary_name} pred={primary_pred.tolist()} | "
+                    f"shadow={name} pred={shadow_pred.tolist()} | abs_diff={abs_diff:.4f} | {elapsed_ms:.1f}ms"
+                )
+            except Exception as e:
+                with self._lock:
+                    self._shadow_stats[name]["errors"] += 1
+                logger.error(f"[SHADOW][ERROR] shadow={name} : {e}")
+
+    def info(self):
+        models = {}
+        for name, model in self.models.items():
+            models[name] = {
+                "run_id": getattr(model, "run_id", None),
+                "run_name": getattr(model, "run_name", None),
+                "model_timestamp": getattr(model, "model_timestamp", None),
+                "feature_key": getattr(unwrap_python_model(model), "feature_key", None),
+            }
+
+        with self._lock:
+            shadow = {
+                name: {
+                    "count": s["count"],
+                    "errors": s["errors"],
+                    "mean_abs_diff": s["abs_diff_sum"] / s["count"] if s["count"] else None,
+                }
+                for name, s in self._shadow_stats.items()
+            }
+
+        return {
+            "default": self.default_name,
+            "weights": self.weights,
+            "models": models,
+            "shadow": shadow,
+        }
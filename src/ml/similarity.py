@@ -0,0 +1,149 @@
+import os
+
+import numpy as np
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+CENTROIDS_FILE = "ivf_centroids.npy"
+IVF_ORDER_FILE = "ivf_order.npy"
+IVF_OFFSETS_FILE = "ivf_offsets.npy"
+
+# 이 개수 이하의 카탈로그는 IVF 를 만들지 않고 전수 검색
+EXACT_MAX_ITEMS = 50000
+META_COLUMNS = 3
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def combine_feature_blocks(X, emb_dim: int, text_weight: float = 0.5):
+    """
+    모델 입력 행렬 [메타 | tf-idf | 장르 임베딩] -> 유사도 검색용 단위 벡터
+    tf-idf 와 장르 임베딩 블록을 각각 정규화한 뒤 가중치를 곱해 이어붙이므로
+    내적 = text_weight * 줄거리 코사인 + (1 - text_weight) * 장르 코사인
+    """
+    X = np.asarray(X, dtype=np.float32)
+    text = _normalize_rows(X[:, META_COLUMNS:X.shape[1] - emb_dim])
+    genre = _normalize_rows(X[:, X.shape[1] - emb_dim:])
+    return np.hstack([np.sqrt(text_weight) * text, np.sqrt(1 - text_weight) * genre]).astype(np.float32)
+
+
+def _top_k(scores, k: int):
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def build_ivf(vectors, n_lists: int = None, n_iter: int = 10, sample_size: int = 20000, seed: int = 42):
+    """
+    구면 k-means 로 벡터를 n_lists 개 리스트로 나눈 IVF (역색인)
+    반환: (centroids [n_lists, d], order [n] 리스트순 행 번호, offsets [n_lists + 1])
+    """
+    n = len(vectors)
+    n_lists = n_lists or max(1, int(np.sqrt(n)))
+    rng = np.random.default_rng(seed)
+
+    sample = vectors[rng.choice(n, size=min(n, sample_size), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(n_lists):
+            members = sample[assign == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+        centroids = _normalize_rows(centroids)
+
+    # 전체 벡터 할당은 청크 단위로 (n x n_lists 행렬을 한 번에 만들지 않음)
+    assign = np.empty(n, dtype=np.int64)
+    for start in range(0, n, 8192):
+        assign[start:start + 8192] = np.argmax(vectors[start:start + 8192] @ centroids.T, axis=1)
+
+    order = np.argsort(assign, kind="stable").astype(np.int64)
+    offsets = np.zeros(n_lists + 1, dtype=np.int64)
+    np.cumsum(np.bincount(assign, minlength=n_lists), out=offsets[1:])
+    return centroids.astype(np.float32), order, offsets
+
+
+def save_similarity_index(vectors, dst: str, exact_max_items: int = EXACT_MAX_ITEMS):
+    """vectors.npy (+ 카탈로그가 크면 IVF 파일) 를 임시 파일에 쓴 뒤 교체"""
+    arrays = [(VECTORS_FILE, vectors)]
+    ivf_lists = 0
+    if len(vectors) > exact_max_items:
+        centroids, order, offsets = build_ivf(vectors)
+        ivf_lists = len(centroids)
+        arrays += [(CENTROIDS_FILE, centroids), (IVF_ORDER_FILE, order), (IVF_OFFSETS_FILE, offsets)]
+    else:
+        for name in (CENTROIDS_FILE, IVF_ORDER_FILE, IVF_OFFSETS_FILE):
+            if os.path.exists(os.path.join(dst, name)):
+                os.remove(os.path.join(dst, name))
+
+    for name, array in arrays:
+        tmp_path = os.path.join(dst, f".{name}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, os.path.join(dst, name))
+    return {"dim": int(vectors.shape[1]), "ivf_lists": ivf_lists}
+
+
+class SimilarityIndex:
+    """
+    mmap 으로 연 정규화 벡터 기반 최근접 영화 검색
+    - 전수 검색: 벡터 행렬 x 질의 벡터 (BLAS) 후 argpartition 으로 top-k
+    - IVF 가 있으면 질의와 가까운 nprobe 개 리스트의 후보만 계산
+    """
+
+    def __init__(self, vectors, centroids=None, order=None, offsets=None):
+        self.vectors = vectors
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+
+    @classmethod
+    def load(cls, path: str):
+        vectors_path = os.path.join(path, VECTORS_FILE)
+        if not os.path.exists(vectors_path):
+            return None
+
+        vectors = np.load(vectors_path, mmap_mode="r")
+        if os.path.exists(os.path.join(path, CENTROIDS_FILE)):
+            return cls(
+                vectors,
+                centroids=np.load(os.path.join(path, CENTROIDS_FILE)),
+                order=np.load(os.path.join(path, IVF_ORDER_FILE), mmap_mode="r"),
+                offsets=np.load(os.path.join(path, IVF_OFFSETS_FILE)),
+            )
+        return cls(vectors)
+
+    @property
+    def approximate(self):
+        return self.centroids is not None
+
+    def search(self, query, k: int = 10, exclude: int = None, nprobe: int = 8, exact: bool = False):
+        """query: 단위 벡터 [d] -> (행 위치 배열, 유사도 배열), exclude 는 결과에서 뺄 행 위치"""
+        query = np.asarray(query, dtype=np.float32)
+        want = k + (exclude is not None)
+
+        if exact or not self.approximate:
+            candidates = None
+            scores = self.vectors @ query
+        else:
+            lists = _top_k(self.centroids @ query, nprobe)
+            # 정렬된 행 위치로 읽어야 mmap 접근이 순차적
+            candidates = np.sort(np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in lists]))
+            scores = self.vectors[candidates] @ query
+
+        top = _top_k(scores, want)
+        positions = top if candidates is None else candidates[top]
+        scores = scores[top]
+
+        if exclude is not None:
+            keep = positions != exclude
+            positions, scores = positions[keep], scores[keep]
+        return positions[:k], scores[:k]
@@ -0,0 +1,343 @@
+import os
+import json
+import time
+import resource
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone, timedelta
+
+from mlflow.entities import Metric
+
+from config import TRAIN_STAGE_PROFILE
+from src.utils.logger import get_logger
+
+try:
+    import jpype
+except ImportError:
+    jpype = None
+
+logger = get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+MB = 1024 * 1024
+STAGE_PROFILE_FILE = "stage_profile.json"
+METRIC_PREFIX = "profile"
+
+# 현재 학습 호출의 프로파일러 (데이터셋/평가 코드에서 인자 전달 없이 단계를 기록하기 위함)
+_current = contextvars.ContextVar("stage_profiler", default=None)
+
+# 열려 있는 단계 (모든 프로파일러 공용)
+# 최대 RSS(VmHWM)와 JVM 힙 피크 카운터는 프로세스에 하나뿐이므로 단계 경계마다
+# 열린 단계 전체에 현재 피크를 반영한 뒤 카운터를 초기화
+_lock = threading.Lock()
+_open = []
+_hwm_resettable = None
+
+
+def _status_kb(field: str):
+    """/proc/self/status 의 메모리 항목 (kB, 읽을 수 없으면 None)"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def rss_mb():
+    kb = _status_kb("VmRSS")
+    return kb / 1024 if kb is not None else None
+
+
+def _reset_hwm():
+    """최대 RSS(VmHWM)를 현재 RSS 로 초기화 (Linux 4.0+, 지원하지 않으면 False)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _rss_peak_source():
+    """
+    hwm     : 단계 구간의 정확한 최대 RSS (VmHWM 초기화 가능)
+    boundary: 단계 경계에서 잰 RSS 중 최대값 (초기화 불가, 구간 중간의 피크는 놓칠 수 있음)
+    """
+    global _hwm_resettable
+    if _hwm_resettable is None:
+        _hwm_resettable = _reset_hwm() and _status_kb("VmHWM") is not None
+    return "hwm" if _hwm_resettable else "boundary"
+
+
+def process_max_rss_mb():
+    """프로세스 시작 이후 최대 RSS (Linux 는 kB, macOS 는 byte 단위)"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / MB if os.uname().sysname == "Darwin" else max_rss / 1024
+
+
+def cpu_seconds():
+    """프로세스 CPU 시간 (모든 스레드 + 종료된 자식 프로세스, 예: 병렬 토큰화 워커)"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def jvm_heap(reset_peak: bool = False):
+    """
+    Okt(JPype) JVM 힙 사용량 (MB, JVM 이 없으면 None)
+    peak_mb: 마지막 초기화 이후 힙 메모리 풀별 최대 사용량의 합 (GC 사이의 순간 피크 포함)
+    """
+    if jpype is None or not jpype.isJVMStarted():
+        return None
+    try:
+        if not jpype.isThreadAttachedToJVM():
+            jpype.attachThreadToJVM()
+        management = jpype.JClass("java.lang.management.ManagementFactory")
+        heap_type = jpype.JClass("java.lang.management.MemoryType").HEAP
+        pools = [pool for pool in management.getMemoryPoolMXBeans() if pool.getType() == heap_type]
+        peak = sum(int(pool.getPeakUsage().getUsed()) for pool in pools)
+        if reset_peak:
+            for pool in pools:
+                pool.resetPeakUsage()
+
+        runtime = jpype.JClass("java.lang.Runtime").getRuntime()
+        total, free = int(runtime.totalMemory()), int(runtime.freeMemory())
+        return {
+            "used_mb": (total - free) / MB,
+            "committed_mb": total / MB,
+            "max_mb": int(runtime.maxMemory()) / MB,
+            "peak_mb": peak / MB,
+        }
+    except Exception as e:
+        logger.warning(f"[WARN] failed to read JVM heap usage : {e}")
+        return None
+
+
+def _max(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def _fold_peaks():
+    """열린 단계에 지금까지의 최대 RSS / JVM 힙 피크를 반영하고 카운터 초기화 (_lock 안에서 호출)"""
+    exact = _rss_peak_source() == "hwm"
+    kb = _status_kb("VmHWM" if exact else "VmRSS")
+    rss_peak = kb / 1024 if kb is not None else None
+    heap = jvm_heap(reset_peak=True)
+    jvm_peak = heap["peak_mb"] if heap else None
+
+    for record in _open:
+        record.peak_rss_mb = _max(record.peak_rss_mb, rss_peak)
+        record.jvm_heap_peak_mb = _max(record.jvm_heap_peak_mb, jvm_peak)
+    if exact:
+        _reset_hwm()
+
+
+class _StageRecord:
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.overlapped = False
+        self.rss_start_mb = rss_mb()
+        self.peak_rss_mb = self.rss_start_mb
+        self.jvm_heap_peak_mb = None
+        self._wall = time.perf_counter()
+        self._cpu = cpu_seconds()
+
+    def finish(self, failed: bool):
+        rss_end_mb = rss_mb()
+        return {
+            "wall_seconds": time.perf_counter() - self._wall,
+            "cpu_seconds": cpu_seconds() - self._cpu,
+            "peak_rss_mb": self.peak_rss_mb,
+            "rss_delta_mb": rss_end_mb - self.rss_start_mb if rss_end_mb is not None and self.rss_start_mb is not None else None,
+            "jvm_heap_peak_mb": self.jvm_heap_peak_mb,
+            "overlapped": self.overlapped,
+            "failed": failed,
+        }
+
+
+class StageProfiler:
+    """
+    학습 호출 하나의 단계별 경과 시간 / CPU 시간 / 최대 RSS / JVM 힙 피크
+    - 단계 이름은 중첩 순서대로 "/" 로 연결 (예: dataset/tokenize), 같은 이름은 호출 수와 함께 합산
+    - CPU 시간과 RSS 는 프로세스 단위이므로 같은 프로세스에서 다른 학습이 동시에 돌면 overlapped=True
+      (일일 파이프라인의 병렬 학습 단계 등, 이 경우 수치에 다른 작업의 사용량이 섞임)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages = {}
+        self._stack = []
+        self._wall = time.perf_counter()
+        self._cpu = cpu_seconds()
+
+    @contextmanager
+    def stage(self, name: str):
+        path = "/".join([*self._stack, name])
+        # 시작 순서대로 기록 (상위 단계가 하위 단계보다 먼저)
+        self._entry(path)
+        with _lock:
+            _fold_peaks()
+            record = _StageRecord(self)
+            for other in _open:
+                if other.profiler is not self:
+                    other.overlapped = record.overlapped = True
+            _open.append(record)
+
+        self._stack.append(name)
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self._stack.pop()
+            with _lock:
+                _fold_peaks()
+                _open.remove(record)
+            self._add(path, record.finish(failed))
+
+    def _entry(self, path: str):
+        return self.stages.setdefault(path, {
+            "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_rss_mb": None,
+            "rss_delta_mb": None, "jvm_heap_peak_mb": None, "overlapped": False, "failed": 0,
+        })
+
+    def _add(self, path: str, values: dict):
+        stage = self._entry(path)
+        stage["calls"] += 1
+        stage["wall_seconds"] += values["wall_seconds"]
+        stage["cpu_seconds"] += values["cpu_seconds"]
+        stage["peak_rss_mb"] = _max(stage["peak_rss_mb"], values["peak_rss_mb"])
+        if values["rss_delta_mb"] is not None:
+            stage["rss_delta_mb"] = (stage["rss_delta_mb"] or 0.0) + values["rss_delta_mb"]
+        stage["jvm_heap_peak_mb"] = _max(stage["jvm_heap_peak_mb"], values["jvm_heap_peak_mb"])
+        stage["overlapped"] = stage["overlapped"] or values["overlapped"]
+        stage["failed"] += int(values["failed"])
+
+    def nest(self, prefix: str):
+        """지금까지 기록한 단계를 prefix 아래로 이동 (예: 증분 학습 시도 후 전체 재학습으로 전환한 경우)"""
+        self.stages = {f"{prefix}/{path}": values for path, values in self.stages.items()}
+
+    def summary(self):
+        """지금까지의 단계 기록 + 전체 경과 시간/CPU 시간, 최대 RSS, JVM 힙"""
+        # VmHWM 초기화는 ru_maxrss 도 함께 낮추므로 단계별 피크와 합쳐서 계산
+        peak_rss = process_max_rss_mb()
+        for values in self.stages.values():
+            peak_rss = _max(peak_rss, values["peak_rss_mb"])
+        return {
+            "name": self.name,
+            "pid": os.getpid(),
+            "created_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
+            "rss_peak_source": _rss_peak_source(),
+            "total": {
+                "wall_seconds": time.perf_counter() - self._wall,
+                "cpu_seconds": cpu_seconds() - self._cpu,
+                "peak_rss_mb": peak_rss,
+                "jvm_heap": jvm_heap(),
+            },
+            "stages": [{"stage": path, **values} for path, values in self.stages.items()],
+        }
+
+
+def current_profiler():
+    return _current.get()
+
+
+@contextmanager
+def profile_stage(name: str):
+    """현재 학습 호출의 단계 기록 (프로파일 중이 아니면 아무것도 하지 않음)"""
+    profiler = _current.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+def profile_stages(fn):
+    """
+    학습 함수용 데코레이터: 호출 동안 StageProfiler 를 현재 프로파일러로 지정
+    (TRAIN_STAGE_PROFILE=false 이거나 이미 프로파일 중이면 바로 호출)
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not TRAIN_STAGE_PROFILE or _current.get() is not None:
+            return fn(*args, **kwargs)
+        token = _current.set(StageProfiler(fn.__name__))
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return wrapper
+
+
+def upload_stages(timings):
+    """
+    AsyncRunLogger 작업별 소요 시간 -> mlflow_upload 단계 (작업 종류별 하위 단계 포함)
+    백그라운드 로깅 스레드에서 잰 경과 시간만 기록 (업로드는 I/O 대기가 대부분)
+    """
+    kinds = {}
+    for description, seconds, ok in timings:
+        kind = kinds.setdefault(description.split("(")[0], {"calls": 0, "wall_seconds": 0.0, "failed": 0})
+        kind["calls"] += 1
+        kind["wall_seconds"] += seconds
+        kind["failed"] += int(not ok)
+
+    total = {
+        "calls": sum(kind["calls"] for kind in kinds.values()),
+        "wall_seconds": sum(kind["wall_seconds"] for kind in kinds.values()),
+        "failed": sum(kind["failed"] for kind in kinds.values()),
+    }
+    return [{"stage": "mlflow_upload", **total}] + [
+        {"stage": f"mlflow_upload/{name}", **values} for name, values in kinds.items()
+    ]
+
+
+def profile_metrics(summary: dict):
+    """profile/<단계>/<항목> 형식의 MLflow 메트릭 (값이 없는 항목 제외)"""
+    metrics = {}
+    for stage in summary["stages"]:
+        for key, value in stage.items():
+            if key != "stage" and isinstance(value, (int, float)) and not isinstance(value, bool):
+                metrics[f"{METRIC_PREFIX}/{stage['stage']}/{key}"] = value
+
+    total = summary["total"]
+    for key in ("wall_seconds", "cpu_seconds", "peak_rss_mb"):
+        metrics[f"{METRIC_PREFIX}/total/{key}"] = total[key]
+    if total["jvm_heap"]:
+        for key in ("used_mb", "committed_mb", "max_mb"):
+            metrics[f"{METRIC_PREFIX}/total/jvm_heap_{key}"] = total["jvm_heap"][key]
+    return metrics
+
+
+def save_summary(summary: dict, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def log_stage_profile(run_logger, summary: dict, path: str):
+    """
+    앞서 큐에 넣은 업로드가 모두 끝난 뒤 (같은 로깅 스레드에서) 업로드 단계를 더해
+    메트릭과 JSON 아티팩트(stage_profile.json)로 기록
+    """
+    def _log():
+        profile = {**summary, "stages": summary["stages"] + upload_stages(run_logger.timings)}
+        save_summary(profile, path)
+        timestamp = int(time.time() * 1000)
+        metrics = [Metric(key, float(value), timestamp, 0) for key, value in profile_metrics(profile).items()]
+        for start in range(0, len(metrics), 1000):
+            run_logger.client.log_batch(run_logger.run_id, metrics=metrics[start:start + 1000])
+        run_logger.client.log_artifact(run_logger.run_id, path)
+
+    run_logger.defer("log_stage_profile", _log)
@@ -13,7 +13,6 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 from datetime import datetime, timezone, timedelta
-from lightgbm import early_stopping
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
 import mlflow
@@ -23,16 +22,33 @@ from sklearn.ensemble import RandomForestRegressor
 from xgboost import XGBRegressor
 from lightgbm import LGBMRegressor
 
-from src.dataset.movie_rating import get_datasets, MovieRatingDataset, GenreEmbeddingModule
+from src.dataset.movie_rating import get_datasets, read_dataset, split_dataset, MovieRatingDataset, GenreEmbeddingModule
 from src.evaluate.evaluate import evaluate
 from src.ml.config import init_mlflow
+from src.ml.async_logging import AsyncRunLogger, snapshot_artifact
+from src.ml.budget import TrainingBudget, fit_with_budget
+from src.ml.stage_profile import STAGE_PROFILE_FILE, current_profiler, log_stage_profile, profile_stage, profile_stages
+from src.ml.incremental import (
+    IncrementalFallback, TRAINING_ROWS_FILE, load_production_model, load_row_fingerprints,
+    row_fingerprints, save_row_fingerprints, select_incremental_rows, tree_count,
+)
 from src.utils.logger import get_logger
+from src.utils.resources import current_threads, limit_estimator_threads, role_threads, TRAINING
 from src.utils.utils import init_seed, model_dir, project_path
 from src.utils.enums import ModelType
 from src.models.MovieRatingModel import MovieRatingModel
+from src.monitoring.live_stats import build_reference_summary, REFERENCE_FILE
+
+from config import (
+    TRAIN_EARLY_STOPPING_ROUNDS, TRAIN_TIME_BUDGET_SECONDS, TRAIN_BUDGET_CLOCK,
+    TRAIN_INCREMENTAL_ROUNDS, TRAIN_REPLAY_FRACTION, TRAIN_INCREMENTAL_MAX_CHANGED,
+    TRAIN_INCREMENTAL_TOLERANCE, TRAIN_INCREMENTAL_MAX_TREES,
+)
 
 logger = get_logger(__name__)
 
+EXPERIMENT_NAME = "movie_rating_final"
+
 def filter_custom_params(model, user_defined_params: dict):
     all_params = model.get_params()
     filtered = {}
@@ -85,8 +101,31 @@ def model_save(model, all_params, model_params, tf_idf, embedding_module, genre2
     return dst
 
 
-def train_and_log_model(model_name, local_save = False,**kwargs):
-    init_mlflow(experiment_name = "movie_rating_final")
+def rmse_scores(model, splits):
+    """{"train": (X, y), ...} -> ({"train_rmse": ..., ...}, train 예측값)"""
+    scores, preds = {}, {}
+    for split, (X, y) in splits.items():
+        with profile_stage(split):
+            preds[split] = evaluate(model, X)
+        scores[f"{split}_rmse"] = mean_squared_error(y, preds[split], squared=False)
+    return scores, preds["train"]
+
+
+@profile_stages
+def train_and_log_model(model_name, local_save = False, progress_callback = None, wait_for_upload = False,
+                        early_stopping_rounds = TRAIN_EARLY_STOPPING_ROUNDS, time_budget = TRAIN_TIME_BUDGET_SECONDS,
+                        budget_clock = TRAIN_BUDGET_CLOCK, incremental = False, **kwargs):
+    """
+    early_stopping_rounds: 검증 세트 기준 조기 종료 라운드 (0 이면 사용 안 함, 부스팅 모델만 해당)
+    time_budget: 모델별 학습 시간 예산(초, 0 이면 무제한), budget_clock: "wall" | "cpu"
+    incremental: Production 부스팅 모델에서 이어서 학습 (조건이 맞지 않거나 검증 성능이 나빠지면 전체 재학습)
+    단계별 시간/메모리는 MLflow 메트릭(profile/<단계>/...)과 stage_profile.json 으로 기록 (TRAIN_STAGE_PROFILE)
+    """
+    init_mlflow(experiment_name = EXPERIMENT_NAME)
+
+    def report(progress, message):
+        if progress_callback:
+            progress_callback(progress, message)
 
     if isinstance(model_name, str):
         model_type = ModelType.validation(model_name)
@@ -101,9 +140,6 @@ def train_and_log_model(model_name, local_save = False,**kwargs):
         ModelType.LIGHTGBM: LGBMRegressor
     }[model_type]
 
-    # load dataset
-    train_dataset, valid_dataset, test_dataest = get_datasets()
-
     valid_keys = model_class().get_params().keys()
 
     # 잘못 기입한 키 탐색
@@ -114,42 +150,82 @@ def train_and_log_model(model_name, local_save = False,**kwargs):
 
 
     user_params = {k: v for k, v in kwargs.items() if k in valid_keys}
-
-    model = model_class(**user_params, random_state = 42)
-    custom_params = filter_custom_params(model, user_params)
-
-    # model training and predict
-    X_train, y_train = train_dataset.features, train_dataset.target
-    X_val, y_val = valid_dataset.features, valid_dataset.target
-    X_test, y_test = test_dataest.features, test_dataest.target
+    # 스레드 수는 하이퍼파라미터가 아닌 자원 예산 (지정하지 않으면 이 프로세스의 학습 스레드 예산)
+    n_jobs = user_params.pop("n_jobs", None) or current_threads() or role_threads(TRAINING)
 
     KST = timezone(timedelta(hours=9))
     timestamp = datetime.now(KST).strftime("%Y%m%d_%H%M%S")
     run_name = f"{model_name}_training_{timestamp}"
 
-    with mlflow.start_run(run_name=run_name) as run:
-        model.fit(X_train, y_train)
+    fallback_reason = None
+    if incremental:
+        try:
+            if model_type == ModelType.RANDOMFOREST:
+                raise IncrementalFallback("RandomForest 는 이어서 학습할 수 없음")
+            if user_params:
+                raise IncrementalFallback(f"하이퍼파라미터 지정 ({list(user_params)})")
+            return train_incremental(
+                model_type, model_class, run_name, timestamp, report, wait_for_upload,
+                early_stopping_rounds, time_budget, budget_clock, n_jobs,
+            )
+        except IncrementalFallback as e:
+            fallback_reason = str(e)
+            # 실패한 증분 학습 시도에 쓴 시간/메모리는 전체 학습 단계와 구분해서 남김
+            profiler = current_profiler()
+            if profiler is not None:
+                profiler.nest("incremental_attempt")
+            print(f"↩️ [{model_type.value.upper()}] 증분 학습 불가 -> 전체 재학습 ({fallback_reason})")
 
-        train_preds = evaluate(model, X_train)
-        valid_preds = evaluate(model, X_val)
-        test_preds = evaluate(model, X_test)
+    # load dataset
+    report(0.05, "데이터셋 로드 중")
+    with profile_stage("dataset"):
+        train_dataset, valid_dataset, test_dataest = get_datasets()
 
-        train_rmse = mean_squared_error(y_train, train_preds, squared=False)
-        valid_rmse = mean_squared_error(y_val, valid_preds, squared=False)
-        test_rmse = mean_squared_error(y_test, test_preds, squared= False)
+    model = model_class(**user_params, n_jobs = n_jobs, random_state = 42)
+    custom_params = filter_custom_params(model, user_params)
 
-        print(f"✅ [{model_type.value.upper()}] Train RMSE: {train_rmse:.4f}")
-        print(f"✅ [{model_type.value.upper()}] Valid RMSE: {valid_rmse:.4f}")
-        print(f"✅ [{model_type.value.upper()}] Test  RMSE: {test_rmse:.4f}")
+    # model training and predict
+    # 연속 float32 행렬 사용 (서빙과 동일하게 numpy 입력)
+    X_train, y_train = train_dataset.X, train_dataset.y
+    X_val, y_val = valid_dataset.X, valid_dataset.y
+    X_test, y_test = test_dataest.X, test_dataest.y
+
+    report(0.3, "모델 학습 중")
+    budget = TrainingBudget(time_budget, clock=budget_clock)
+    with profile_stage("fit"):
+        best_iteration, learning_curve = fit_with_budget(
+            model, X_train, y_train, X_val, y_val, budget,
+            early_stopping_rounds=early_stopping_rounds,
+        )
+    train_seconds = budget.elapsed()
+    print(f"⏱️ [{model_type.value.upper()}] best_iteration={best_iteration}, "
+          f"{budget.clock} {train_seconds:.1f}s (budget exhausted: {budget.exhausted})")
 
-        all_params = model.get_params()
+    report(0.6, "모델 평가 중")
 
-        rmse_metrics = {
-                "train_rmse": train_rmse,
-                "valid_rmse": valid_rmse,
-                "test_rmse": test_rmse
-            }
-        if local_save:
+    with profile_stage("evaluate"):
+        rmse_metrics, train_preds = rmse_scores(
+            model, {"train": (X_train, y_train), "valid": (X_val, y_val), "test": (X_test, y_test)}
+        )
+    for split, score in rmse_metrics.items():
+        print(f"✅ [{model_type.value.upper()}] {split}: {score:.4f}")
+
+    all_params = model.get_params()
+
+    with profile_stage("reference"):
+        # 서빙 드리프트 비교용 학습 데이터 참조 요약 (분위수/빈도 스케치)
+        reference_path = build_reference_summary(train_dataset, train_preds).save(
+            os.path.join(project_path(), "models", "reference", run_name, REFERENCE_FILE)
+        )
+        # 다음 증분 학습에서 새 행/바뀐 행을 찾기 위한 학습 행 지문
+        fingerprint_path = save_row_fingerprints(
+            row_fingerprints(train_dataset.df),
+            os.path.join(project_path(), "models", "reference", run_name, TRAINING_ROWS_FILE)
+        )
+
+    dst = None
+    if local_save:
+        with profile_stage("save"):
             dst = model_save(
                 model = model,
                 all_params = all_params,
@@ -158,51 +234,239 @@ def train_and_log_model(model_name, local_save = False,**kwargs):
                 embedding_module=train_dataset.embedding_module,
                 genre2idx=train_dataset.genre2idx,
                 timestamp = timestamp,
-                rmse = {
-                    "train_rmse": train_rmse,
-                    "valid_rmse": valid_rmse,
-                    "test_rmse": test_rmse
-                }
+                rmse = rmse_metrics
             )
 
-        # 6. MLflow 메트릭 & 파라미터 로깅
-
-        mlflow.log_params(custom_params)
-        mlflow.log_metric("rmse", valid_rmse)
-        mlflow.set_tag("model_timestamp", timestamp)
-        
-        artifact_path = os.path.join(project_path(),"src","dataset","cache", "artifacts_bundle.pkl")
-
-        # 7. 모델 저장
-        input_example = pd.DataFrame([{
-            "overview": "이 영화는 액션과 감동이 넘친다",
-            "genres": '["액션", "모험"]',
-            "adult": 0.0,
-            "video": 0.0,
-            "original_language": "kr"
-        }])
-
-        signature = ModelSignature(
-            inputs=Schema([
-                ColSpec("string", "overview"),
-                ColSpec("string", "genres"),
-                ColSpec("double", "adult"),
-                ColSpec("double", "video"),
-                ColSpec("string", "original_language")
-            ]),
-            outputs=Schema([ColSpec("double")])
+    tags = {"training_mode": "full"}
+    if fallback_reason:
+        tags["incremental_fallback"] = fallback_reason
+
+    return log_training_run(
+        model, model_type, run_name, timestamp, report, wait_for_upload,
+        params={
+            **custom_params,
+            "n_jobs": n_jobs,
+            "early_stopping_rounds": early_stopping_rounds,
+            "time_budget": time_budget,
+            "budget_clock": budget_clock,
+        },
+        metrics={
+            **rmse_metrics,
+            "best_iteration": best_iteration,
+            "train_seconds": train_seconds,
+            "budget_exhausted": int(budget.exhausted),
+        },
+        learning_curve=learning_curve,
+        tags=tags,
+        bundle_path=os.path.join(project_path(),"src","dataset","cache", "artifacts_bundle.pkl"),
+        artifacts=[reference_path, fingerprint_path, dst],
+    )
+
+
+def train_incremental(model_type, model_class, run_name, timestamp, report, wait_for_upload,
+                      early_stopping_rounds, time_budget, budget_clock, n_jobs,
+                      rounds = TRAIN_INCREMENTAL_ROUNDS, replay_fraction = TRAIN_REPLAY_FRACTION,
+                      max_changed = TRAIN_INCREMENTAL_MAX_CHANGED, tolerance = TRAIN_INCREMENTAL_TOLERANCE,
+                      max_trees = TRAIN_INCREMENTAL_MAX_TREES):
+    """
+    Production 부스팅 모델 뒤에 최대 rounds 개 트리를 추가 학습
+    - 피처 공간이 같아야 하므로 Production 의 전처리 번들(tf-idf/장르 임베딩)로 피처화
+    - 학습 행: Production 학습 이후 새로 생기거나 바뀐 행 전체 + 나머지 중 replay_fraction 샘플
+    - 검증/테스트: 영화 id 해시 분할에서 Production 이 학습한 행을 뺀 나머지
+    - 다음 경우 IncrementalFallback (전체 재학습):
+      Production 모델/행 지문 없음, 모델 종류 다름, 트리 수가 max_trees 를 넘게 됨,
+      바뀐 행 비율이 max_changed 초과 또는 0, 검증/테스트 행 없음, 검증 RMSE 가 Production 대비 tolerance 비율 이상 나빠짐
+    """
+    report(0.05, "Production 모델 로드 중")
+    try:
+        with profile_stage("load_production"):
+            production_run_id, production = load_production_model()
+    except Exception as e:
+        raise IncrementalFallback(f"Production 모델 로드 실패: {e}")
+
+    base_model = limit_estimator_threads(production.model, n_jobs)
+    if not isinstance(base_model, model_class):
+        raise IncrementalFallback(f"Production 모델 종류가 다름 ({type(base_model).__name__})")
+    base_trees = tree_count(base_model)
+    if base_trees + rounds > max_trees:
+        raise IncrementalFallback(f"트리 수 한도 초과 ({base_trees} + {rounds} > {max_trees})")
+    with profile_stage("load_production"):
+        previous = load_row_fingerprints(production_run_id)
+    if previous is None:
+        raise IncrementalFallback("Production run 에 학습 행 지문이 없음")
+
+    # 전체 학습과 같은 영화 id 해시 분할 (검증/테스트 RMSE 를 다른 후보와 비교할 수 있도록)
+    with profile_stage("dataset"), profile_stage("read"):
+        train_df, val_df, test_df = split_dataset(read_dataset())
+        # Production 이 학습한 행은 검증/테스트에서 제외 (분할 방식이 바뀌기 전 학습 행이 섞이면 RMSE 가 낙관적으로 나옴)
+        val_df, test_df = (df[~df["id"].astype(str).isin(previous)] for df in (val_df, test_df))
+        rows, n_changed, fingerprints = select_incremental_rows(train_df, previous, replay_fraction)
+    changed_ratio = n_changed / max(len(train_df), 1)
+    print(f"📦 [{model_type.value.upper()}] 새/바뀐 행 {n_changed} / {len(train_df)} ({changed_ratio:.1%}), "
+          f"replay {len(rows) - n_changed}")
+    if n_changed == 0:
+        raise IncrementalFallback("새로 학습할 행이 없음")
+    if changed_ratio > max_changed:
+        raise IncrementalFallback(f"바뀐 행 비율 {changed_ratio:.1%} > {max_changed:.0%}")
+    if val_df.empty or test_df.empty:
+        raise IncrementalFallback("Production 이 학습하지 않은 검증/테스트 행이 없음")
+
+    report(0.15, "Production 전처리로 피처 생성 중")
+    artifacts = {"tf_idf": production.tf_idf, "embedding_module": production.embedding_module}
+    with profile_stage("dataset"):
+        train_dataset = MovieRatingDataset(rows.copy(), **artifacts)
+        valid_dataset = MovieRatingDataset(val_df.copy(), **artifacts)
+        test_dataset = MovieRatingDataset(test_df.copy(), **artifacts)
+    X_val, y_val = valid_dataset.X, valid_dataset.y
+
+    with profile_stage("evaluate"), profile_stage("production"):
+        production_valid_rmse = mean_squared_error(y_val, evaluate(base_model, X_val), squared=False)
+
+    report(0.3, "모델 이어서 학습 중")
+    model = model_class(**base_model.get_params())
+    model.set_params(n_estimators=rounds, n_jobs=n_jobs)
+    budget = TrainingBudget(time_budget, clock=budget_clock)
+    with profile_stage("fit"):
+        best_iteration, learning_curve = fit_with_budget(
+            model, train_dataset.X, train_dataset.y, X_val, y_val, budget,
+            early_stopping_rounds=early_stopping_rounds, init_model=base_model,
         )
-        mlflow.pyfunc.log_model(
-            name = "movie_rating_model",
-            python_model= MovieRatingModel(model = model),
-            artifacts={
-                "artifacts_bundle" : artifact_path
-            },
-            input_example=input_example,
-            signature=signature
+    train_seconds = budget.elapsed()
+
+    report(0.6, "모델 평가 중")
+    with profile_stage("evaluate"):
+        rmse_metrics, train_preds = rmse_scores(model, {
+            "train": (train_dataset.X, train_dataset.y),
+            "valid": (X_val, y_val),
+            "test": (test_dataset.X, test_dataset.y),
+        })
+    print(f"⏱️ [{model_type.value.upper()}] +{tree_count(model) - base_trees} trees, {budget.clock} {train_seconds:.1f}s, "
+          f"valid RMSE {production_valid_rmse:.4f} -> {rmse_metrics['valid_rmse']:.4f}")
+
+    if rmse_metrics["valid_rmse"] > production_valid_rmse * (1 + tolerance):
+        raise IncrementalFallback(
+            f"검증 RMSE 악화 ({production_valid_rmse:.4f} -> {rmse_metrics['valid_rmse']:.4f})"
         )
 
-        # 8-1. mlflow artifact 에 저장
-        mlflow.log_artifact(dst)
+    with profile_stage("reference"):
+        # 참조 요약은 현재 카탈로그에서 무작위로 뽑힌 검증 분할 기준 (증분 학습 행은 새 행 쪽으로 치우침)
+        reference_path = build_reference_summary(valid_dataset, evaluate(model, X_val)).save(
+            os.path.join(project_path(), "models", "reference", run_name, REFERENCE_FILE)
+        )
+        # 이 모델이 본 행 = Production 이 본 행 + 현재 학습 분할
+        fingerprint_path = save_row_fingerprints(
+            {**previous, **fingerprints},
+            os.path.join(project_path(), "models", "reference", run_name, TRAINING_ROWS_FILE)
+        )
 
-        logger.info(f"[{run_name}][{model_type.value.upper()}] RMSE: {valid_rmse:.4f}")
\ No newline at end of file
+    return log_training_run(
+        model, model_type, run_name, timestamp, report, wait_for_upload,
+        params={
+            **{key: value for key, value in model.get_params().items() if value is not None},
+            "early_stopping_rounds": early_stopping_rounds,
+            "time_budget": time_budget,
+            "budget_clock": budget_clock,
+            "init_run_id": production_run_id,
+            "replay_fraction": replay_fraction,
+        },
+        metrics={
+            **rmse_metrics,
+            "best_iteration": best_iteration,
+            "train_seconds": train_seconds,
+            "budget_exhausted": int(budget.exhausted),
+            "production_valid_rmse": production_valid_rmse,
+            "incremental_rows": len(rows),
+            "changed_rows": n_changed,
+            "n_trees": tree_count(model),
+        },
+        learning_curve=learning_curve,
+        tags={"training_mode": "incremental"},
+        # Production 과 같은 전처리 번들 (내용 해시가 같아 공유 run 에 다시 올라가지 않음)
+        bundle_path=production.bundle_path,
+        artifacts=[reference_path, fingerprint_path],
+    )
+
+
+def log_training_run(model, model_type, run_name, timestamp, report, wait_for_upload,
+                     params, metrics, learning_curve, tags, bundle_path, artifacts):
+    """MLflow 파라미터/메트릭/pyfunc 모델/아티팩트 로깅 (업로드는 백그라운드 스레드에서 재시도와 함께 처리)"""
+    report(0.8, "MLflow 로깅 등록 중")
+    run_logger = AsyncRunLogger(EXPERIMENT_NAME, run_name)
+
+    run_logger.log_params(params)
+    run_logger.log_metrics({"rmse": metrics["valid_rmse"], **metrics})
+    run_logger.log_metric_history("valid_rmse_curve", learning_curve)
+    run_logger.set_tag("model_timestamp", timestamp)
+    for key, value in tags.items():
+        run_logger.set_tag(key, value)
+
+    # 데이터셋 캐시가 다음 학습에서 삭제/재생성되어도 업로드할 수 있도록 내용 해시 경로로 고정
+    with profile_stage("bundle_snapshot"):
+        artifact_path = snapshot_artifact(
+            bundle_path,
+            cache_dir=os.path.join(project_path(), "models", "artifact_cache")
+        )
+
+    # 7. 모델 저장
+    input_example = pd.DataFrame([{
+        "overview": "이 영화는 액션과 감동이 넘친다",
+        "genres": '["액션", "모험"]',
+        "adult": 0.0,
+        "video": 0.0,
+        "original_language": "kr"
+    }])
+
+    signature = ModelSignature(
+        inputs=Schema([
+            ColSpec("string", "overview"),
+            ColSpec("string", "genres"),
+            ColSpec("double", "adult"),
+            ColSpec("double", "video"),
+            ColSpec("string", "original_language")
+        ]),
+        outputs=Schema([ColSpec("double")])
+    )
+    # 8-1. 전처리 번들은 모델에 포함하지 않고 내용 해시 기준으로 공유 run 에 한 번만 업로드
+    #      (run 에는 태그로, 모델에는 bundle_uri 로 기록하고 load_context 에서 받아 씀)
+    python_model = MovieRatingModel(model = model)
+    run_logger.log_shared_artifact(artifact_path, tag_key="artifacts_bundle_uri", on_uploaded=python_model.set_bundle_uri)
+    run_logger.log_pyfunc_model(
+        ready=lambda: python_model.bundle_uri is not None,
+        name = "movie_rating_model",
+        python_model= python_model,
+        input_example=input_example,
+        signature=signature
+    )
+
+    # 8-2. 학습 데이터 참조 요약, 학습 행 지문, 로컬 저장한 모델 파일
+    for path in artifacts:
+        if path:
+            run_logger.log_artifact(path)
+
+    # 8-3. 단계별 시간/메모리 프로파일 (업로드 시간은 앞선 업로드가 끝난 뒤 로깅 스레드에서 더해 기록)
+    profiler = current_profiler()
+    if profiler is not None:
+        log_stage_profile(
+            run_logger, profiler.summary(),
+            os.path.join(project_path(), "models", "reference", run_name, STAGE_PROFILE_FILE)
+        )
+
+    if wait_for_upload:
+        report(0.9, "MLflow 업로드 대기 중")
+    run_logger.close(wait=wait_for_upload)
+    # 업로드를 기다린 경우 실패한 업로드가 있으면 학습(작업)도 실패로 처리
+    if wait_for_upload and run_logger.failed:
+        raise RuntimeError(f"MLflow 업로드 {run_logger.failed}건 실패 (run_id={run_logger.run_id})")
+
+    valid_rmse = metrics["valid_rmse"]
+    logger.info(f"[{run_name}][{model_type.value.upper()}] RMSE: {valid_rmse:.4f} ({tags.get('training_mode')})")
+    report(1.0, "학습 완료" if wait_for_upload else "학습 완료 (MLflow 업로드는 백그라운드 진행)")
+
+    result = {
+        "run_id": run_logger.run_id, "run_name": run_name, "training_mode": tags.get("training_mode"),
+        **{key: metrics[key] for key in ("train_rmse", "valid_rmse", "test_rmse")},
+    }
+    # 업로드 완료를 기다린 경우에만 등록 가능한 모델 URI 가 확정됨
+    if wait_for_upload:
+        result["model_uri"] = run_logger.model_uri
+    return result
@@ -1,4 +1,5 @@
 import joblib
+import hashlib
 import os
 import sys
 
@@ -14,8 +15,10 @@ import torch.nn as nn
 import ast
 
 from src.dataset.movie_rating import GenreEmbeddingModule
+from src.dataset.text_features import slim_text_vectorizer, okt_session
 from src.utils.utils import project_path
 from src.dataset import movie_rating
+from src.ml.async_logging import fetch_shared_artifact
 
 
 class MovieRatingModel(mlflow.pyfunc.PythonModel):
@@ -24,12 +27,33 @@ class MovieRatingModel(mlflow.pyfunc.PythonModel):
         self.tf_idf = None
         self.embedding_module = None
         self.genre2idx = None
+        self.feature_key = None
+        self.bundle_path = None
+        # 공유 run 에 올린 전처리 번들 URI (번들을 모델 아티팩트에 포함하지 않음)
+        self.bundle_uri = None
         self.genre_decode = movie_rating.get_genre_decode()
 
+    def set_bundle_uri(self, uri):
+        self.bundle_uri = uri
+
     def load_context(self, context):
-        bundle = joblib.load(context.artifacts["artifacts_bundle"])
-        self.genre2idx = bundle["genre2idx"]
-        self.tf_idf = bundle["tfidf_vectorizer"]
+        if "artifacts_bundle" in (context.artifacts or {}):
+            # 번들을 모델 아티팩트로 함께 로깅한 이전 모델
+            bundle_path = context.artifacts["artifacts_bundle"]
+        elif getattr(self, "bundle_uri", None):
+            bundle_path = fetch_shared_artifact(
+                self.bundle_uri, cache_dir=os.path.join(project_path(), "models", "artifact_cache")
+            )
+        else:
+            raise RuntimeError("전처리 번들 위치(artifacts_bundle / bundle_uri)가 없는 모델입니다.")
+        # 증분 학습 시 같은 전처리 번들을 그대로 다시 로깅하기 위해 보관
+        self.bundle_path = bundle_path
+        bundle = joblib.load(bundle_path)
+        # 이전 번들의 genre2idx 는 defaultdict 조회로 int 키가 섞여 있으므로 (28 과 "28")
+        # load_artifacts_bundle 과 같이 문자열 키로 정규화해 중복 제거
+        self.genre2idx = {str(k): v for k, v in bundle["genre2idx"].items()}
+        # 이전 번들은 학습 데이터셋까지 끌고 오는 TfidfVectorizer 이므로 어휘/IDF 만 남김
+        self.tf_idf = slim_text_vectorizer(bundle["tfidf_vectorizer"])
         embedding_state = bundle["embedding_state_dict"]
 
         # 수정: GenreEmbeddingModule 사용
@@ -37,34 +61,70 @@ class MovieRatingModel(mlflow.pyfunc.PythonModel):
         self.embedding_module.load_state_dict(embedding_state)
         self.embedding_module.eval()
 
+        # 같은 전처리 번들로 학습된 모델끼리는 피처를 공유할 수 있도록 번들 내용 해시를 키로 사용
+        with open(bundle_path, "rb") as f:
+            self.feature_key = hashlib.sha1(f.read()).hexdigest()
+
         self.genre_decode = movie_rating.get_genre_decode()
 
 
-    def predict(self, context, model_input):
-        results = []
-        model_input['is_english'] = (model_input['original_language'] == 'en').astype(int)
-        model_input['overview_clean'] = model_input['overview'].fillna("").apply(movie_rating.MovieRatingDataset.clean_korean_text)
-        for _, row in model_input.iterrows():
-            # overview 처리
-            overview_vec = self.tf_idf.transform([row['overview_clean']])
-
-            # genres 처리
-            raw_genres = row["genres"]
+    def build_features(self, model_input):
+        """
+        model_input(DataFrame, pyfunc 시그니처) -> 모델 입력 행렬 X [n_rows, n_features]
+        여러 모델이 같은 전처리 번들을 쓰는 경우 이 결과를 재사용할 수 있다.
+        """
+        # genres 처리 (장르 이름 -> 장르 ID)
+        genre_ids_batch = []
+        for raw_genres in model_input["genres"]:
             if isinstance(raw_genres, str):
                 genre_names = ast.literal_eval(raw_genres)
             else:
                 genre_names = raw_genres
-            genre_ids = [self.genre_decode.get(name, 0) for name in genre_names]
-            genre_idx_list = [self.genre2idx.get(str(gid), 0) for gid in genre_ids]
+            genre_ids_batch.append([self.genre_decode.get(name, 0) for name in genre_names])
+
+        return self.build_features_from_columns(
+            overview=model_input["overview"].tolist(),
+            genre_ids=genre_ids_batch,
+            adult=model_input["adult"].tolist(),
+            video=model_input["video"].tolist(),
+            original_language=model_input["original_language"].tolist(),
+        )
+
+
+    def build_features_from_columns(self, overview, genre_ids, adult, video, original_language):
+        """
+        타입이 정해진 컬럼 입력 -> 모델 입력 행렬 X
+        DataFrame 생성, 장르 이름 직렬화/파싱 없이 장르 ID 를 임베딩 행으로 한 번에 매핑한다.
+
+        overview: List[str], genre_ids: List[List[int]] | FlatGenreIds, adult/video: List[int|float], original_language: List[str]
+        """
+        clean = movie_rating.MovieRatingDataset.clean_korean_text
+        # 배치 토큰화 동안 이 스레드에 풀의 Okt 인스턴스를 붙여 둠 (스레드마다 다른 분석기 사용)
+        with okt_session():
+            overview_vec = self.tf_idf.transform([clean(text) if text is not None else "" for text in overview])
 
-            with torch.no_grad():
-                self.embedding_module.eval()
-                genre_tensor = self.embedding_module([genre_idx_list])
-                genre_vec = genre_tensor.cpu().numpy().reshape(1, -1)
+        with torch.no_grad():
+            self.embedding_module.eval()
+            genre_vec = self.embedding_module(genre_ids).cpu().numpy()
 
-            meta_features = np.array([[row["adult"], row["video"], row["is_english"]]])
-            X = np.hstack([meta_features, overview_vec.toarray(), genre_vec])
-            y_pred = self.model.predict(X).clip(0, 10)
-            results.append(y_pred[0])
+        meta_features = np.column_stack([
+            np.asarray(adult, dtype=float),
+            np.asarray(video, dtype=float),
+            np.fromiter((lang == 'en' for lang in original_language), dtype=float, count=len(original_language)),
+        ])
+        return np.hstack([meta_features, overview_vec.toarray(), genre_vec])
 
-        return np.array(results)
+
+    def predict_typed(self, overview: str, genre_ids, adult: int = 0, video: int = 0, original_language: str = "en"):
+        """단건 타입 입력 추론 API (/predict/json 용)"""
+        X = self.build_features_from_columns([overview], [list(genre_ids or [])], [adult], [video], [original_language])
+        return float(self.predict_features(X)[0])
+
+
+    def predict_features(self, X):
+        """전처리가 끝난 피처 행렬로 평점 예측"""
+        return self.model.predict(X).clip(0, 10)
+
+
+    def predict(self, context, model_input):
+        return np.asarray(self.predict_features(self.build_features(model_input)))
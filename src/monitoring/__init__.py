@@ -0,0 +1 @@
+# 서빙 모니터링 패키지 (스트리밍 통계 스케치 / 예측 로그)
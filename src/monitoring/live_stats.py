@@ -0,0 +1,195 @@
+import os
+import json
+import threading
+
+import numpy as np
+
+from src.monitoring.sketches import (
+    QuantileSketch, CountMinSketch, HeavyHitters,
+    population_stability_index, share_distance,
+)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REFERENCE_FILE = "reference_summary.json"
+NUMERIC_FIELDS = ["prediction", "overview_length", "tfidf_norm"]
+CATEGORICAL_FIELDS = ["genre_id", "original_language"]
+
+
+def tfidf_norms(X, start: int, stop: int):
+    """피처 행렬에서 tf-idf 구간의 행별 L2 norm"""
+    return np.linalg.norm(np.asarray(X[:, start:stop], dtype=np.float32), axis=1)
+
+
+def unknown_genre_mask(embedding_module, genre_ids_batch):
+    """(UNK 장르 수, 전체 장르 수, 행별 UNK 장르 수)"""
+    flat_ids, offsets = embedding_module.flatten(genre_ids_batch)
+    unknown = (embedding_module.ids_to_index(flat_ids) == 0).cpu().numpy()
+    lengths = np.diff(np.append(offsets, len(flat_ids)))
+    rows = np.repeat(np.arange(len(offsets)), lengths)
+    unk_per_row = np.bincount(rows, weights=unknown, minlength=len(offsets))
+    return int(unknown.sum()), len(flat_ids), unk_per_row
+
+
+class InputStatsSummary:
+    """예측 입력/출력의 고정 크기 요약 (분위수 스케치 + count-min + heavy hitters + UNK 비율)"""
+
+    def __init__(self):
+        self.numeric = {field: QuantileSketch() for field in NUMERIC_FIELDS}
+        self.count_min = {field: CountMinSketch() for field in CATEGORICAL_FIELDS}
+        self.heavy_hitters = {field: HeavyHitters() for field in CATEGORICAL_FIELDS}
+        self.rows = 0
+        self.rows_with_unk_genre = 0
+        self.genres = 0
+        self.unk_genres = 0
+
+    def observe_batch(self, overview, genre_ids, original_language, tfidf_norm, unk_per_row, unk_count, genre_count, predictions=None):
+        for text, norm in zip(overview, tfidf_norm):
+            self.numeric["overview_length"].add(len(text or ""))
+            self.numeric["tfidf_norm"].add(norm)
+        if predictions is not None:
+            for pred in np.asarray(predictions, dtype=float).ravel():
+                self.numeric["prediction"].add(pred)
+
+        for row in genre_ids:
+            for genre_id in row:
+                self.count_min["genre_id"].add(genre_id)
+                self.heavy_hitters["genre_id"].add(genre_id)
+        for lang in original_language:
+            self.count_min["original_language"].add(lang)
+            self.heavy_hitters["original_language"].add(lang)
+
+        self.rows += len(overview)
+        self.rows_with_unk_genre += int(np.count_nonzero(unk_per_row))
+        self.genres += genre_count
+        self.unk_genres += unk_count
+
+    def summary(self, top: int = 10):
+        return {
+            "rows": self.rows,
+            "numeric": {field: sketch.summary() for field, sketch in self.numeric.items()},
+            "top": {field: sketch.top(top) for field, sketch in self.heavy_hitters.items()},
+            "unk_genre_rate": self.unk_genres / self.genres if self.genres else None,
+            "rows_with_unk_genre_rate": self.rows_with_unk_genre / self.rows if self.rows else None,
+        }
+
+    def to_dict(self):
+        return {
+            "numeric": {field: sketch.to_dict() for field, sketch in self.numeric.items()},
+            "count_min": {field: sketch.to_dict() for field, sketch in self.count_min.items()},
+            "heavy_hitters": {field: sketch.to_dict() for field, sketch in self.heavy_hitters.items()},
+            "rows": self.rows,
+            "rows_with_unk_genre": self.rows_with_unk_genre,
+            "genres": self.genres,
+            "unk_genres": self.unk_genres,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls()
+        summary.numeric = {f: QuantileSketch.from_dict(d) for f, d in data["numeric"].items()}
+        summary.count_min = {f: CountMinSketch.from_dict(d) for f, d in data["count_min"].items()}
+        summary.heavy_hitters = {f: HeavyHitters.from_dict(d) for f, d in data["heavy_hitters"].items()}
+        summary.rows = data["rows"]
+        summary.rows_with_unk_genre = data["rows_with_unk_genre"]
+        summary.genres = data["genres"]
+        summary.unk_genres = data["unk_genres"]
+        return summary
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def build_reference_summary(dataset, predictions):
+    """학습 데이터셋 기준 참조 요약 (trainer 에서 저장)"""
+    tfidf_cols = [i for i, name in enumerate(dataset.feature_names) if name.startswith("tfidf_")]
+    genre_ids = dataset.df["genre_ids"].tolist()
+    unk_count, genre_count, unk_per_row = unknown_genre_mask(dataset.embedding_module, genre_ids)
+
+    reference = InputStatsSummary()
+    reference.observe_batch(
+        overview=dataset.df["overview"].fillna("").tolist(),
+        genre_ids=genre_ids,
+        original_language=dataset.df["original_language"].tolist(),
+        tfidf_norm=tfidf_norms(dataset.X, tfidf_cols[0], tfidf_cols[-1] + 1),
+        unk_per_row=unk_per_row,
+        unk_count=unk_count,
+        genre_count=genre_count,
+        predictions=predictions,
+    )
+    return reference
+
+
+class LiveStatsMonitor:
+    """서빙 트래픽의 스트리밍 요약과 학습 참조 요약 비교 (메모리는 트래픽량과 무관하게 고정)"""
+
+    def __init__(self, reference: InputStatsSummary = None):
+        self.reference = reference
+        self.live = InputStatsSummary()
+        self._lock = threading.Lock()
+
+    def observe(self, python_model, columns: dict, X, predictions):
+        """predict 경로에서 BackgroundTasks 로 호출 (응답 이후 실행)"""
+        try:
+            emb_dim = python_model.embedding_module.embedding.embedding_dim
+            norms = tfidf_norms(X, 3, X.shape[1] - emb_dim)
+            unk_count, genre_count, unk_per_row = unknown_genre_mask(python_model.embedding_module, columns["genre_ids"])
+
+            with self._lock:
+                self.live.observe_batch(
+                    overview=columns["overview"],
+                    genre_ids=columns["genre_ids"],
+                    original_language=columns["original_language"],
+                    tfidf_norm=norms,
+                    unk_per_row=unk_per_row,
+                    unk_count=unk_count,
+                    genre_count=genre_count,
+                    predictions=predictions,
+                )
+        except Exception as e:
+            logger.warning(f"[WARN] live stats observe failed : {e}")
+
+    def stats(self):
+        with self._lock:
+            return self.live.summary()
+
+    def frequency(self, field: str, item):
+        """count-min 스케치 기준 특정 항목(장르 ID, 언어 코드) 빈도 추정"""
+        with self._lock:
+            live = self.live.count_min[field].estimate(item)
+        reference = self.reference.count_min[field].estimate(item) if self.reference else None
+        return {"field": field, "item": item, "live": live, "reference": reference}
+
+    def drift(self):
+        if self.reference is None:
+            return {"status": "no_reference"}
+
+        with self._lock:
+            numeric = {
+                field: population_stability_index(self.reference.numeric[field], self.live.numeric[field])
+                for field in NUMERIC_FIELDS
+            }
+            categorical = {
+                field: share_distance(self.reference.heavy_hitters[field], self.live.heavy_hitters[field])
+                for field in CATEGORICAL_FIELDS
+            }
+            live_unk = self.live.unk_genres / self.live.genres if self.live.genres else None
+
+        ref_unk = self.reference.unk_genres / self.reference.genres if self.reference.genres else None
+        return {
+            "status": "ok",
+            "live_rows": self.live.rows,
+            "reference_rows": self.reference.rows,
+            "psi": numeric,
+            "share_distance": categorical,
+            "unk_genre_rate": {"reference": ref_unk, "live": live_unk},
+        }
@@ -0,0 +1,195 @@
+import os
+import time
+import gzip
+import json
+import asyncio
+import threading
+import glob
+from collections import deque
+from datetime import datetime, timezone, timedelta
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+SEGMENT_SUFFIX = ".ndjson.gz"
+OPEN_SUFFIX = ".part"
+
+
+class PredictionLogWriter:
+    """
+    서빙 예측 기록을 메모리 버퍼에 모았다가 백그라운드 태스크가 배치로 NDJSON.gz 세그먼트에 기록
+    - append 는 버퍼에 넣기만 하므로 응답 지연이 없음
+    - 버퍼가 가득 차면(디스크가 못 따라가면) 새 기록을 버리고 dropped 카운터 증가
+    - 세그먼트는 크기/시간 기준으로 교체되며, 작성 중인 파일은 .part 접미사로 구분
+      (시간 기준 교체는 기록이 없어도 백그라운드 태스크가 확인)
+    - 시작 시 죽은 프로세스가 남긴 .part 파일은 기록 완료 세그먼트로 정리
+    """
+
+    def __init__(self, directory: str, max_buffer: int = 10000, batch_size: int = 1000,
+                 flush_interval: float = 2.0, segment_max_bytes: int = 32 * 1024 * 1024,
+                 segment_max_seconds: int = 3600):
+        self.directory = directory
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_seconds = segment_max_seconds
+
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._task = None
+        self._segment_path = None
+        self._segment_started = 0.0
+
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.segments = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.recovered = self._finalize_orphans()
+
+    def append(self, record: dict):
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                return False
+            self._buffer.append(record)
+            return True
+
+    def _drain(self):
+        with self._lock:
+            n = min(len(self._buffer), self.batch_size)
+            return [self._buffer.popleft() for _ in range(n)]
+
+    def _open_segment(self):
+        name = f"predictions-{datetime.now(KST).strftime('%Y%m%d-%H%M%S')}-{os.getpid()}{SEGMENT_SUFFIX}"
+        self._segment_path = os.path.join(self.directory, name + OPEN_SUFFIX)
+        self._segment_started = time.time()
+
+    def _is_orphan(self, path):
+        # 파일명: predictions-<YYYYmmdd-HHMMSS>-<pid>.ndjson.gz.part
+        stem = os.path.basename(path)[:-len(SEGMENT_SUFFIX + OPEN_SUFFIX)]
+        try:
+            _, day, clock, pid = stem.split("-")
+            pid = int(pid)
+            opened = datetime.strptime(f"{day}-{clock}", "%Y%m%d-%H%M%S").replace(tzinfo=KST)
+        except ValueError:
+            return False
+
+        # 같은 pid 는 이전 실행이 남긴 파일 (이 writer 는 아직 세그먼트를 열지 않음)
+        if pid == os.getpid():
+            return True
+        # 살아 있는 writer 는 segment_max_seconds 안에 교체하므로, 그보다 오래 열린 파일은 pid 가 재사용된 경우
+        if (datetime.now(KST) - opened).total_seconds() > self.segment_max_seconds + 2 * self.flush_interval + 60:
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def _finalize_orphans(self):
+        """비정상 종료로 남은 .part 파일을 기록 완료 세그먼트로 이름 변경 (잘린 마지막 gzip 멤버는 읽을 때 건너뜀)"""
+        recovered = 0
+        for path in glob.glob(os.path.join(self.directory, f"*{SEGMENT_SUFFIX}{OPEN_SUFFIX}")):
+            if not self._is_orphan(path):
+                continue
+            try:
+                os.replace(path, path[:-len(OPEN_SUFFIX)])
+                recovered += 1
+            except OSError as e:
+                logger.warning(f"[WARN] failed to finalize orphaned prediction log segment {path} : {e}")
+        if recovered:
+            logger.info(f"[INFO] finalized {recovered} orphaned prediction log segments")
+        return recovered
+
+    def _close_segment(self):
+        if self._segment_path and os.path.exists(self._segment_path):
+            os.replace(self._segment_path, self._segment_path[:-len(OPEN_SUFFIX)])
+            self.segments += 1
+        self._segment_path = None
+
+    def _write_batch(self, batch):
+        with self._write_lock:
+            self._write_batch_locked(batch)
+
+    def _write_batch_locked(self, batch):
+        if self._segment_path is None:
+            self._open_segment()
+
+        payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch).encode("utf-8")
+        # 배치마다 gzip 멤버를 이어붙여 기록 (gzip.open 으로 이어서 읽을 수 있음)
+        with open(self._segment_path, "ab") as f:
+            f.write(gzip.compress(payload))
+        self.written += len(batch)
+
+        if os.path.getsize(self._segment_path) >= self.segment_max_bytes:
+            self._close_segment()
+        else:
+            self._rotate_if_due_locked()
+
+    def _rotate_if_due_locked(self):
+        if self._segment_path is not None and time.time() - self._segment_started >= self.segment_max_seconds:
+            self._close_segment()
+
+    def _rotate_if_due(self):
+        with self._write_lock:
+            self._rotate_if_due_locked()
+
+    async def flush(self):
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error(f"[ERROR] failed to write prediction log batch ({len(batch)} records) : {e}")
+                return
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            # 기록이 끊겨도 열린 세그먼트가 시간 기준으로 닫히도록 매 주기마다 확인
+            try:
+                await asyncio.to_thread(self._rotate_if_due)
+            except Exception as e:
+                logger.error(f"[ERROR] failed to rotate prediction log segment : {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        with self._write_lock:
+            self._close_segment()
+
+    def stats(self):
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            "directory": self.directory,
+            "buffered": buffered,
+            "max_buffer": self.max_buffer,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "segments": self.segments,
+            "recovered": self.recovered,
+        }
@@ -0,0 +1,187 @@
+import math
+import zlib
+import random
+
+
+class QuantileSketch:
+    """
+    KLL 방식의 스트리밍 분위수 스케치
+    - 레벨별 버퍼가 k 개를 넘으면 정렬 후 절반만 다음 레벨(가중치 2배)로 올림
+    - 메모리는 O(k * log(n / k)), 분위수 오차는 대략 O(1 / k)
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.levels = [[]]
+        self._rng = random.Random(seed)
+
+    def add(self, value: float):
+        value = float(value)
+        if math.isnan(value):
+            return
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.levels[0].append(value)
+        if len(self.levels[0]) >= self.k:
+            self._compress()
+
+    def _compress(self):
+        for level, buffer in enumerate(self.levels):
+            if len(buffer) < self.k:
+                break
+            buffer.sort()
+            promoted = buffer[self._rng.randint(0, 1)::2]
+            self.levels[level] = []
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            self.levels[level + 1].extend(promoted)
+
+    def _weighted(self):
+        items = [(value, 1 << level) for level, buffer in enumerate(self.levels) for value in buffer]
+        items.sort()
+        return items
+
+    def quantile(self, q: float):
+        items = self._weighted()
+        if not items:
+            return None
+        total = sum(weight for _, weight in items)
+        target = q * total
+        cumulative = 0
+        for value, weight in items:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return items[-1][0]
+
+    def cdf(self, value: float):
+        """value 이하 비율 (0~1)"""
+        items = self._weighted()
+        total = sum(weight for _, weight in items)
+        if total == 0:
+            return None
+        return sum(weight for v, weight in items if v <= value) / total
+
+    def summary(self, quantiles=(0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)):
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "quantiles": {str(q): self.quantile(q) for q in quantiles},
+        }
+
+    def to_dict(self):
+        return {"k": self.k, "count": self.count, "min": self.min, "max": self.max, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data["k"])
+        sketch.count = data["count"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch.levels = [list(level) for level in data["levels"]]
+        return sketch
+
+
+def _stable_hash(item, seed: int):
+    # 프로세스마다 달라지는 hash() 대신 crc32 사용 (학습/서빙 스케치를 비교할 수 있도록)
+    return zlib.crc32(f"{seed}:{item}".encode("utf-8"))
+
+
+class CountMinSketch:
+    """고정 크기(depth x width) 카운터 배열로 항목별 빈도를 과대추정 방향으로 근사"""
+
+    def __init__(self, width: int = 1024, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.table = [[0] * width for _ in range(depth)]
+
+    def add(self, item, count: int = 1):
+        self.total += count
+        for row in range(self.depth):
+            self.table[row][_stable_hash(item, row) % self.width] += count
+
+    def estimate(self, item):
+        return min(self.table[row][_stable_hash(item, row) % self.width] for row in range(self.depth))
+
+    def to_dict(self):
+        return {"width": self.width, "depth": self.depth, "total": self.total, "table": self.table}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(width=data["width"], depth=data["depth"])
+        sketch.total = data["total"]
+        sketch.table = [list(row) for row in data["table"]]
+        return sketch
+
+
+class HeavyHitters:
+    """Space-Saving 알고리즘으로 상위 k 개 빈출 항목 추적 (카운터 k 개 고정)"""
+
+    def __init__(self, k: int = 50):
+        self.k = k
+        self.total = 0
+        self.counters = {}
+
+    def add(self, item, count: int = 1):
+        item = str(item)
+        self.total += count
+        if item in self.counters:
+            self.counters[item] += count
+        elif len(self.counters) < self.k:
+            self.counters[item] = count
+        else:
+            victim = min(self.counters, key=self.counters.get)
+            self.counters[item] = self.counters.pop(victim) + count
+
+    def top(self, n: int = None):
+        items = sorted(self.counters.items(), key=lambda kv: kv[1], reverse=True)
+        return items[:n] if n else items
+
+    def shares(self):
+        if self.total == 0:
+            return {}
+        return {item: count / self.total for item, count in self.counters.items()}
+
+    def to_dict(self):
+        return {"k": self.k, "total": self.total, "counters": self.counters}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data["k"])
+        sketch.total = data["total"]
+        sketch.counters = dict(data["counters"])
+        return sketch
+
+
+def population_stability_index(reference: QuantileSketch, live: QuantileSketch, bins: int = 10):
+    """학습 분포의 분위수 구간 기준 PSI (0.1 미만 안정, 0.25 이상 큰 변화)"""
+    if reference.count == 0 or live.count == 0:
+        return None
+
+    cuts = sorted(set(reference.quantile(i / bins) for i in range(1, bins)))
+    edges = [-math.inf] + cuts + [math.inf]
+    psi = 0.0
+    for low, high in zip(edges[:-1], edges[1:]):
+        ref_share = (reference.cdf(high) if high != math.inf else 1.0) - (reference.cdf(low) if low != -math.inf else 0.0)
+        live_share = (live.cdf(high) if high != math.inf else 1.0) - (live.cdf(low) if low != -math.inf else 0.0)
+        ref_share, live_share = max(ref_share, 1e-4), max(live_share, 1e-4)
+        psi += (live_share - ref_share) * math.log(live_share / ref_share)
+    return psi
+
+
+def share_distance(reference: HeavyHitters, live: HeavyHitters):
+    """상위 항목 비율 분포 간 총변동거리 (0 ~ 1)"""
+    if reference.total == 0 or live.total == 0:
+        return None
+    ref_shares, live_shares = reference.shares(), live.shares()
+    keys = set(ref_shares) | set(live_shares)
+    distance = sum(abs(ref_shares.get(key, 0.0) - live_shares.get(key, 0.0)) for key in keys)
+    # 추적하지 못한 나머지(other) 비율 차이도 포함
+    distance += abs((1 - sum(ref_shares.values())) - (1 - sum(live_shares.values())))
+    return distance / 2
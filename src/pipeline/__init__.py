@@ -0,0 +1 @@
+# crawl -> preprocess -> train -> register -> reload 파이프라인 실행기
@@ -0,0 +1,189 @@
+import os
+import sys
+from datetime import datetime, timezone, timedelta
+
+sys.path.append(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))))
+)
+
+import requests
+
+from config import (
+    TEXT_VECTORIZER, HASHING_N_FEATURES, API_BASE_URL,
+    PIPELINE_STATE_PATH, PIPELINE_MAX_WORKERS,
+    TRAIN_EARLY_STOPPING_ROUNDS, TRAIN_TIME_BUDGET_SECONDS, TRAIN_BUDGET_CLOCK,
+    TRAIN_INCREMENTAL, TRAIN_INCREMENTAL_ROUNDS, TRAIN_REPLAY_FRACTION,
+)
+from src.pipeline.executor import Stage, PipelineExecutor, FAILED, BLOCKED
+from src.utils.logger import get_logger
+from src.utils.resources import role_threads, TRAINING
+from src.utils.utils import project_path
+
+logger = get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+PIPELINE_MODELS = ["lightgbm", "randomforest", "xgboost"]
+REGISTERED_MODEL_NAME = "best_model"
+
+
+def _path(*parts):
+    return os.path.join(project_path(), *parts)
+
+
+POPULAR_JSON = _path("data_prepare", "result", "popular.json")
+CACHE_DIR = _path("src", "dataset", "cache")
+
+
+def crawl(upstream):
+    from data_prepare.main import run_popular_movie_crawler
+
+    run_popular_movie_crawler()
+    if not os.path.exists(POPULAR_JSON):
+        raise FileNotFoundError(f"popular.json이 생성되지 않았습니다!! : {POPULAR_JSON}")
+    return {"popular_json": POPULAR_JSON}
+
+
+def preprocess(upstream):
+    from src.dataset.movie_rating import get_datasets
+
+    train_dataset, val_dataset, test_dataset = get_datasets(use_cache=False)
+    return {"rows": {"train": len(train_dataset), "valid": len(val_dataset), "test": len(test_dataset)}}
+
+
+def train(model_name: str, n_jobs: int = None):
+    def _train(upstream):
+        from src.ml.trainer import train_and_log_model
+        # 다음 단계(등록)에서 모델 URI 가 필요하므로 업로드 완료까지 대기
+        # 부스팅 모델은 Production 모델에서 이어서 학습 (조건이 맞지 않으면 trainer 가 전체 재학습)
+        return train_and_log_model(model_name, wait_for_upload=True, incremental=TRAIN_INCREMENTAL, n_jobs=n_jobs)
+    return _train
+
+
+def register_best(upstream):
+    """
+    검증 RMSE 가 가장 낮은 후보를 best_model 로 등록하고,
+    현재 Production 버전보다 좋을 때만 Production 으로 전환 (기존 버전은 보관 처리)
+    """
+    from mlflow.tracking import MlflowClient
+    import mlflow
+    from src.ml.config import init_mlflow
+
+    init_mlflow()
+    client = MlflowClient()
+
+    candidates = {name: result for name, result in upstream.items() if result and result.get("model_uri")}
+    if not candidates:
+        raise RuntimeError("등록할 수 있는 학습 결과가 없습니다.")
+    stage_name, best = min(candidates.items(), key=lambda item: item[1]["valid_rmse"])
+
+    production_rmse = None
+    try:
+        production = client.get_latest_versions(REGISTERED_MODEL_NAME, stages=["Production"])
+    except Exception:
+        production = []
+    if production:
+        # 예전 실행은 검증 RMSE 를 "rmse" 로만 기록
+        metrics = client.get_run(production[0].run_id).data.metrics
+        production_rmse = metrics.get("valid_rmse", metrics.get("rmse"))
+
+    if production and production[0].run_id == best["run_id"]:
+        return {"run_id": best["run_id"], "version": production[0].version, "promoted": False}
+
+    if production_rmse is not None and production_rmse <= best["valid_rmse"]:
+        logger.info(f"[INFO] keep Production (valid_rmse {production_rmse:.4f} <= {best['valid_rmse']:.4f})")
+        return {"run_id": production[0].run_id, "version": production[0].version, "promoted": False}
+
+    version = mlflow.register_model(best["model_uri"], REGISTERED_MODEL_NAME)
+    client.transition_model_version_stage(
+        REGISTERED_MODEL_NAME, version.version, stage="Production", archive_existing_versions=True
+    )
+    logger.info(f"[INFO] {stage_name} ({best['run_name']}) -> {REGISTERED_MODEL_NAME} v{version.version} Production")
+    return {"run_id": best["run_id"], "version": version.version, "promoted": True}
+
+
+def reload(upstream):
+    registered = upstream["register_best"]
+    if not registered["promoted"]:
+        return {"reloaded": False, "version": registered["version"]}
+
+    response = requests.post(f"{API_BASE_URL}/reload", timeout=300)
+    response.raise_for_status()
+    return {"reloaded": True, "version": registered["version"]}
+
+
+def build_daily_pipeline(models=None):
+    models = models or PIPELINE_MODELS
+    # 병렬로 도는 학습 단계들이 학습 스레드 예산을 나눠 씀 (스레드 수는 결과에 영향이 없으므로 단계 키에서 제외)
+    n_jobs = max(1, role_threads(TRAINING) // max(1, min(PIPELINE_MAX_WORKERS, len(models))))
+    train_stages = [
+        Stage(
+            name=f"train_{model_name}",
+            fn=train(model_name, n_jobs),
+            deps=["preprocess"],
+            inputs=[_path("src", "ml", "trainer.py"), _path("src", "ml", "budget.py"),
+                    _path("src", "ml", "incremental.py"), _path("src", "models", "MovieRatingModel.py")],
+            params={
+                "model_name": model_name,
+                "early_stopping_rounds": TRAIN_EARLY_STOPPING_ROUNDS,
+                "time_budget": TRAIN_TIME_BUDGET_SECONDS,
+                "budget_clock": TRAIN_BUDGET_CLOCK,
+                "incremental": TRAIN_INCREMENTAL,
+                "incremental_rounds": TRAIN_INCREMENTAL_ROUNDS,
+                "replay_fraction": TRAIN_REPLAY_FRACTION,
+            },
+        )
+        for model_name in models
+    ]
+
+    stages = [
+        # 크롤링은 하루 한 번 (같은 날 재실행하면 건너뜀)
+        Stage(
+            name="crawl",
+            fn=crawl,
+            outputs=[POPULAR_JSON],
+            key_fn=lambda: datetime.now(KST).strftime("%Y-%m-%d"),
+        ),
+        # popular.json 내용이나 전처리 코드/설정이 바뀐 경우에만 다시 전처리
+        Stage(
+            name="preprocess",
+            fn=preprocess,
+            deps=["crawl"],
+            inputs=[_path("src", "dataset", "movie_rating.py"), _path("src", "dataset", "text_features.py")],
+            outputs=[CACHE_DIR],
+            params={"text_vectorizer": TEXT_VECTORIZER, "hashing_n_features": HASHING_N_FEATURES},
+        ),
+        *train_stages,
+        Stage(
+            name="register_best",
+            fn=register_best,
+            deps=[stage.name for stage in train_stages],
+        ),
+        Stage(
+            name="reload",
+            fn=reload,
+            deps=["register_best"],
+        ),
+    ]
+    return PipelineExecutor(stages, state_path=PIPELINE_STATE_PATH, max_workers=PIPELINE_MAX_WORKERS)
+
+
+def run_daily_pipeline(force=None, models=None, progress_callback=None):
+    """
+    crawl -> preprocess -> train(모델별 병렬) -> register_best -> reload
+    입력이 바뀌지 않은 단계는 이전 결과를 재사용하므로 여러 번 호출해도 안전
+    force: 다시 실행할 단계 이름 (콤마 구분 문자열/리스트, "all" 이면 전체)
+    """
+    if isinstance(force, str) and force != "all":
+        force = force.split(",")
+
+    logger.info("[START] daily pipeline")
+    results = build_daily_pipeline(models).run(force=force, progress_callback=progress_callback)
+
+    failed = [name for name, stage in results.items() if stage["status"] in (FAILED, BLOCKED)]
+    if failed:
+        raise RuntimeError(f"daily pipeline failed : {failed} / {results}")
+
+    logger.info(f"[END] daily pipeline : { {name: stage['status'] for name, stage in results.items()} }")
+    return results
@@ -0,0 +1,208 @@
+import os
+import json
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+SUCCEEDED = "succeeded"
+SKIPPED = "skipped"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+
+@dataclass
+class Stage:
+    """
+    파이프라인 단계
+    - fn(upstream: dict[str, result]) -> result(dict, JSON 직렬화 가능)
+    - inputs: 내용 해시로 fingerprint 에 반영할 파일/디렉터리
+    - outputs: 건너뛰기 전에 존재해야 하는 결과 파일 (하위 단계 fingerprint 에도 반영)
+    - key_fn: 파일로 표현되지 않는 입력 (예: 날짜)을 문자열로 반환
+    """
+    name: str
+    fn: Callable[[dict], Optional[dict]]
+    deps: List[str] = field(default_factory=list)
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    params: Dict = field(default_factory=dict)
+    key_fn: Optional[Callable[[], str]] = None
+
+
+def hash_path(path: str, digest=None):
+    """파일 또는 디렉터리(하위 파일 전체, 경로순) 내용 해시"""
+    digest = digest or hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode("utf-8"))
+                hash_path(file_path, digest)
+    elif os.path.exists(path):
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    else:
+        digest.update(b"<missing>")
+    return digest
+
+
+class PipelineExecutor:
+    """
+    단계별 입력 fingerprint 를 기록해 이전 성공 실행과 같으면 건너뛰는 메모이즈 실행기
+    - 서로 의존하지 않는 단계는 스레드 풀에서 병렬 실행
+    - 실패한 단계의 하위 단계는 blocked 처리
+    """
+
+    def __init__(self, stages: List[Stage], state_path: str, max_workers: int = 3):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"❌ 단계 '{stage.name}' 의 의존 단계가 없습니다: {missing}")
+
+        # 순환 의존이 있으면 run() 이 끝나지 않으므로 생성 시점에 거부
+        cycle = self._find_cycle()
+        if cycle:
+            raise ValueError(f"❌ 단계 간 순환 의존이 있습니다: {' -> '.join(cycle)}")
+
+    def _find_cycle(self):
+        """DFS 로 의존 그래프의 순환을 찾아 [a, b, ..., a] 로 반환 (없으면 None)"""
+        visiting, visited = [], set()
+
+        def visit(name):
+            if name in visiting:
+                return visiting[visiting.index(name):] + [name]
+            if name in visited:
+                return None
+            visiting.append(name)
+            for dep in self.stages[name].deps:
+                cycle = visit(dep)
+                if cycle:
+                    return cycle
+            visiting.pop()
+            visited.add(name)
+            return None
+
+        for name in self.stages:
+            cycle = visit(name)
+            if cycle:
+                return cycle
+        return None
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self, state):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def fingerprint(self, stage: Stage, upstream_fingerprints: dict):
+        digest = hashlib.sha256()
+        digest.update(stage.name.encode("utf-8"))
+        digest.update(json.dumps(stage.params, sort_keys=True, default=str).encode("utf-8"))
+        for path in stage.inputs:
+            digest.update(path.encode("utf-8"))
+            hash_path(path, digest)
+        for dep in stage.deps:
+            digest.update(upstream_fingerprints[dep].encode("utf-8"))
+        if stage.key_fn:
+            digest.update(stage.key_fn().encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def output_fingerprint(stage: Stage, result):
+        """하위 단계에 전달되는 이 단계의 결과 fingerprint (출력 파일 내용 + 결과 값)"""
+        digest = hashlib.sha256()
+        for path in stage.outputs:
+            hash_path(path, digest)
+        digest.update(json.dumps(result, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _run_stage(self, stage: Stage, upstream_results: dict, upstream_fingerprints: dict, force: bool, state: dict):
+        fingerprint = self.fingerprint(stage, upstream_fingerprints)
+        previous = state.get(stage.name)
+
+        if (not force and previous and previous.get("fingerprint") == fingerprint
+                and all(os.path.exists(path) for path in stage.outputs)):
+            logger.info(f"[SKIP] stage {stage.name} (fingerprint unchanged)")
+            return SKIPPED, previous.get("result"), previous["output_fingerprint"]
+
+        logger.info(f"[START] stage {stage.name}")
+        result = stage.fn(upstream_results)
+        output_fingerprint = self.output_fingerprint(stage, result)
+
+        with self._lock:
+            state[stage.name] = {
+                "fingerprint": fingerprint,
+                "output_fingerprint": output_fingerprint,
+                "result": result,
+                "finished_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self._save_state(state)
+
+        logger.info(f"[END] stage {stage.name}")
+        return SUCCEEDED, result, output_fingerprint
+
+    def run(self, force: List[str] = None, progress_callback: Callable[[float, str], None] = None):
+        """
+        force: fingerprint 와 관계없이 다시 실행할 단계 이름 목록 ("all" 이면 전체)
+        progress_callback: 단계가 끝날 때마다 (완료 비율, 메시지) 로 호출
+        반환: {stage: {"status", "result"}}
+        """
+        force = set(self.stages) if force == "all" else set(force or [])
+        state = self._load_state()
+
+        statuses, results, fingerprints = {}, {}, {}
+        pending = dict(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if any(statuses.get(dep) in (FAILED, BLOCKED) for dep in stage.deps):
+                        statuses[name] = BLOCKED
+                        logger.warning(f"[BLOCKED] stage {name} (upstream failed)")
+                        del pending[name]
+                    elif all(statuses.get(dep) in (SUCCEEDED, SKIPPED) for dep in stage.deps):
+                        upstream = {dep: results.get(dep) for dep in stage.deps}
+                        upstream_fps = {dep: fingerprints[dep] for dep in stage.deps}
+                        future = pool.submit(self._run_stage, stage, upstream, upstream_fps, name in force, state)
+                        running[future] = name
+                        del pending[name]
+
+                if not running:
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        statuses[name], results[name], fingerprints[name] = future.result()
+                    except Exception as e:
+                        statuses[name] = FAILED
+                        results[name] = {"error": str(e)}
+                        logger.error(f"[ERROR] stage {name} failed : {e}")
+                    if progress_callback:
+                        progress_callback(len(statuses) / len(self.stages), f"{name}: {statuses[name]}")
+
+        return {name: {"status": statuses[name], "result": results.get(name)} for name in self.stages}
@@ -0,0 +1,136 @@
+import os
+
+from config import CPU_CORES, SERVING_CORES, SERVER_WORKERS, JOB_MAX_WORKERS, TRAINING_THREADS, BATCH_THREADS
+from src.utils.logger import get_logger
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+logger = get_logger(__name__)
+
+SERVING = "serving"
+TRAINING = "training"
+BATCH = "batch"
+ROLES = (SERVING, TRAINING, BATCH)
+
+# 아직 로드되지 않은 BLAS/OpenMP 라이브러리와 자식 프로세스에 적용
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS", "VECLIB_MAXIMUM_THREADS",
+)
+
+# 이 프로세스에 적용된 역할/스레드 수 (apply_thread_budget 호출 전에는 None)
+_role = None
+_threads = None
+
+
+def _cgroup_cpu_limit():
+    """컨테이너 CPU quota (cgroup v2 cpu.max / v1 cfs_quota) -> 코어 수, 제한 없으면 None"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max", "r") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", "r") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us", "r") as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, quota // period)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cores():
+    """CPU_CORES 설정 > min(CPU affinity, 컨테이너 quota)"""
+    if CPU_CORES > 0:
+        return CPU_CORES
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    limit = _cgroup_cpu_limit()
+    return min(cores, limit) if limit else cores
+
+
+def serving_cores(cores: int = None):
+    """서빙 워커 전체에 남겨 두는 코어 수 (기본: 절반)"""
+    cores = cores or available_cores()
+    return min(cores, SERVING_CORES) if SERVING_CORES > 0 else max(1, cores // 2)
+
+
+def role_threads(role: str):
+    """
+    역할별 프로세스당 스레드 수
+    - serving : 서빙용 코어를 워커 프로세스 수로 나눔
+    - training: 서빙용 코어를 뺀 나머지를 동시 학습 작업 수(JOB_MAX_WORKERS)로 나눔
+    - batch   : 서빙용 코어를 뺀 나머지 전체 (서버와 같은 장비에서 도는 오프라인 스코어링)
+    TRAINING_THREADS / BATCH_THREADS 가 설정되어 있으면 그 값 사용
+    """
+    if role not in ROLES:
+        raise ValueError(f"❌ 지원하지 않는 역할: {role}. Must be one of : {list(ROLES)}")
+
+    cores = available_cores()
+    reserved = serving_cores(cores)
+    spare = max(1, cores - reserved)
+    if role == SERVING:
+        return max(1, reserved // max(1, SERVER_WORKERS))
+    if role == TRAINING:
+        return TRAINING_THREADS if TRAINING_THREADS > 0 else max(1, spare // max(1, JOB_MAX_WORKERS))
+    return BATCH_THREADS if BATCH_THREADS > 0 else spare
+
+
+def apply_thread_budget(role: str):
+    """
+    이 프로세스의 torch intra-op / BLAS / OpenMP 스레드 수를 역할 예산으로 제한
+    모델 추정기(n_jobs)는 limit_estimator_threads 로 따로 맞춤
+    """
+    global _role, _threads
+
+    threads = role_threads(role)
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    if threadpool_limits is not None:
+        # 이미 로드된 BLAS/OpenMP 풀에도 적용 (with 없이 호출하면 프로세스 종료까지 유지)
+        threadpool_limits(limits=threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    _role, _threads = role, threads
+    logger.info(f"[INFO] thread budget applied : role={role}, threads={threads} (cores={available_cores()}, pid={os.getpid()})")
+    return threads
+
+
+def current_threads():
+    """apply_thread_budget 로 정해진 스레드 수 (적용 전이면 None)"""
+    return _threads
+
+
+def limit_estimator_threads(estimator, threads: int = None):
+    """
+    RandomForest / XGBoost / LightGBM 추정기의 n_jobs 를 예산에 맞춤
+    (학습된 XGBoost 부스터는 set_params 시 nthread 가 함께 바뀌고, LightGBM 은 predict 때 n_jobs 를 num_threads 로 전달)
+    """
+    threads = threads or _threads
+    if threads is None or not hasattr(estimator, "get_params"):
+        return estimator
+    if "n_jobs" in estimator.get_params():
+        estimator.set_params(n_jobs=threads)
+    return estimator
+
+
+def budget_summary():
+    cores = available_cores()
+    return {
+        "cores": cores,
+        "serving_cores": serving_cores(cores),
+        "role": _role,
+        "threads": _threads,
+        "per_role": {role: role_threads(role) for role in ROLES},
+    }
@@ -48,9 +48,11 @@ def load_artifacts_bundle(embedding_module_class, path = "cache/artifacts_bundle
 
     path = os.path.join(project_path(), "src", "dataset", path)
     
+    from src.dataset.text_features import slim_text_vectorizer
+
     artifacts = joblib.load(path)
 
-    tfidf_vectorizer = artifacts["tfidf_vectorizer"]
+    tfidf_vectorizer = slim_text_vectorizer(artifacts["tfidf_vectorizer"])
     genre2idx_raw = artifacts["genre2idx"]
 
     genre2idx = {str(k): v for k, v in genre2idx_raw.items()}